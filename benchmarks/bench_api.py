@@ -0,0 +1,195 @@
+"""Benchmark the orders API against a generated spreadsheet with simulated Sheets latency.
+
+Drives the real Flask app through its test client, so everything from the
+snapshot cache to JSON encoding is measured, and only Google Sheets is faked
+(see fake_sheets.py). Run from the repository root:
+
+    python -m benchmarks.bench_api --rows 1000 10000 100000
+    python -m benchmarks.bench_api --rows 10000 --latency 0.3 --rate-limit 0.05 --concurrency 8
+
+Reports throughput and p50/p95/p99 latency per scenario, plus the fake Sheets
+API calls each scenario made. ``--json`` writes the results for comparing runs.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# A request to send: (method, path, JSON body)
+Request = Tuple[str, str, Optional[Any]]
+
+SCENARIOS = [
+    'cold /api/orders',
+    'GET /api/orders?limit=50',
+    'GET /api/orders (all)',
+    'GET /api/orders filtered',
+    'GET measurements',
+    'PUT status',
+    'PUT bulk status (20)',
+]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def run_requests(app: Any, requests: List[Request], concurrency: int,
+                 before_each: Optional[Callable[[], None]] = None) -> Tuple[List[float], float, int]:
+    """Send ``requests`` through test clients on ``concurrency`` threads.
+
+    Returns:
+        Tuple[List[float], float, int]: Per-request latencies (seconds), wall time
+        for all of them, and how many got an unexpected (5xx) status.
+    """
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def worker(chunk: List[Request]) -> None:
+        nonlocal errors
+        client = app.test_client()
+        for method, path, body in chunk:
+            if before_each is not None:
+                before_each()
+            started = time.perf_counter()
+            response = client.open(path, method=method, json=body)
+            response.get_data()  # Drain streamed bodies too
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                errors += response.status_code >= 500
+
+    chunks = [requests[i::concurrency] for i in range(concurrency)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, chunks))
+    return latencies, time.perf_counter() - started, errors
+
+
+def build_requests(scenario: str, order_ids: List[str], count: int, rng: random.Random) -> List[Request]:
+    statuses = ['Pending', 'In Process', 'Ready', 'Delivered']
+    if scenario == 'cold /api/orders':
+        return [('GET', '/api/orders?limit=50', None)] * count
+    if scenario == 'GET /api/orders?limit=50':
+        return [('GET', '/api/orders?limit=50', None)] * count
+    if scenario == 'GET /api/orders (all)':
+        return [('GET', '/api/orders', None)] * count
+    if scenario == 'GET /api/orders filtered':
+        queries = ['status=pending&search=sharma', 'garment_type=shirt&search=road', 'status=ready&sort=-price']
+        return [('GET', f"/api/orders?{rng.choice(queries)}&limit=50", None) for _ in range(count)]
+    if scenario == 'GET measurements':
+        return [('GET', f"/api/orders/{rng.choice(order_ids)}/measurements", None) for _ in range(count)]
+    if scenario == 'PUT status':
+        return [
+            ('PUT', f"/api/orders/{rng.choice(order_ids)}/status", {'status': rng.choice(statuses)})
+            for _ in range(count)
+        ]
+    if scenario == 'PUT bulk status (20)':
+        return [
+            ('PUT', '/api/orders/status', {'updates': [
+                {'order_id': order_id, 'status': rng.choice(statuses)} for order_id in rng.sample(order_ids, 20)
+            ]})
+            for _ in range(count)
+        ]
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000], help='Order counts to generate')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per scenario (fewer for heavy ones)')
+    parser.add_argument('--concurrency', type=int, default=1, help='Client threads sending requests')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds each fake Sheets API call takes')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Extra random latency of up to this many seconds')
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='Fraction of Sheets API calls rejected with 429')
+    parser.add_argument('--read-quota', type=int, default=1_000_000, help='Sheets reads per minute to pace to')
+    parser.add_argument('--write-quota', type=int, default=1_000_000, help='Sheets writes per minute to pace to')
+    parser.add_argument('--scenario', action='append', choices=SCENARIOS, help='Run only these scenarios')
+    parser.add_argument('--log-level', default='WARNING', help='App log level while benchmarking')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', metavar='PATH', help='Also write the results to this JSON file')
+    args = parser.parse_args(argv)
+
+    # The app reads its settings at import time
+    os.environ['LOG_LEVEL'] = args.log_level
+    os.environ['LOG_FILE'] = ''
+    os.environ['FLASK_ENV'] = 'production'
+    os.environ.pop('MOCK_SHEETS', None)
+    os.environ.pop('FAKE_SHEETS_ROWS', None)
+    os.environ['SHEETS_SYNC_INTERVAL'] = '0'
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from fake_sheets import FakeSpreadsheet
+    from google_sheets_service import sheets_service
+    from sheets_scheduler import SheetsScheduler
+    from shop import app
+
+    results: List[Dict[str, Any]] = []
+    print(f"{'rows':>7}  {'scenario':<26} {'reqs':>5} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'reads':>6} {'writes':>6} {'429s':>5} {'5xx':>4}")
+    for rows in args.rows:
+        rng = random.Random(args.seed)
+        scheduler = SheetsScheduler(args.read_quota, args.write_quota)
+        spreadsheet = FakeSpreadsheet.generate(
+            rows, seed=args.seed, latency=args.latency, jitter=args.jitter,
+            rate_limit_ratio=args.rate_limit, scheduler=scheduler
+        )
+        sheets_service.scheduler = scheduler
+        sheets_service.use_spreadsheet(spreadsheet)
+        order_ids = [row[0] for row in spreadsheet.sheets['Orders'][1:]]
+
+        for scenario in args.scenario or SCENARIOS:
+            count = args.requests
+            before_each = None
+            if scenario == 'cold /api/orders':
+                count = max(3, args.requests // 50)
+                before_each = sheets_service.invalidate_orders_cache
+            elif scenario in ('GET /api/orders (all)', 'PUT bulk status (20)'):
+                count = max(5, args.requests // 10)
+            requests = build_requests(scenario, order_ids, count, rng)
+
+            if scenario != 'cold /api/orders':
+                # Warm the caches so steady-state requests are measured
+                app.test_client().get('/api/orders?limit=1')
+                app.test_client().get(f"/api/orders/{order_ids[0]}/measurements")
+
+            calls_before = dict(spreadsheet.calls)
+            latencies, wall, errors = run_requests(app, requests, args.concurrency, before_each)
+            latencies.sort()
+            calls = {kind: spreadsheet.calls[kind] - calls_before.get(kind, 0) for kind in ('read', 'write', 'rate_limited')}
+            result = {
+                'rows': rows,
+                'scenario': scenario,
+                'requests': len(latencies),
+                'concurrency': args.concurrency,
+                'throughput': len(latencies) / wall if wall else 0.0,
+                'mean_ms': statistics.fmean(latencies) * 1000,
+                'p50_ms': percentile(latencies, 50) * 1000,
+                'p95_ms': percentile(latencies, 95) * 1000,
+                'p99_ms': percentile(latencies, 99) * 1000,
+                'sheets_calls': calls,
+                'server_errors': errors,
+            }
+            results.append(result)
+            print(f"{rows:>7}  {scenario:<26} {result['requests']:>5} {result['throughput']:>9.1f} "
+                  f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+                  f"{calls['read']:>6} {calls['write']:>6} {calls['rate_limited']:>5} {errors:>4}", flush=True)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'args': vars(args), 'results': results}, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
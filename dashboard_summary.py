@@ -0,0 +1,303 @@
+import heapq
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from order_table import CategoryColumn, OrderTable
+
+# A row's share of the totals: the group it falls in for each dimension, and its amounts
+Contribution = Tuple[Tuple[str, ...], Tuple[float, ...]]
+
+# Orders listed under "recent" in the summary
+RECENT_ORDERS = 10
+
+# Worker payment entries listed under "recent" in the summary
+RECENT_PAYMENTS = 5
+
+# Date formats seen in the sheets: ISO from the order forms, day-first as the sheets display them
+_DATE_FORMATS = ['%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y', '%m/%d/%Y', '%d/%m/%y']
+
+# Order fields whose changes (besides delivery status) require recomputing an order's contribution
+_SUMMARY_FIELDS = ['order_id', 'order_date', 'created_at', 'season', 'festival', 'payment_status', 'price']
+
+
+@lru_cache(maxsize=4096)
+def month_of(date: str) -> str:
+    """The 'YYYY-MM' month of a sheet date (optionally followed by a time), or '' if it can't be parsed."""
+    text = date.strip().split(' ')[0].split('T')[0]
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).strftime('%Y-%m')
+        except ValueError:
+            continue
+    return ''
+
+
+@lru_cache(maxsize=1024)
+def payment_state(payment_status: str) -> str:
+    """Bucket a free-text payment status as 'paid', 'partial' or 'unpaid' (as the dashboard always has)."""
+    status = payment_status.lower()
+    if 'paid' in status and 'unpaid' not in status:
+        return 'paid'
+    if 'partial' in status:
+        return 'partial'
+    return 'unpaid'
+
+
+class RunningTotals:
+    """Counts and amount sums per group, kept current by applying only the rows that changed.
+
+    Every row is remembered by key with its :data:`Contribution`; replacing a
+    row subtracts its old contribution and adds the new one, so unchanged rows
+    cost nothing beyond a comparison. Groups whose count drops to zero are
+    removed, which also discards any floating point residue.
+    """
+
+    def __init__(self, dimensions: List[str], amounts: List[str]):
+        self.dimensions = dimensions
+        self.amounts = amounts
+        self._rows: Dict[str, Contribution] = {}
+        # [count, *amount sums] overall and per group of each dimension
+        self._total: List[float] = [0] * (1 + len(amounts))
+        self._groups: List[Dict[str, List[float]]] = [{} for _ in dimensions]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def set(self, key: str, contribution: Optional[Contribution]) -> bool:
+        """Make ``contribution`` the row's share of the totals (None removes the row).
+
+        Returns:
+            bool: True if the totals changed.
+        """
+        deltas: Dict[Tuple[str, ...], List[float]] = {}
+        changed = self._replace(key, contribution, deltas)
+        self._apply(deltas)
+        return changed
+
+    def sync(self, contributions: Iterable[Tuple[str, Contribution]]) -> int:
+        """Make the totals those of exactly these rows, applying only the differences.
+
+        Returns:
+            int: Rows added, changed or removed.
+        """
+        # Changes are netted per combination of groups first, so each group is updated once
+        deltas: Dict[Tuple[str, ...], List[float]] = {}
+        seen = set()
+        changed = 0
+        for key, contribution in contributions:
+            seen.add(key)
+            changed += self._replace(key, contribution, deltas)
+        for key in [key for key in self._rows if key not in seen]:
+            changed += self._replace(key, None, deltas)
+        self._apply(deltas)
+        return changed
+
+    def _replace(self, key: str, contribution: Optional[Contribution], deltas: Dict[Tuple[str, ...], List[float]]) -> bool:
+        old = self._rows.get(key)
+        if old == contribution:
+            return False
+        for change, sign in ((old, -1), (contribution, 1)):
+            if change is None:
+                continue
+            groups, amounts = change
+            delta = deltas.get(groups)
+            if delta is None:
+                delta = deltas[groups] = [0] * (1 + len(amounts))
+            delta[0] += sign
+            for i, amount in enumerate(amounts, 1):
+                delta[i] += sign * amount
+        if contribution is None:
+            del self._rows[key]
+        else:
+            self._rows[key] = contribution
+        return True
+
+    def _apply(self, deltas: Dict[Tuple[str, ...], List[float]]) -> None:
+        width = 1 + len(self.amounts)
+        for groups, delta in deltas.items():
+            sums = [self._total] + [by_group.setdefault(group, [0] * width) for by_group, group in zip(self._groups, groups)]
+            for values in sums:
+                for i, value in enumerate(delta):
+                    values[i] += value
+            for by_group, group in zip(self._groups, groups):
+                if by_group[group][0] == 0:
+                    del by_group[group]
+
+    def _format(self, values: List[float]) -> Dict[str, Any]:
+        formatted: Dict[str, Any] = {'count': int(values[0])}
+        for name, value in zip(self.amounts, values[1:]):
+            formatted[name] = round(value, 2)
+        return formatted
+
+    def totals(self) -> Dict[str, Any]:
+        return self._format(self._total)
+
+    def by(self, dimension: str) -> Dict[str, Dict[str, Any]]:
+        """Totals per group of ``dimension``, in group order."""
+        by_group = self._groups[self.dimensions.index(dimension)]
+        return {group: self._format(values) for group, values in sorted(by_group.items())}
+
+
+class OrderSummary:
+    """Dashboard aggregates of the Orders sheet, updated from each new orders snapshot.
+
+    :meth:`update` compares the new table with the last one: a status patch
+    (which shares every other column with its parent) only revisits the
+    orders whose status changed, and a reload applies just the orders whose
+    contribution differs.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = RunningTotals(['month', 'season', 'festival', 'status', 'payment'], ['revenue'])
+        self._table: Optional[OrderTable] = None
+        # Totals key of each table position (order IDs, made unique if the sheet repeats one)
+        self._keys: List[str] = []
+        self._recent: List[int] = []
+        self.version = 0
+        self.updated_at: Optional[float] = None
+
+    def update(self, table: OrderTable, version: int) -> int:
+        """Bring the aggregates up to date with ``table`` (the orders snapshot ``version``).
+
+        Returns:
+            int: Orders whose contribution changed.
+        """
+        with self._lock:
+            previous = self._table
+            if table is previous:
+                return 0
+            if previous is not None and all(table.column(field) is previous.column(field) for field in _SUMMARY_FIELDS):
+                changed = self._update_statuses(previous, table)
+            else:
+                changed = self._update_all(table)
+            self._table = table
+            self.version = version
+            self.updated_at = time.time()
+            return changed
+
+    @staticmethod
+    def _contributions(table: OrderTable) -> Callable[[int], Contribution]:
+        """A function computing the contribution of the order at a position of ``table``."""
+        # Work on category codes, deriving months and payment states once per distinct value
+        order_date, season, festival, status, payment_status = (table.category_column(field) for field in (
+            'order_date', 'season', 'festival', 'delivery_status', 'payment_status'
+        ))
+        months = [month_of(value) for value in order_date.categories]
+        payment_states = [payment_state(value) for value in payment_status.categories]
+        date_codes, season_codes, festival_codes, status_codes, payment_codes = (
+            column.codes for column in (order_date, season, festival, status, payment_status)
+        )
+        created_at, price = table.column('created_at'), table.column('price')
+
+        def contribution(pos: int) -> Contribution:
+            groups = (
+                months[date_codes[pos]] or month_of(created_at[pos]),
+                season.categories[season_codes[pos]],
+                festival.categories[festival_codes[pos]],
+                status.categories[status_codes[pos]],
+                payment_states[payment_codes[pos]],
+            )
+            return groups, (price[pos],)
+
+        return contribution
+
+    def _update_all(self, table: OrderTable) -> int:
+        keys: List[str] = []
+        seen = set()
+        for pos, order_id in enumerate(table.order_ids):
+            key = order_id if order_id not in seen else f"{order_id}#{pos}"
+            seen.add(key)
+            keys.append(key)
+        self._keys = keys
+        contribution = self._contributions(table)
+        changed = self._totals.sync((key, contribution(pos)) for pos, key in enumerate(keys))
+
+        created_at = table.column('created_at')
+        order_date = table.column('order_date')
+        self._recent = heapq.nlargest(RECENT_ORDERS, range(len(table)), key=lambda pos: created_at[pos] or order_date[pos])
+        return changed
+
+    def _update_statuses(self, previous: OrderTable, table: OrderTable) -> int:
+        # Status patches keep existing codes and only append new categories, so codes compare directly
+        old_codes = previous.category_column('delivery_status').codes
+        new_column: CategoryColumn = table.category_column('delivery_status')
+        contribution = self._contributions(table)
+        changed = 0
+        for pos, (old, new) in enumerate(zip(old_codes, new_column.codes)):
+            if old != new:
+                changed += self._totals.set(self._keys[pos], contribution(pos))
+        return changed
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            totals = self._totals
+            by_status = totals.by('status')
+            by_payment = totals.by('payment')
+            unpaid = [by_payment[state] for state in ('unpaid', 'partial') if state in by_payment]
+            table = self._table
+            recent = [] if table is None else list(table.iter_rows(
+                self._recent, ['order_id', 'customer_name', 'price', 'delivery_status', 'payment_status',
+                               'order_date', 'created_at']
+            ))
+            return {
+                'version': self.version,
+                'orders': totals.totals(),
+                'revenue_by_month': totals.by('month'),
+                'revenue_by_season': totals.by('season'),
+                'revenue_by_festival': totals.by('festival'),
+                'status_counts': {status: values['count'] for status, values in by_status.items()},
+                'payment_status': by_payment,
+                'unpaid': {
+                    'count': sum(values['count'] for values in unpaid),
+                    'revenue': round(sum(values['revenue'] for values in unpaid), 2),
+                },
+                'recent_orders': recent,
+            }
+
+
+class WorkerPaymentSummary:
+    """Totals of the Payment_Daily_Entry ledger per worker, updated from each new load of it.
+
+    Ledger entries are keyed by position, so appended entries (the usual
+    change) are the only ones applied.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = RunningTotals(['worker'], ['work_amount', 'advance_taken', 'remaining_payment'])
+        self._workers = 0
+        self._recent: List[Dict[str, Any]] = []
+        self.updated_at: Optional[float] = None
+
+    def update(self, workers: int, payments: Dict[str, List[Any]]) -> int:
+        """Bring the totals up to date with the ledger, decoded by column (see decode_columns).
+
+        Returns:
+            int: Entries whose contribution changed.
+        """
+        names = payments['worker_name']
+        amounts = list(zip(payments['work_amount'], payments['advance_taken'], payments['remaining_payment']))
+        with self._lock:
+            changed = self._totals.sync(
+                (str(pos), ((name,), amount)) for pos, (name, amount) in enumerate(zip(names, amounts)) if name
+            )
+            self._workers = workers
+            self._recent = [
+                {'date': payments['date'][pos], 'worker_name': names[pos], 'work_amount': payments['work_amount'][pos]}
+                for pos in reversed(range(max(0, len(names) - RECENT_PAYMENTS), len(names)))
+            ]
+            self.updated_at = time.time()
+            return changed
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'workers': self._workers,
+                'totals': self._totals.totals(),
+                'by_worker': self._totals.by('worker'),
+                'recent_payments': list(self._recent),
+            }
@@ -0,0 +1,271 @@
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+import requests
+from gspread.exceptions import APIError, WorksheetNotFound
+
+from google_sheets_service import COMBINED_ORDER_COLUMNS, COMBINED_ORDERS_SHEET, MEASUREMENT_SHEETS, ORDER_COLUMNS
+from sheets_scheduler import SheetsScheduler, sheet_label
+
+T = TypeVar('T')
+
+# A1 range parts: optional column letters and row number on each side of an optional ':'
+_A1_RANGE = re.compile(r'^([A-Z]*)(\d*)(?::([A-Z]*)(\d*))?$')
+
+_STATUSES = ['Pending', 'In Process', 'Ready', 'Delivered']
+_GARMENTS = ['Shirt', 'Pants', 'Shirt, Pants', 'Kurta', 'Shirt, Pants, Kurta']
+_FIRST_NAMES = ['Aarav', 'Meera', 'Rohan', 'Priya', 'Kabir', 'Anaya', 'Vikram', 'Isha', 'Arjun', 'Zoya']
+_LAST_NAMES = ['Sharma', 'Patel', 'Khan', 'Iyer', 'Singh', 'Das', 'Mehta', 'Reddy', 'Gupta', 'Nair']
+_STREETS = ['MG Road', 'Station Road', 'Park Street', 'Lake View', 'Market Lane', 'Temple Street']
+
+
+def _column_number(letters: str) -> int:
+    number = 0
+    for letter in letters:
+        number = number * 26 + ord(letter) - ord('A') + 1
+    return number
+
+
+def _parse_range(a1: str) -> Tuple[str, int, int, Optional[int], Optional[int]]:
+    """Split an A1 range into (sheet, first row, first column, last row, last column); None means unbounded."""
+    sheet, _, cells = a1.rpartition('!') if '!' in a1 else (a1, '', '')
+    sheet = sheet.strip()
+    if sheet.startswith("'") and sheet.endswith("'"):
+        sheet = sheet[1:-1].replace("''", "'")
+    match = _A1_RANGE.match(cells.upper())
+    if match is None:
+        raise ValueError(f"Unsupported A1 range: {a1}")
+    start_col, start_row, end_col, end_row = match.groups()
+    first_row = int(start_row) if start_row else 1
+    first_col = _column_number(start_col) if start_col else 1
+    if match.group(3) is None and match.group(4) is None:
+        # A single cell, or the whole sheet when there is no cell part at all
+        last_row = first_row if start_row else None
+        last_col = first_col if start_col else None
+    else:
+        last_row = int(end_row) if end_row else None
+        last_col = _column_number(end_col) if end_col else None
+    return sheet, first_row, first_col, last_row, last_col
+
+
+def rate_limited_error() -> APIError:
+    """The error gspread raises when Google rejects a request for exceeding the quota."""
+    response = requests.Response()
+    response.status_code = 429
+    response._content = json.dumps({'error': {
+        'code': 429, 'status': 'RESOURCE_EXHAUSTED',
+        'message': "Quota exceeded for quota metric 'Read requests' (fake)",
+    }}).encode('utf-8')
+    return APIError(response)
+
+
+class FakeWorksheet:
+    """One worksheet of a FakeSpreadsheet, with the gspread Worksheet methods the app uses."""
+
+    def __init__(self, spreadsheet: 'FakeSpreadsheet', title: str):
+        self.spreadsheet = spreadsheet
+        self.title = title
+
+    @property
+    def row_count(self) -> int:
+        return len(self.spreadsheet.sheets[self.title])
+
+    def get_all_values(self) -> List[List[Any]]:
+        return self.spreadsheet.values_get(f"'{self.title}'").get('values', [])
+
+    def get(self, range_name: str) -> List[List[Any]]:
+        return self.spreadsheet.values_get(f"'{self.title}'!{range_name}").get('values', [])
+
+    def get_all_records(self) -> List[Dict[str, Any]]:
+        values = self.get_all_values()
+        if not values:
+            return []
+        header = [str(name) for name in values[0]]
+        return [
+            {name: row[i] if i < len(row) else '' for i, name in enumerate(header)}
+            for row in values[1:] if any(cell != '' for cell in row)
+        ]
+
+    def update_cell(self, row: int, col: int, value: Any) -> None:
+        self.spreadsheet.write_cells(self.title, [(row, col, [[value]])])
+
+    def append_rows(self, values: List[List[Any]], value_input_option: str = 'RAW', **kwargs: Any) -> Dict[str, Any]:
+        return self.spreadsheet.append_rows(self.title, values)
+
+    def append_row(self, values: List[Any], value_input_option: str = 'RAW', **kwargs: Any) -> Dict[str, Any]:
+        return self.append_rows([values], value_input_option)
+
+
+class FakeSpreadsheet:
+    """In-memory stand-in for a gspread Spreadsheet, for benchmarks and offline runs.
+
+    Implements the value reads and writes GoogleSheetsService makes (batch
+    gets of whole sheets, cells and open-ended column ranges; batch cell
+    updates) plus ``worksheet()`` handles. Every call sleeps for ``latency``
+    seconds (plus up to ``jitter``) like a round trip to Google, fails with a
+    429 with probability ``rate_limit_ratio``, and goes through ``scheduler``
+    when given, so quota pacing, retries and metrics behave as in production.
+    ``calls`` counts the requests made by kind.
+    """
+
+    def __init__(self, sheets: Dict[str, List[List[Any]]], latency: float = 0.0, jitter: float = 0.0,
+                 rate_limit_ratio: float = 0.0, scheduler: Optional[SheetsScheduler] = None, seed: int = 0):
+        self.sheets = sheets
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_ratio = rate_limit_ratio
+        self.scheduler = scheduler
+        self.calls: Counter = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def generate(cls, orders: int, seed: int = 0, **kwargs: Any) -> 'FakeSpreadsheet':
+        """A spreadsheet with ``orders`` synthetic orders and their Shirts/Pants/Others measurements."""
+        return cls(generate_sheets(orders, seed), seed=seed, **kwargs)
+
+    def worksheet(self, name: str) -> FakeWorksheet:
+        # Like gspread, each lookup is a spreadsheet metadata request
+        self._call('read', [], lambda: self._sheet(name))
+        return FakeWorksheet(self, name)
+
+    def worksheets(self) -> List[FakeWorksheet]:
+        return self._call('read', [], lambda: [FakeWorksheet(self, name) for name in self.sheets])
+
+    def values_get(self, range: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return self._call('read', [range], lambda: self._read(range))
+
+    def values_batch_get(self, ranges: List[str], params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return self._call('read', ranges, lambda: {'valueRanges': [self._read(a1) for a1 in ranges]})
+
+    def values_batch_update(self, body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        data = (body or {}).get('data', [])
+        ranges = [item['range'] for item in data]
+
+        def update() -> Dict[str, Any]:
+            for item in data:
+                sheet, row, col, _, _ = _parse_range(item['range'])
+                self._write(sheet, row, col, item['values'])
+            return {'totalUpdatedCells': sum(len(row) for item in data for row in item['values'])}
+
+        return self._call('write', ranges, update)
+
+    def write_cells(self, sheet: str, cells: List[Tuple[int, int, List[List[Any]]]]) -> None:
+        def update() -> None:
+            for row, col, values in cells:
+                self._write(sheet, row, col, values)
+
+        self._call('write', [f"'{sheet}'"], update)
+
+    def append_rows(self, sheet: str, values: List[List[Any]]) -> Dict[str, Any]:
+        def append() -> Dict[str, Any]:
+            rows = self._sheet(sheet)
+            first = len(rows) + 1
+            rows.extend(list(row) for row in values)
+            return {'updates': {'updatedRange': f"'{sheet}'!A{first}", 'updatedRows': len(values)}}
+
+        return self._call('write', [f"'{sheet}'"], append)
+
+    def _call(self, kind: str, ranges: List[str], call: Callable[[], T]) -> T:
+        def attempt() -> T:
+            self.calls[kind] += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            if delay:
+                time.sleep(delay)
+            if self.rate_limit_ratio and self._random.random() < self.rate_limit_ratio:
+                self.calls['rate_limited'] += 1
+                raise rate_limited_error()
+            with self._lock:
+                return call()
+
+        if self.scheduler is None:
+            return attempt()
+        return self.scheduler.run(kind, attempt, sheet_label('', {'ranges': ranges}))
+
+    def _sheet(self, name: str) -> List[List[Any]]:
+        if name not in self.sheets:
+            raise WorksheetNotFound(name)
+        return self.sheets[name]
+
+    def _read(self, a1: str) -> Dict[str, Any]:
+        sheet, first_row, first_col, last_row, last_col = _parse_range(a1)
+        rows = self._sheet(sheet)[first_row - 1:last_row]
+        values = [list(row[first_col - 1:last_col]) for row in rows]
+        # Like the API, drop trailing empty cells and rows
+        for row in values:
+            while row and row[-1] == '':
+                row.pop()
+        while values and not values[-1]:
+            values.pop()
+        value_range: Dict[str, Any] = {'range': a1, 'majorDimension': 'ROWS'}
+        if values:
+            value_range['values'] = values
+        return value_range
+
+    def _write(self, sheet: str, first_row: int, first_col: int, values: List[List[Any]]) -> None:
+        rows = self._sheet(sheet)
+        for row_offset, cells in enumerate(values):
+            row_number = first_row + row_offset
+            while len(rows) < row_number:
+                rows.append([])
+            row = rows[row_number - 1]
+            row.extend([''] * (first_col - 1 + len(cells) - len(row)))
+            row[first_col - 1:first_col - 1 + len(cells)] = cells
+
+
+def generate_sheets(orders: int, seed: int = 0) -> Dict[str, List[List[Any]]]:
+    """Synthetic Orders, Shirts, Pants and Others sheet values (header row first) for ``orders`` orders.
+
+    About 70% of orders get a shirt, 50% pants and 20% another garment. The
+    Combine Orders sheet starts with just its header row.
+    """
+    rng = random.Random(seed)
+    order_rows: List[List[Any]] = [[name for _, name, _, _ in ORDER_COLUMNS]]
+    measurement_rows: Dict[str, List[List[Any]]] = {}
+    headers: Dict[str, List[str]] = {}
+    for _, sheet_name, columns in MEASUREMENT_SHEETS:
+        header = [name for _, name, _, _ in columns]
+        if sheet_name == 'Others':
+            header.insert(7, 'Item')  # Keeps Status in column J, as in the real sheet
+        headers[sheet_name] = header
+        measurement_rows[sheet_name] = [header]
+    shares = {'Shirts': 0.7, 'Pants': 0.5, 'Others': 0.2}
+
+    for n in range(1, orders + 1):
+        order_id = f"ORD{n:06d}"
+        name = f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}"
+        address = f"{rng.randint(1, 999)} {rng.choice(_STREETS)}"
+        order_date = f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        delivery_date = f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        status = rng.choices(_STATUSES, weights=(4, 3, 2, 6))[0]
+        price = round(rng.uniform(500, 15000), 2)
+        order = {
+            'Order ID': order_id, 'Customer Name': name, 'Contact Info': f"9{rng.randint(100000000, 999999999)}",
+            'Address': address, 'Customer Type': rng.choice(['regular', 'new', 'wholesale']),
+            'Garment Types': rng.choice(_GARMENTS), 'Order Date': order_date, 'Delivery Date': delivery_date,
+            'Delivery Status': status, 'Price': price, 'Payment Status': rng.choice(['Paid', 'Unpaid', 'Partial']),
+            'Season': rng.choice(['', 'Summer', 'Winter']), 'Festival': rng.choice(['', '', 'Diwali', 'Eid']),
+            'Notes': rng.choice(['', '', 'Urgent', 'Call before delivery']), 'Created At': f"{order_date} 10:00:00",
+        }
+        order_rows.append([order[name] for name in order_rows[0]])
+
+        for sheet_name, share in shares.items():
+            if rng.random() >= share:
+                continue
+            cells: Dict[str, Any] = {
+                'Order ID': order_id, 'Customer Name': name, 'Address': address, 'Order Date': order_date,
+                'Delivery Date': delivery_date, 'Quantity': rng.randint(1, 3),
+                'Fabric Meters': round(rng.uniform(1, 6), 1), 'Item': 'Kurta',
+                'Price': round(price / 2, 2), 'Status': status, 'Notes': '', 'Created At': order['Created At'],
+            }
+            measurement_rows[sheet_name].append([
+                cells[name] if name in cells else round(rng.uniform(10, 45), 1) for name in headers[sheet_name]
+            ])
+
+    combined_header = [name for _, name, _, _ in COMBINED_ORDER_COLUMNS]
+    return {'Orders': order_rows, **measurement_rows, COMBINED_ORDERS_SHEET: [combined_header]}
@@ -1,7 +1,10 @@
 import os
 import logging
-import json
-from typing import List, Dict, Optional, TypedDict
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, List, Dict, Optional, Set, Tuple, TypedDict
 
 from pydantic import BaseSettings, Field
 
@@ -60,25 +63,328 @@ class OrderMeasurements(TypedDict):
     shirt: Optional[ShirtMeasurement]
     pants: Optional[PantMeasurement]
     others: Optional[OtherMeasurement]
+
+class CombinedOrder(TypedDict):
+    timestamp: str
+    combined_order_id: str
+    master_order_id: str
+    customer_name: str
+    contact: str
+    address: str
+    customer_type: str
+    order_date: str
+    session: str
+    notes: str
+    fabric_order_id: str
+    fabric_price: float
+    tailoring_order_id: str
+    tailoring_price: float
+    total_amount: float
+    payment_status: str
 import gspread
-from google.oauth2.service_account import Credentials
+from gspread.utils import a1_to_rowcol, rowcol_to_a1
 from datetime import datetime
 
+import metrics
+from dashboard_summary import OrderSummary, WorkerPaymentSummary
+from group_commit import GroupCommitQueue, PendingWrite
+from order_events import OrderEventLog, diff_orders
+from order_index import OrderIndex
+from order_table import OrderTable
+from sheets_cache import Snapshot, SnapshotCache
+from sheets_mirror import SheetsMirror
+from sheets_auth import TOKEN_CHECK_INTERVAL, ServiceAccount, connect
+from sheets_scheduler import SheetsScheduler, background_lane, error_status, scheduled_http_client
+from sheets_sync import BackgroundSync
+from status_journal import StatusJournal
+
 logger = logging.getLogger(__name__)
 
 
 class GSheetsSettings(BaseSettings):
     GOOGLE_SHEETS_ID: Optional[str] = Field(None, env='GOOGLE_SHEETS_ID')
     GOOGLE_SERVICE_ACCOUNT_FILE: str = Field('service-account.json', env='GOOGLE_SERVICE_ACCOUNT_FILE')
+    # Spreadsheet with the Worker_List and Payment_Daily_Entry sheets, summarized for the dashboard
+    WORKERS_SHEETS_ID: Optional[str] = Field(None, env='WORKERS_SHEETS_ID')
+    # Spreadsheet with the Combine Orders sheet new fabric+tailoring orders are appended to;
+    # unset rejects them (except with mock or fake sheets, which hold their own Combine Orders sheet)
+    COMBINED_ORDERS_SHEETS_ID: Optional[str] = Field(None, env='COMBINED_ORDERS_SHEETS_ID')
+    # Seconds a new combined order waits for others to be appended with it, and the most appended at once
+    ORDER_COMMIT_WINDOW: float = Field(0.2, env='ORDER_COMMIT_WINDOW')
+    ORDER_COMMIT_MAX_ROWS: int = Field(200, env='ORDER_COMMIT_MAX_ROWS')
     MOCK_SHEETS: bool = Field(False, env='MOCK_SHEETS')
+    # Seconds a cached sheet snapshot is served without re-reading Google Sheets
+    SHEETS_CACHE_TTL: float = Field(30.0, env='SHEETS_CACHE_TTL')
+    # Extra seconds an expired snapshot may still be served while it is refreshed in the background
+    SHEETS_CACHE_STALE_TTL: float = Field(300.0, env='SHEETS_CACHE_STALE_TTL')
+    # SQLite file mirroring the sheets locally; reads are served from it when set
+    SHEETS_MIRROR_PATH: Optional[str] = Field(None, env='SHEETS_MIRROR_PATH')
+    # SQLite journal status changes are committed to before being written to the sheets in the background;
+    # unset writes them to the sheets before responding
+    STATUS_JOURNAL_PATH: Optional[str] = Field(None, env='STATUS_JOURNAL_PATH')
+    # Seconds between flushes of the status journal (a new change also triggers one)
+    STATUS_FLUSH_INTERVAL: float = Field(1.0, env='STATUS_FLUSH_INTERVAL')
+    # Seconds between background pulls of the sheets; 0 loads them from request handlers instead
+    SHEETS_SYNC_INTERVAL: float = Field(0.0, env='SHEETS_SYNC_INTERVAL')
+    # Sheets API read/write requests allowed per minute for the service account, across all workers
+    SHEETS_READ_QUOTA: int = Field(60, env='SHEETS_READ_QUOTA')
+    SHEETS_WRITE_QUOTA: int = Field(60, env='SHEETS_WRITE_QUOTA')
+    # Worker processes sharing those quotas (gunicorn --workers)
+    WORKERS: int = Field(1, env='WORKERS')
+    # Request threads per worker process (gunicorn --threads); each may have a Sheets call in flight
+    WORKER_THREADS: int = Field(1, env='WORKER_THREADS')
+    # Serve a generated in-memory spreadsheet with this many orders instead of Google Sheets (see fake_sheets.py)
+    FAKE_SHEETS_ROWS: int = Field(0, env='FAKE_SHEETS_ROWS')
+    # Seconds each fake Sheets API call takes, and the fraction of calls rejected with a 429
+    FAKE_SHEETS_LATENCY: float = Field(0.0, env='FAKE_SHEETS_LATENCY')
+    FAKE_SHEETS_429_RATE: float = Field(0.0, env='FAKE_SHEETS_429_RATE')
 
 
 settings = GSheetsSettings(
     GOOGLE_SHEETS_ID=os.getenv('GOOGLE_SHEETS_ID'),
     GOOGLE_SERVICE_ACCOUNT_FILE=os.getenv('GOOGLE_SERVICE_ACCOUNT_FILE', 'service-account.json'),
-    MOCK_SHEETS=os.getenv('MOCK_SHEETS', '').lower() in ('1', 'true', 'yes')
+    WORKERS_SHEETS_ID=os.getenv('WORKERS_SHEETS_ID') or None,
+    COMBINED_ORDERS_SHEETS_ID=os.getenv('COMBINED_ORDERS_SHEETS_ID') or None,
+    ORDER_COMMIT_WINDOW=float(os.getenv('ORDER_COMMIT_WINDOW', '0.2')),
+    ORDER_COMMIT_MAX_ROWS=max(1, int(os.getenv('ORDER_COMMIT_MAX_ROWS', '200'))),
+    MOCK_SHEETS=os.getenv('MOCK_SHEETS', '').lower() in ('1', 'true', 'yes'),
+    SHEETS_CACHE_TTL=float(os.getenv('SHEETS_CACHE_TTL', '30')),
+    SHEETS_CACHE_STALE_TTL=float(os.getenv('SHEETS_CACHE_STALE_TTL', '300')),
+    SHEETS_MIRROR_PATH=os.getenv('SHEETS_MIRROR_PATH') or None,
+    STATUS_JOURNAL_PATH=os.getenv('STATUS_JOURNAL_PATH') or None,
+    STATUS_FLUSH_INTERVAL=float(os.getenv('STATUS_FLUSH_INTERVAL', '1')),
+    SHEETS_SYNC_INTERVAL=float(os.getenv('SHEETS_SYNC_INTERVAL', '0')),
+    SHEETS_READ_QUOTA=int(os.getenv('SHEETS_READ_QUOTA', '60')),
+    SHEETS_WRITE_QUOTA=int(os.getenv('SHEETS_WRITE_QUOTA', '60')),
+    WORKERS=max(1, int(os.getenv('WORKERS', '1'))),
+    WORKER_THREADS=max(1, int(os.getenv('WORKER_THREADS', '1'))),
+    FAKE_SHEETS_ROWS=int(os.getenv('FAKE_SHEETS_ROWS', '0')),
+    FAKE_SHEETS_LATENCY=float(os.getenv('FAKE_SHEETS_LATENCY', '0')),
+    FAKE_SHEETS_429_RATE=float(os.getenv('FAKE_SHEETS_429_RATE', '0'))
 )
 
+# Seconds between checks of the mirror for changes pulled by another worker process
+MIRROR_POLL_INTERVAL = 1.0
+
+# Seconds a worker process keeps the right to flush the status journal without renewing it
+STATUS_FLUSH_LEASE = 60.0
+
+# Seconds flushed status changes are kept in the journal
+STATUS_JOURNAL_RETENTION = 86400.0
+
+# Longest wait between attempts to connect to Google Sheets during warm-up
+WARM_UP_MAX_DELAY = 60.0
+
+# Combined orders remembered by ID (pending and recently written), so a resubmitted order isn't appended twice
+COMBINED_ORDERS_REMEMBERED = 10000
+
+# OAuth scopes requested for the service account
+SCOPES = [
+    'https://spreadsheets.google.com/feeds',
+    'https://www.googleapis.com/auth/drive'
+]
+
+def _to_str(value: Any, default: str = '') -> str:
+    return default if value is None else str(value)
+
+
+def _to_float(value: Any, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _to_int(value: Any, default: int = 0) -> int:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def _column_letter(col: int) -> str:
+    return rowcol_to_a1(1, col)[:-1]
+
+
+# Sheet schemas: (field name, header in the sheet, converter, default for missing/blank cells)
+Column = Tuple[str, str, Callable[[Any, Any], Any], Any]
+
+ORDER_COLUMNS: List[Column] = [
+    ('order_id', 'Order ID', _to_str, ''),
+    ('customer_name', 'Customer Name', _to_str, ''),
+    ('contact_info', 'Contact Info', _to_str, ''),
+    ('address', 'Address', _to_str, ''),
+    ('customer_type', 'Customer Type', _to_str, ''),
+    ('garment_types', 'Garment Types', _to_str, ''),
+    ('order_date', 'Order Date', _to_str, ''),
+    ('delivery_date', 'Delivery Date', _to_str, ''),
+    ('delivery_status', 'Delivery Status', _to_str, ''),
+    ('price', 'Price', _to_float, 0.0),
+    ('payment_status', 'Payment Status', _to_str, ''),
+    ('season', 'Season', _to_str, ''),
+    ('festival', 'Festival', _to_str, ''),
+    ('notes', 'Notes', _to_str, ''),
+    ('created_at', 'Created At', _to_str, ''),
+]
+
+_MEASUREMENT_HEAD: List[Column] = [
+    ('order_id', 'Order ID', _to_str, ''),
+    ('customer_name', 'Customer Name', _to_str, ''),
+    ('address', 'Address', _to_str, ''),
+    ('order_date', 'Order Date', _to_str, ''),
+    ('delivery_date', 'Delivery Date', _to_str, ''),
+    ('quantity', 'Quantity', _to_int, 1),
+    ('fabric_meters', 'Fabric Meters', _to_float, 0.0),
+]
+_MEASUREMENT_TAIL: List[Column] = [
+    ('price', 'Price', _to_float, 0.0),
+    ('status', 'Status', _to_str, ''),
+    ('notes', 'Notes', _to_str, ''),
+    ('created_at', 'Created At', _to_str, ''),
+]
+
+SHIRT_COLUMNS: List[Column] = _MEASUREMENT_HEAD + [
+    ('chest', 'Chest', _to_float, 0.0),
+    ('shoulder', 'Shoulder', _to_float, 0.0),
+    ('sleeve_length', 'Sleeve Length', _to_float, 0.0),
+    ('shirt_length', 'Shirt Length', _to_float, 0.0),
+    ('neck', 'Neck', _to_float, 0.0),
+    ('bicep', 'Bicep', _to_float, 0.0),
+    ('bajoo', 'Bajoo', _to_float, 0.0),
+] + _MEASUREMENT_TAIL
+
+PANT_COLUMNS: List[Column] = _MEASUREMENT_HEAD + [
+    ('waist', 'Waist', _to_float, 0.0),
+    ('hip', 'Hip', _to_float, 0.0),
+    ('inseam', 'Inseam', _to_float, 0.0),
+    ('outseam', 'Outseam', _to_float, 0.0),
+    ('thigh', 'Thigh', _to_float, 0.0),
+    ('knee', 'Knee', _to_float, 0.0),
+    ('bottom', 'Bottom', _to_float, 0.0),
+] + _MEASUREMENT_TAIL
+
+OTHER_COLUMNS: List[Column] = _MEASUREMENT_HEAD + _MEASUREMENT_TAIL
+
+# OrderMeasurements key -> (worksheet name, schema)
+MEASUREMENT_SHEETS: List[Tuple[str, str, List[Column]]] = [
+    ('shirt', 'Shirts', SHIRT_COLUMNS),
+    ('pants', 'Pants', PANT_COLUMNS),
+    ('others', 'Others', OTHER_COLUMNS),
+]
+
+# Worker_List and Payment_Daily_Entry sheets of the WORKERS_SHEETS_ID spreadsheet
+WORKER_COLUMNS: List[Column] = [
+    ('name', 'Name', _to_str, ''),
+]
+
+PAYMENT_COLUMNS: List[Column] = [
+    ('date', 'Date', _to_str, ''),
+    ('worker_name', 'Worker Name', _to_str, ''),
+    ('work_amount', 'Total Work Amount', _to_float, 0.0),
+    ('advance_taken', 'Advance Taken', _to_float, 0.0),
+    ('remaining_payment', 'Remaining Payment', _to_float, 0.0),
+]
+
+# Combine Orders sheet, with the columns the fabric+tailoring order form's Apps Script wrote
+COMBINED_ORDERS_SHEET = 'Combine Orders'
+
+COMBINED_ORDER_COLUMNS: List[Column] = [
+    ('timestamp', 'Timestamp', _to_str, ''),
+    ('combined_order_id', 'Combined Order ID', _to_str, ''),
+    ('master_order_id', 'Master Order ID', _to_str, ''),
+    ('customer_name', 'Customer Name', _to_str, ''),
+    ('contact', 'Contact', _to_str, ''),
+    ('address', 'Address', _to_str, ''),
+    ('customer_type', 'Customer Type', _to_str, 'New'),
+    ('order_date', 'Order Date', _to_str, ''),
+    ('session', 'Session', _to_str, ''),
+    ('notes', 'Notes', _to_str, ''),
+    ('fabric_order_id', 'Fabric Order ID', _to_str, ''),
+    ('fabric_price', 'Fabric Price', _to_float, 0.0),
+    ('tailoring_order_id', 'Tailoring Order ID', _to_str, ''),
+    ('tailoring_price', 'Tailoring Price', _to_float, 0.0),
+    ('total_amount', 'Total Amount', _to_float, 0.0),
+    ('payment_status', 'Payment Status', _to_str, 'Unpaid'),
+]
+
+# Unformatted numbers (no currency/thousands separators) but human-readable dates
+VALUE_RENDER_PARAMS = {
+    'valueRenderOption': 'UNFORMATTED_VALUE',
+    'dateTimeRenderOption': 'FORMATTED_STRING',
+}
+
+# Worksheets carrying an order's status: (worksheet name, Order ID column, status column)
+STATUS_SHEETS: List[Tuple[str, int, int]] = [
+    ('Orders', 1, 9),  # Column I (Delivery Status)
+    ('Shirts', 1, 16),  # Column P (Status)
+    ('Pants', 1, 16),  # Column P (Status)
+    ('Others', 1, 10)  # Column J (Status)
+]
+
+# Worksheets copied to the local mirror when SHEETS_MIRROR_PATH is set
+MIRRORED_SHEETS: List[str] = ['Orders'] + [sheet_name for _, sheet_name, _ in MEASUREMENT_SHEETS]
+
+
+def _decode_plan(header: List[Any], columns: List[Column]) -> List[Tuple[str, Optional[int], Callable[[Any, Any], Any], Any]]:
+    """Resolve each schema column to its position in the header row (None when absent)."""
+    header_index = {str(name).strip(): i for i, name in enumerate(header)}
+    return [(field, header_index.get(name), convert, default) for field, name, convert, default in columns]
+
+
+def decode_columns(values: List[List[Any]], columns: List[Column]) -> Dict[str, List[Any]]:
+    """Decode raw sheet values (header row first) into one list per field, without per-row dicts."""
+    decoded: Dict[str, List[Any]] = {field: [] for field, _, _, _ in columns}
+    if not values:
+        return decoded
+
+    plan = [(decoded[field].append, pos, convert, default)
+            for field, pos, convert, default in _decode_plan(values[0], columns)]
+    for raw in values[1:]:
+        if not any(cell != '' for cell in raw):
+            continue  # Skip blank rows, like get_all_records
+        width = len(raw)
+        for append, pos, convert, default in plan:
+            cell = raw[pos] if pos is not None and pos < width else ''
+            append(default if cell == '' else convert(cell, default))
+    return decoded
+
+
+def decode_rows(values: List[List[Any]], columns: List[Column]) -> List[Dict[str, Any]]:
+    """Decode raw sheet values (header row first) into dicts following ``columns``.
+
+    The header row is resolved to column positions once; blank or malformed
+    cells fall back to the column default instead of failing the whole row.
+    """
+    if not values:
+        return []
+
+    plan = _decode_plan(values[0], columns)
+
+    rows: List[Dict[str, Any]] = []
+    for raw in values[1:]:
+        if not any(cell != '' for cell in raw):
+            continue  # Skip blank rows, like get_all_records
+        row: Dict[str, Any] = {}
+        for field, pos, convert, default in plan:
+            cell = raw[pos] if pos is not None and pos < len(raw) else ''
+            row[field] = default if cell == '' else convert(cell, default)
+        rows.append(row)
+    return rows
+
+
+def _with_measurement_statuses(by_order: Dict[str, OrderMeasurements], updates: Dict[str, str]) -> Dict[str, OrderMeasurements]:
+    """A copy of ``by_order`` with new statuses (keyed by order ID) applied to every garment of those orders."""
+    patched_by_order = dict(by_order)
+    for order_id, new_status in updates.items():
+        entry = by_order.get(order_id)
+        if entry is not None:
+            patched_by_order[order_id] = {  # type: ignore[assignment]
+                kind: None if item is None else {**item, 'status': new_status}  # type: ignore[dict-item]
+                for kind, item in entry.items()
+            }
+    return patched_by_order
+
+
 class GoogleSheetsService:
     def __init__(self):
         # Use validated settings
@@ -88,6 +394,12 @@ class GoogleSheetsService:
         self.mock: bool = False
         self._initialized: bool = False
 
+        # Every Sheets API request goes through this, paced to this process's share of the quota
+        self.scheduler = SheetsScheduler(
+            reads_per_minute=settings.SHEETS_READ_QUOTA / settings.WORKERS,
+            writes_per_minute=settings.SHEETS_WRITE_QUOTA / settings.WORKERS
+        )
+
         # Minimal in-memory mock data used when MOCK_SHEETS env var is true
         mock_order: Order = {
             'order_id': 'MOCK001',
@@ -116,32 +428,193 @@ class GoogleSheetsService:
         self._mock_measurements: Dict[str, OrderMeasurements] = {
             'MOCK001': mock_measurements
         }
+        self._mock_combined_orders: List[CombinedOrder] = []
 
-        # Initialize client only if a spreadsheet id is provided or MOCK_SHEETS is enabled
-        if settings.MOCK_SHEETS:
-            # initialize_client will detect MOCK_SHEETS and set mock mode
-            self.initialize_client()
-        elif self.spreadsheet_id:
+        # Snapshot of the Orders sheet (with its search index) shared by all requests in this worker
+        self._orders_cache: SnapshotCache[OrderIndex] = SnapshotCache(
+            'orders', self._load_orders,
+            ttl=settings.SHEETS_CACHE_TTL,
+            stale_ttl=settings.SHEETS_CACHE_STALE_TTL,
+            same=lambda current, loaded: current.digest == loaded.digest
+        )
+        # Created/status changed/deleted orders derived from each new orders snapshot, for /api/orders/events
+        self.order_events = OrderEventLog()
+        self._orders_cache.subscribe(self._record_order_changes)
+        # Dashboard aggregates, updated incrementally from each new orders snapshot
+        self.order_summary = OrderSummary()
+        self._orders_cache.subscribe(self._update_order_summary)
+        # Snapshot of the Shirts/Pants/Others sheets, keyed by order ID
+        self._measurements_cache: SnapshotCache[Dict[str, OrderMeasurements]] = SnapshotCache(
+            'measurements', self._load_measurements,
+            ttl=settings.SHEETS_CACHE_TTL,
+            stale_ttl=settings.SHEETS_CACHE_STALE_TTL,
+            same=lambda current, loaded: current == loaded
+        )
+
+        # Worker_List and Payment_Daily_Entry values from WORKERS_SHEETS_ID, and their dashboard totals
+        self._worker_payments_cache: SnapshotCache[List[List[List[Any]]]] = SnapshotCache(
+            'worker_payments', self._load_worker_payments,
+            ttl=settings.SHEETS_CACHE_TTL,
+            stale_ttl=settings.SHEETS_CACHE_STALE_TTL,
+            same=lambda current, loaded: current == loaded
+        )
+        self.worker_payments = WorkerPaymentSummary()
+        self._worker_payments_cache.subscribe(self._update_worker_payments)
+
+        # Order ID -> row number for each sheet in STATUS_SHEETS, built from the ID column only
+        self._row_index: Dict[str, Dict[str, int]] = {}
+        # Last row number read into _row_index per sheet; rows below it are read incrementally
+        self._row_index_last: Dict[str, int] = {}
+        self._row_index_lock = threading.Lock()
+
+        # New combined orders, appended to the Combine Orders sheet in batches (group commit)
+        self._combined_orders_queue: GroupCommitQueue[CombinedOrder] = GroupCommitQueue(
+            'combined-orders', self._append_combined_orders,
+            window=settings.ORDER_COMMIT_WINDOW, max_batch=settings.ORDER_COMMIT_MAX_ROWS
+        )
+        # Combined Order ID -> queued or written order, oldest first; see create_combined_order
+        self._combined_orders: 'OrderedDict[str, PendingWrite[CombinedOrder]]' = OrderedDict()
+        self._combined_orders_lock = threading.Lock()
+        # Combine Orders sheet handle when COMBINED_ORDERS_SHEETS_ID is another spreadsheet
+        self._combined_orders_worksheet: Optional[gspread.Worksheet] = None
+
+        # Optional local copy of the sheets; when set, loads read from it instead of Google
+        self.mirror: Optional[SheetsMirror] = None
+        if settings.SHEETS_MIRROR_PATH and not settings.MOCK_SHEETS:
+            try:
+                self.mirror = SheetsMirror(settings.SHEETS_MIRROR_PATH, MIRRORED_SHEETS)
+                logger.info(f"Serving sheet reads from local mirror {settings.SHEETS_MIRROR_PATH}")
+            except Exception as e:
+                logger.error(f"Failed to open sheet mirror {settings.SHEETS_MIRROR_PATH}, reading Google Sheets directly: {e}")
+
+        # Status changes waiting to be written to the sheets, and the thread writing them; see flush_status_journal
+        self.status_journal: Optional[StatusJournal] = None
+        self._status_flush: Optional[BackgroundSync] = None
+        if settings.STATUS_JOURNAL_PATH and not settings.MOCK_SHEETS:
+            try:
+                self.status_journal = StatusJournal(settings.STATUS_JOURNAL_PATH)
+                pending = self.status_journal.pending_count()
+                if pending:
+                    logger.info(f"{pending} journaled status changes are not written to Google Sheets yet; "
+                                f"they will be flushed in the background")
+            except Exception as e:
+                logger.error(f"Failed to open status journal {settings.STATUS_JOURNAL_PATH}, writing statuses directly: {e}")
+
+        # Credentials read from GOOGLE_SERVICE_ACCOUNT_FILE, and the thread refreshing their access token
+        self._service_account: Optional[ServiceAccount] = None
+        self._token_refresh: Optional[BackgroundSync] = None
+        # Worksheet title -> handle, fetched together on first use; see worksheet()
+        self._worksheets: Dict[str, gspread.Worksheet] = {}
+        self._worksheets_lock = threading.Lock()
+
+        # Keeps the snapshots fresh off the request path once started; see start_background_sync
+        self._background_sync: Optional[BackgroundSync] = None
+        # Mirror generations the current snapshots were loaded from, keyed by cache name
+        self._synced_generations: Dict[str, Tuple[int, ...]] = {}
+
+        # Connects to Google Sheets and loads the first snapshots; see start
+        self._warm_up: Optional[threading.Thread] = None
+        # Process that created self.client's session
+        self._client_pid: Optional[int] = None
+
+        # Local stand-ins are set up right away; Google Sheets is connected to lazily by start()
+        if settings.MOCK_SHEETS or settings.FAKE_SHEETS_ROWS > 0:
+            # initialize_client will detect MOCK_SHEETS/FAKE_SHEETS_ROWS and set up the stand-in
             self.initialize_client()
-        else:
+        elif not self.spreadsheet_id:
             logger.warning('GOOGLE_SHEETS_ID is not set; Google Sheets access disabled. Set GOOGLE_SHEETS_ID and GOOGLE_SERVICE_ACCOUNT_FILE or enable MOCK_SHEETS=1 for development.')
+
+    def start(self) -> None:
+        """Connect to Google Sheets and load the snapshots on a background thread, then keep them fresh.
+
+        Returns immediately; ready() reports when the orders snapshot is loaded.
+        Connection attempts are retried with backoff until they succeed. Call it
+        once in every process that serves requests: threads and connections
+        don't survive a fork, so a service created before gunicorn forked its
+        workers is started in each worker instead (see shop.start_worker).
+        """
+        if self._warm_up is not None and self._warm_up.is_alive():
+            return
+        if self.client is not None and self._client_pid != os.getpid():
+            # Connected in a parent process; its pooled connections must not be shared with it
+            self.initialize_client()
+        self._warm_up = threading.Thread(target=self._run_warm_up, name='sheets-warm-up', daemon=True)
+        self._warm_up.start()
+
+    def _run_warm_up(self) -> None:
+        started = time.monotonic()
+        delay = 1.0
+        while not self._initialized:
+            if not self.spreadsheet_id:
+                return
+            if self.initialize_client():
+                break
+            logger.warning(f"Google Sheets is not reachable yet, retrying in {delay:.0f}s")
+            time.sleep(delay)
+            delay = min(delay * 2, WARM_UP_MAX_DELAY)
+
+        # Replays status changes journaled before a restart, then writes new ones as they come
+        self._start_status_flush()
+        try:
+            with background_lane():
+                self._orders_cache.get()
+                if not self.mock:
+                    self._measurements_cache.get()
+            logger.info(f"Sheets warm-up complete in {time.monotonic() - started:.1f}s")
+        except Exception as e:
+            # Not ready yet; the first request (or the background sync) loads the snapshots instead
+            logger.error(f"Failed to load snapshots during warm-up: {e}")
+        self.start_background_sync()
+
+    def ready(self) -> bool:
+        """Whether requests can be served: connected, with the orders snapshot loaded."""
+        return self._initialized and (self.mock or self._orders_cache.peek() is not None)
+
+    def readiness(self) -> Dict[str, Any]:
+        """The state ready() is derived from, for health checks."""
+        orders = self._orders_cache.peek()
+        measurements = self._measurements_cache.peek()
+        mirror_age = self.mirror.age() if self.mirror is not None else None
+        return {
+            'ready': self.ready(),
+            'initialized': self._initialized,
+            'mock': self.mock,
+            'orders_age': None if orders is None else round(orders.age(), 1),
+            'measurements_age': None if measurements is None else round(measurements.age(), 1),
+            'mirror_age': None if mirror_age is None else round(mirror_age, 1),
+            'background_sync': self._background_sync is not None and self._background_sync.running,
+            'combined_orders_queued': len(self._combined_orders_queue),
+            'status_changes_pending': None if self.status_journal is None else self.status_journal.pending_count(),
+        }
     
     def initialize_client(self):
-        """Initialize Google Sheets client with service account credentials"""
+        """Initialize Google Sheets client with service account credentials.
+
+        Also used to reconnect: the key file is only re-read if it changed, and an
+        already opened spreadsheet (and its worksheet handles) is moved onto the
+        new session instead of being opened again, so no metadata is refetched.
+        """
         try:
-            # Define the scope
-            scope = [
-                'https://spreadsheets.google.com/feeds',
-                'https://www.googleapis.com/auth/drive'
-            ]
-            
             # Allow a mock mode for local development when real credentials are not available
             mock_env = os.getenv('MOCK_SHEETS', '').lower()
             if mock_env in ('1', 'true', 'yes'):
                 self.mock = True
+                self._initialized = True
                 logger.info('MOCK_SHEETS enabled: using in-memory mock data for Google Sheets')
                 return True
 
+            if settings.FAKE_SHEETS_ROWS > 0:
+                from fake_sheets import FakeSpreadsheet
+                self.use_spreadsheet(FakeSpreadsheet.generate(
+                    settings.FAKE_SHEETS_ROWS,
+                    latency=settings.FAKE_SHEETS_LATENCY,
+                    rate_limit_ratio=settings.FAKE_SHEETS_429_RATE,
+                    scheduler=self.scheduler
+                ))
+                logger.warning(f"FAKE_SHEETS_ROWS enabled: serving {settings.FAKE_SHEETS_ROWS} generated orders "
+                               f"instead of Google Sheets")
+                return True
+
             # Get credentials file path from environment
             creds_file = os.getenv('GOOGLE_SERVICE_ACCOUNT_FILE', 'service-account.json')
 
@@ -149,111 +622,254 @@ class GoogleSheetsService:
                 logger.warning(f"Service account file not found: {creds_file}. Set MOCK_SHEETS=1 to run without Google Sheets.")
                 return False
 
-            # Validate JSON looks like a service account file before trying to load
+            # Load credentials (validated and cached; re-read only when the key file changes)
+            if self._service_account is None or self._service_account.path != creds_file:
+                self._service_account = ServiceAccount(creds_file, SCOPES)
             try:
-                with open(creds_file, 'r', encoding='utf-8') as f:
-                    creds_json = json.load(f)
-            except Exception as e:
-                logger.error(f"Failed to read credentials file {creds_file}: {e}")
-                return False
-
-            # Basic validation of expected fields in a service account key
-            if not creds_json.get('client_email') or not creds_json.get('private_key'):
-                logger.error(f"Credentials file {creds_file} does not appear to be a service account key. Set GOOGLE_SERVICE_ACCOUNT_FILE to a valid service account JSON or enable MOCK_SHEETS=1.")
+                creds = self._service_account.credentials()
+            except ValueError as e:
+                logger.error(str(e))
                 return False
 
-            # Load credentials
-            creds = Credentials.from_service_account_file(creds_file, scopes=scope)
-            self.client = gspread.authorize(creds)
+            # A fresh session, with a keep-alive connection to Google for every request thread
+            self.client = connect(creds, scheduled_http_client(self.scheduler), max(10, settings.WORKER_THREADS))
+            self._client_pid = os.getpid()
+            self._combined_orders_worksheet = None
 
-            # Open the spreadsheet
-            self.spreadsheet = self.client.open_by_key(self.spreadsheet_id)
-            logger.info("Google Sheets client initialized successfully")
+            if isinstance(self.spreadsheet, gspread.Spreadsheet) and self.spreadsheet.id == self.spreadsheet_id:
+                # Reconnecting: keep the spreadsheet's metadata and move its handles onto the new session
+                self.spreadsheet.client = self.client.http_client
+                with self._worksheets_lock:
+                    for worksheet in self._worksheets.values():
+                        worksheet.client = self.client.http_client
+                logger.info("Google Sheets client reconnected")
+            else:
+                # Open the spreadsheet
+                self.spreadsheet = self.client.open_by_key(self.spreadsheet_id)
+                logger.info("Google Sheets client initialized successfully")
             self._initialized = True
+            self._start_token_refresh()
             return True
             
         except Exception as e:
             logger.error(f"Failed to initialize Google Sheets client: {e}")
             return False
     
+    def _start_token_refresh(self) -> None:
+        """Refresh the access token ahead of expiry in the background, so no request waits on it."""
+        if self._token_refresh is None and self._service_account is not None:
+            service_account = self._service_account
+
+            def refresh() -> None:
+                service_account.refresh_if_expiring()
+
+            self._token_refresh = BackgroundSync('token', refresh, TOKEN_CHECK_INTERVAL)
+        if self._token_refresh is not None:
+            self._token_refresh.start()
+
+    def worksheet(self, name: str) -> gspread.Worksheet:
+        """A cached handle to worksheet ``name``.
+
+        Handles for every worksheet come from a single metadata request, made
+        again only after invalidate_worksheets (e.g. when a worksheet was
+        renamed or a write through a handle failed).
+
+        Raises:
+            gspread.exceptions.WorksheetNotFound: If the spreadsheet has no such worksheet.
+        """
+        if not self.spreadsheet:
+            raise RuntimeError("No active spreadsheet connection")
+        with self._worksheets_lock:
+            worksheet = self._worksheets.get(name)
+            if worksheet is None:
+                self._worksheets = {ws.title: ws for ws in self.spreadsheet.worksheets()}
+                worksheet = self._worksheets.get(name)
+                if worksheet is None:
+                    raise gspread.exceptions.WorksheetNotFound(name)
+            return worksheet
+
+    def invalidate_worksheets(self) -> None:
+        """Drop cached worksheet handles; the next worksheet() call refetches the spreadsheet metadata."""
+        with self._worksheets_lock:
+            self._worksheets = {}
+            self._combined_orders_worksheet = None
+
+    def use_spreadsheet(self, spreadsheet: gspread.Spreadsheet) -> None:
+        """Read and write ``spreadsheet`` (e.g. a fake_sheets.FakeSpreadsheet) instead of connecting to Google.
+
+        Cached snapshots and row positions from the previous spreadsheet are dropped.
+        """
+        self.spreadsheet = spreadsheet
+        self.mock = False
+        self._initialized = True
+        self.invalidate_worksheets()
+        with self._row_index_lock:
+            self._row_index.clear()
+            self._row_index_last.clear()
+        self._orders_cache.invalidate()
+        self._measurements_cache.invalidate()
+
+    def _needs_reconnect(self, error: BaseException) -> bool:
+        """Whether a failed Sheets call calls for a new session: never connected, or the credentials were rejected."""
+        return not self.spreadsheet or error_status(error) == 401 or 'Invalid credentials' in str(error)
+
     def is_initialized(self) -> bool:
         """Check if the service is initialized and ready to use"""
         return self._initialized
 
     def get_all_orders(self) -> List[Order]:
         """Get all orders from the Orders sheet.
+
+        Orders are served from an in-memory snapshot that is refreshed at most
+        once per ``SHEETS_CACHE_TTL`` seconds. The snapshot stores orders by
+        column, so this builds a dict per order; request handlers should use
+        get_orders_snapshot and materialize only the rows they return.
         
         Returns:
             List[Order]: A list of Order objects containing order details.
             Returns an empty list if there are errors.
         """
+        snapshot = self.get_orders_snapshot()
+        return snapshot.data.table.to_orders() if snapshot is not None else []
+
+    def get_orders_snapshot(self) -> Optional[Snapshot[OrderIndex]]:
+        """Get the current orders snapshot, loading or refreshing it if needed.
+
+        Returns:
+            Optional[Snapshot[OrderIndex]]: The snapshot, or None if the orders
+            could not be loaded.
+        """
+        try:
+            if not self.mock and not self.spreadsheet and self.mirror is None:
+                logger.error("No active spreadsheet connection")
+                return None
+
+            snapshot = self._orders_cache.get()
+            logger.debug("Serving %d orders from snapshot v%d (%.1fs old)", len(snapshot.data), snapshot.version, snapshot.age())
+            return snapshot
+
+        except Exception as e:
+            logger.error(f"Error in get_all_orders: {e}", exc_info=True)
+            return None
+
+    def orders_digest(self) -> Optional[str]:
+        """Digest of the current orders snapshot, refreshing it as the TTLs require; None if unavailable.
+
+        Unlike get_orders_snapshot this doesn't log, so it is cheap to call from long-lived streams.
+        """
+        if not self.mock and not self.spreadsheet and self.mirror is None:
+            return None
         try:
-            logger.info("=== Starting get_all_orders ===")
+            return self._orders_cache.get().data.digest
+        except Exception as e:
+            logger.error(f"Failed to load orders: {e}")
+            return None
+
+    def _record_order_changes(self, previous: Optional[Snapshot[OrderIndex]], current: Snapshot[OrderIndex]) -> None:
+        events = [] if previous is None else diff_orders(previous.data.table, current.data.table)
+        if events:
+            logger.info(f"Orders snapshot v{current.version}: {len(events)} order events")
+        self.order_events.record(current.data.digest, events)
+
+    def _update_order_summary(self, previous: Optional[Snapshot[OrderIndex]], current: Snapshot[OrderIndex]) -> None:
+        started = time.perf_counter()
+        changed = self.order_summary.update(current.data.table, current.version)
+        logger.debug("Dashboard summary v%d: %d orders changed (%.1f ms)",
+                     current.version, changed, (time.perf_counter() - started) * 1000)
+
+    def get_dashboard_summary(self) -> Optional[Dict[str, Any]]:
+        """Aggregates for the dashboard: revenue, status and payment totals of the orders, and worker payments.
+
+        Returns:
+            Optional[Dict[str, Any]]: The summary, or None if the orders could not be loaded.
+            ``worker_payments`` is None unless WORKERS_SHEETS_ID is set and readable.
+        """
+        snapshot = self.get_orders_snapshot()
+        if snapshot is None:
+            return None
+        summary: Dict[str, Any] = self.order_summary.to_dict()
+        summary['orders_digest'] = snapshot.data.digest
+        summary['worker_payments'] = None
+        if settings.WORKERS_SHEETS_ID and self.client is not None:
+            try:
+                self._worker_payments_cache.get()
+                summary['worker_payments'] = self.worker_payments.to_dict()
+            except Exception as e:
+                logger.error(f"Failed to load worker payments: {e}")
+        return summary
+
+    def _load_worker_payments(self) -> List[List[List[Any]]]:
+        """Read the Worker_List and Payment_Daily_Entry sheets of WORKERS_SHEETS_ID in one request."""
+        if self.client is None or not settings.WORKERS_SHEETS_ID:
+            raise RuntimeError("No active connection to the workers spreadsheet")
+        logger.info("Fetching Worker_List and Payment_Daily_Entry sheets")
+        response = self.client.http_client.values_batch_get(
+            settings.WORKERS_SHEETS_ID, ["'Worker_List'", "'Payment_Daily_Entry'"], params=VALUE_RENDER_PARAMS
+        )
+        return [value_range.get('values', []) for value_range in response.get('valueRanges', [])]
+
+    def _update_worker_payments(self, previous: Optional[Snapshot[List[List[List[Any]]]]],
+                                current: Snapshot[List[List[List[Any]]]]) -> None:
+        worker_values, payment_values = current.data
+        workers = decode_columns(worker_values, WORKER_COLUMNS)
+        changed = self.worker_payments.update(len(workers['name']), decode_columns(payment_values, PAYMENT_COLUMNS))
+        logger.info(f"Worker payments snapshot v{current.version}: {changed} entries changed")
+
+    def measurements_updated_at(self) -> Optional[float]:
+        """Wall-clock time the cached measurements were last loaded or changed, if cached."""
+        snapshot = self._measurements_cache.peek()
+        return snapshot.created_at if snapshot is not None else None
+
+    def invalidate_orders_cache(self) -> None:
+        """Make the next get_all_orders call re-read the Orders sheet."""
+        self._orders_cache.invalidate()
+
+    def _load_orders(self) -> OrderIndex:
+        """Read every order from the Orders sheet, bypassing the snapshot cache.
+
+        Raises on sheet errors so the cache can keep serving its last good snapshot.
+        """
+        try:
+            logger.info("=== Starting orders load ===")
             
             if self.mock:
                 logger.info("Using mock data")
-                return self._mock_orders
+                return OrderIndex(OrderTable.from_orders(self._mock_orders))
 
-            if not self.spreadsheet:
-                logger.error("No active spreadsheet connection")
-                return []
-            
             try:
-                logger.info("Accessing Orders worksheet")
-                orders_sheet = self.spreadsheet.worksheet('Orders')
-                
-                logger.info("Fetching all records")
-                records = orders_sheet.get_all_records()
-                logger.info(f"Retrieved {len(records)} records from sheet")
-                
-                # Convert to list of dictionaries with standardized keys
-                orders: List[Order] = []
-                records_count = len(records)
-                logger.info(f"Processing {records_count} records")
-                
-                for i, record in enumerate(records, 1):
-                    try:
-                        order: Order = {
-                            'order_id': str(record.get('Order ID', '')),
-                            'customer_name': str(record.get('Customer Name', '')),
-                            'contact_info': str(record.get('Contact Info', '')),
-                            'address': str(record.get('Address', '')),
-                            'customer_type': str(record.get('Customer Type', '')),
-                            'garment_types': str(record.get('Garment Types', '')),
-                            'order_date': str(record.get('Order Date', '')),
-                            'delivery_date': str(record.get('Delivery Date', '')),
-                            'delivery_status': str(record.get('Delivery Status', '')),
-                            'price': float(record.get('Price', 0)),
-                            'payment_status': str(record.get('Payment Status', '')),
-                            'season': str(record.get('Season', '')),
-                            'festival': str(record.get('Festival', '')),
-                            'notes': str(record.get('Notes', '')),
-                            'created_at': str(record.get('Created At', ''))
-                        }
-                        orders.append(order)
-                        if i % 10 == 0:  # Log progress every 10 records
-                            logger.info(f"Processed {i}/{records_count} records")
-                    except Exception as record_error:
-                        logger.error(f"Error processing record {i}: {record_error}")
-                        continue
-                
-                logger.info(f"Successfully processed {len(orders)} orders")
-                return orders
+                logger.info("Fetching Orders sheet values")
+                journal_checkpoint = self._journal_checkpoint()
+                values, = self._read_sheets(['Orders'])
+                logger.info(f"Retrieved {max(len(values) - 1, 0)} rows from Orders sheet")
+
+                # Decode straight into columns; no per-row dicts are built
+                table = OrderTable.from_columns(decode_columns(values, ORDER_COLUMNS))
+                logger.info(f"Successfully processed {len(table)} orders")
+                index = OrderIndex(table)
+                # Paid once per load, usually by the background refresh rather than a request
+                index.build_search_index()
+                # The values read may predate status changes still waiting in (or just flushed from) the journal
+                journaled = self._journaled_statuses(journal_checkpoint)
+                if journaled:
+                    index = index.with_statuses(journaled)
+                logger.info(f"Orders content digest: {index.digest}")
+                return index
                 
             except Exception as sheet_error:
                 logger.error(f"Error accessing Orders sheet: {sheet_error}", exc_info=True)
-                if not self.initialize_client():
+                # Keep the pooled session through transient errors (the scheduler already retried those)
+                if self._needs_reconnect(sheet_error) and not self.initialize_client():
                     logger.error("Failed to reinitialize client")
                 raise
             
-        except Exception as e:
-            logger.error(f"Error in get_all_orders: {e}", exc_info=True)
-            return []
         finally:
-            logger.info("=== Completed get_all_orders ===")
+            logger.info("=== Completed orders load ===")
     
     def get_order_measurements(self, order_id: str) -> OrderMeasurements:
         """Get measurements for a specific order from all measurement sheets.
+
+        The Shirts, Pants and Others sheets are read together in a single
+        batch request and cached like the Orders sheet.
         
         Args:
             order_id (str): The ID of the order to get measurements for.
@@ -263,133 +879,303 @@ class GoogleSheetsService:
             Returns empty measurements if there are errors.
         """
         try:
-            logger.info(f"=== Getting measurements for order {order_id} ===")
+            logger.debug("=== Getting measurements for order %s ===", order_id)
             
             if self.mock:
                 logger.info("Using mock data")
                 return self._mock_measurements.get(order_id, {'shirt': None, 'pants': None, 'others': None})
 
-            if not self.spreadsheet:
+            if not self.spreadsheet and self.mirror is None:
                 logger.error("No active spreadsheet connection")
                 return {'shirt': None, 'pants': None, 'others': None}
-            
-            measurements: OrderMeasurements = {
-                'shirt': None,
-                'pants': None,
-                'others': None
+
+            snapshot = self._measurements_cache.get()
+            measurements = snapshot.data.get(order_id)
+            if measurements is None:
+                logger.debug("No measurements found for order %s", order_id)
+                return {'shirt': None, 'pants': None, 'others': None}
+
+            logger.debug("Found measurements for order %s in snapshot v%d", order_id, snapshot.version)
+            return {
+                'shirt': measurements['shirt'],
+                'pants': measurements['pants'],
+                'others': measurements['others']
             }
             
-            # Get shirt measurements
-            try:
-                logger.info(f"Fetching shirt measurements for order {order_id}")
-                shirt_sheet = self.spreadsheet.worksheet('Shirts')
-                shirt_records = shirt_sheet.get_all_records()
-                
-                for record in shirt_records:
-                    if record.get('Order ID') == order_id:
-                        logger.info(f"Found shirt measurements for order {order_id}")
-                        shirt_data: ShirtMeasurement = {
-                            'order_id': str(record.get('Order ID', '')),
-                            'customer_name': str(record.get('Customer Name', '')),
-                            'address': str(record.get('Address', '')),
-                            'order_date': str(record.get('Order Date', '')),
-                            'delivery_date': str(record.get('Delivery Date', '')),
-                            'quantity': int(record.get('Quantity', 1)),
-                            'fabric_meters': float(record.get('Fabric Meters', 0)),
-                            'chest': float(record.get('Chest', 0)),
-                            'shoulder': float(record.get('Shoulder', 0)),
-                            'sleeve_length': float(record.get('Sleeve Length', 0)),
-                            'shirt_length': float(record.get('Shirt Length', 0)),
-                            'neck': float(record.get('Neck', 0)),
-                            'bicep': float(record.get('Bicep', 0)),
-                            'bajoo': float(record.get('Bajoo', 0)),
-                            'price': float(record.get('Price', 0)),
-                            'status': str(record.get('Status', '')),
-                            'notes': str(record.get('Notes', '')),
-                            'created_at': str(record.get('Created At', ''))
-                        }
-                        measurements['shirt'] = shirt_data
-                        break
-                else:
-                    logger.info(f"No shirt measurements found for order {order_id}")
-                        
-            except Exception as e:
-                logger.error(f"Error fetching shirt measurements for {order_id}: {e}", exc_info=True)
-            
-            # Get pants measurements
+        except Exception as e:
+            logger.error(f"Error fetching measurements for order {order_id}: {e}", exc_info=True)
+            return {'shirt': None, 'pants': None, 'others': None}
+
+    def _load_measurements(self) -> Dict[str, OrderMeasurements]:
+        """Read the Shirts, Pants and Others sheets in one batch request.
+
+        Returns:
+            Dict[str, OrderMeasurements]: Measurements keyed by order ID. When an
+            order appears more than once in a sheet, the first row wins.
+        """
+        sheet_names = [sheet_name for _, sheet_name, _ in MEASUREMENT_SHEETS]
+        logger.info(f"Fetching measurement sheets in one batch: {', '.join(sheet_names)}")
+        journal_checkpoint = self._journal_checkpoint()
+        sheet_values = self._read_sheets(sheet_names)
+
+        by_order: Dict[str, OrderMeasurements] = {}
+        for (kind, sheet_name, columns), values in zip(MEASUREMENT_SHEETS, sheet_values):
+            rows = decode_rows(values, columns)
+            logger.info(f"Decoded {len(rows)} rows from {sheet_name} sheet")
+            for row in rows:
+                entry = by_order.setdefault(row['order_id'], {'shirt': None, 'pants': None, 'others': None})
+                if entry[kind] is None:  # type: ignore[literal-required]
+                    entry[kind] = row  # type: ignore[literal-required]
+        journaled = self._journaled_statuses(journal_checkpoint)
+        return _with_measurement_statuses(by_order, journaled) if journaled else by_order
+
+    def _read_sheets(self, sheet_names: List[str]) -> List[List[List[Any]]]:
+        """Read the values (header row first) of whole worksheets in one request.
+
+        With a mirror configured, the values come from the local copy, which is
+        synced first if it is older than ``SHEETS_CACHE_TTL``. A failed sync
+        falls back to the mirrored values when there are any.
+        """
+        if self.mirror is None:
+            if not self.spreadsheet:
+                raise RuntimeError("No active spreadsheet connection")
+            return self._batch_get_values([f"'{sheet_name}'" for sheet_name in sheet_names])
+
+        age = self.mirror.age()
+        if age is not None and self._background_sync is not None and self._background_sync.running:
+            logger.debug("Reading %s from sheet mirror (%.1fs old, synced in background)", sheet_names, age)
+        elif age is None or age >= settings.SHEETS_CACHE_TTL:
             try:
-                logger.info(f"Fetching pants measurements for order {order_id}")
-                pants_sheet = self.spreadsheet.worksheet('Pants')
-                pants_records = pants_sheet.get_all_records()
-                
-                for record in pants_records:
-                    if record.get('Order ID') == order_id:
-                        logger.info(f"Found pants measurements for order {order_id}")
-                        pants_data: PantMeasurement = {
-                            'order_id': str(record.get('Order ID', '')),
-                            'customer_name': str(record.get('Customer Name', '')),
-                            'address': str(record.get('Address', '')),
-                            'order_date': str(record.get('Order Date', '')),
-                            'delivery_date': str(record.get('Delivery Date', '')),
-                            'quantity': int(record.get('Quantity', 1)),
-                            'fabric_meters': float(record.get('Fabric Meters', 0)),
-                            'waist': float(record.get('Waist', 0)),
-                            'hip': float(record.get('Hip', 0)),
-                            'inseam': float(record.get('Inseam', 0)),
-                            'outseam': float(record.get('Outseam', 0)),
-                            'thigh': float(record.get('Thigh', 0)),
-                            'knee': float(record.get('Knee', 0)),
-                            'bottom': float(record.get('Bottom', 0)),
-                            'price': float(record.get('Price', 0)),
-                            'status': str(record.get('Status', '')),
-                            'notes': str(record.get('Notes', '')),
-                            'created_at': str(record.get('Created At', ''))
-                        }
-                        measurements['pants'] = pants_data
-                        break
-                else:
-                    logger.info(f"No pants measurements found for order {order_id}")
-                        
+                self.sync_mirror()
             except Exception as e:
-                logger.error(f"Error fetching pants measurements for {order_id}: {e}", exc_info=True)
-            
-            # Get other measurements
+                if age is None:
+                    raise
+                logger.warning(f"Sheet mirror sync failed, serving mirrored data {age:.0f}s old: {e}")
+        else:
+            logger.debug("Reading %s from sheet mirror (%.1fs old)", sheet_names, age)
+        return [self.mirror.values(sheet_name) for sheet_name in sheet_names]
+
+    def sync_mirror(self) -> None:
+        """Pull every mirrored sheet from Google Sheets into the local mirror."""
+        if self.mirror is None:
+            return
+        if not self.spreadsheet:
+            raise RuntimeError("No active spreadsheet connection")
+        self.mirror.sync(self._batch_get_values)
+        metrics.mark_mirror_synced(time.time())
+
+    def start_background_sync(self, interval: Optional[float] = None) -> bool:
+        """Keep the snapshots fresh from a background thread so requests never wait on Google Sheets.
+
+        Without a mirror, every ``interval`` seconds the sheets are re-read and
+        a new snapshot published only if the data changed. With a mirror, the
+        worker processes sharing it take turns pulling from Google Sheets once
+        per ``interval`` and each reloads its snapshots from the mirror when
+        the pulled rows changed.
+
+        Args:
+            interval (Optional[float]): Seconds between pulls; defaults to SHEETS_SYNC_INTERVAL.
+
+        Returns:
+            bool: True if the sync thread is running.
+        """
+        if interval is None:
+            interval = settings.SHEETS_SYNC_INTERVAL
+        if self.mock or interval <= 0:
+            return False
+        if interval >= settings.SHEETS_CACHE_TTL:
+            logger.warning(f"SHEETS_SYNC_INTERVAL ({interval:g}s) is not below SHEETS_CACHE_TTL "
+                           f"({settings.SHEETS_CACHE_TTL:g}s); requests may still load sheets themselves")
+        if self._background_sync is None:
+            tick = min(interval, MIRROR_POLL_INTERVAL) if self.mirror is not None else interval
+            sync_interval = interval
+            self._background_sync = BackgroundSync('sheets', lambda: self.sync_snapshots(sync_interval), tick)
+        self._background_sync.start()
+        return True
+
+    def stop_background_sync(self) -> None:
+        if self._background_sync is not None:
+            self._background_sync.stop()
+
+    def sync_snapshots(self, interval: float) -> None:
+        """One round of background syncing; see start_background_sync."""
+        if not self.spreadsheet and self.mirror is None:
+            raise RuntimeError("No active spreadsheet connection")
+
+        if self.mirror is None:
+            self._orders_cache.refresh()
+            self._measurements_cache.refresh()
+            return
+
+        if self.spreadsheet and self.mirror.claim_sync(interval):
             try:
-                logger.info(f"Fetching other measurements for order {order_id}")
-                others_sheet = self.spreadsheet.worksheet('Others')
-                others_records = others_sheet.get_all_records()
-                
-                for record in others_records:
-                    if record.get('Order ID') == order_id:
-                        logger.info(f"Found other measurements for order {order_id}")
-                        others_data: OtherMeasurement = {
-                            'order_id': str(record.get('Order ID', '')),
-                            'customer_name': str(record.get('Customer Name', '')),
-                            'address': str(record.get('Address', '')),
-                            'order_date': str(record.get('Order Date', '')),
-                            'delivery_date': str(record.get('Delivery Date', '')),
-                            'quantity': int(record.get('Quantity', 1)),
-                            'fabric_meters': float(record.get('Fabric Meters', 0)),
-                            'price': float(record.get('Price', 0)),
-                            'status': str(record.get('Status', '')),
-                            'notes': str(record.get('Notes', '')),
-                            'created_at': str(record.get('Created At', ''))
-                        }
-                        measurements['others'] = others_data
-                        break
-                else:
-                    logger.info(f"No other measurements found for order {order_id}")
-                        
+                self.sync_mirror()
             except Exception as e:
-                logger.error(f"Error fetching other measurements for {order_id}: {e}", exc_info=True)
-            
-            logger.info(f"=== Completed getting measurements for order {order_id} ===")
-            return measurements
-            
+                # Keep reloading from the mirror; the lease already spaces out the next attempt
+                logger.error(f"Failed to sync sheet mirror from Google Sheets: {e}")
+
+        generations = self.mirror.generations()
+        measurement_sheets = [sheet_name for _, sheet_name, _ in MEASUREMENT_SHEETS]
+        for cache, sheet_names in ((self._orders_cache, ['Orders']), (self._measurements_cache, measurement_sheets)):
+            # Read before loading, so rows changed during the load are picked up next round
+            current = tuple(generations.get(sheet_name, 0) for sheet_name in sheet_names)
+            if cache.peek() is None or self._synced_generations.get(cache.name) != current:
+                cache.refresh()
+                self._synced_generations[cache.name] = current
+            else:
+                cache.touch()
+
+    def create_combined_order(self, data: Dict[str, Any]) -> PendingWrite[CombinedOrder]:
+        """Queue a combined fabric+tailoring order for the Combine Orders sheet.
+
+        The order gets its IDs here (``master_order_id`` as sent by the order
+        form, else its ``combined_order_id``, else a new one, and
+        ``combined_order_id`` derived from it when not sent) and is
+        appended with the other orders queued around the same time in a single
+        request. Submitting an order whose Combined Order ID is already queued
+        or was recently written returns that order instead of appending it again,
+        so the form can safely retry.
+
+        Args:
+            data (Dict[str, Any]): Order fields as posted by the order form.
+
+        Returns:
+            PendingWrite[CombinedOrder]: The queued order; wait() on it for the sheet row.
+
+        Raises:
+            RuntimeError: If there is no Combine Orders sheet to write to (see combined_orders_configured).
+        """
+        if not self.combined_orders_configured():
+            raise RuntimeError('COMBINED_ORDERS_SHEETS_ID is not set')
+        master_order_id = _to_str(data.get('master_order_id')).strip()
+        combined_order_id = _to_str(data.get('combined_order_id')).strip()
+        with self._combined_orders_lock:
+            master_order_id = master_order_id or combined_order_id or self._new_master_order_id()
+            combined_order_id = combined_order_id or f"C-{master_order_id}"
+            pending = self._combined_orders.get(combined_order_id)
+            if pending is not None:
+                logger.info(f"Combined order {combined_order_id} was already submitted")
+                return pending
+
+            fabric_price = _to_float(data.get('fabric_price'))
+            tailoring_price = _to_float(data.get('tailoring_price'))
+            order: CombinedOrder = {
+                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'combined_order_id': combined_order_id,
+                'master_order_id': master_order_id,
+                'customer_name': _to_str(data.get('customer_name')),
+                'contact': _to_str(data.get('contact')),
+                'address': _to_str(data.get('address')),
+                'customer_type': _to_str(data.get('customer_type')) or 'New',
+                'order_date': _to_str(data.get('order_date')),
+                'session': _to_str(data.get('sessions', data.get('session'))),
+                'notes': _to_str(data.get('notes')),
+                'fabric_order_id': _to_str(data.get('fabric_order_id')) or f"F-{master_order_id}",
+                'fabric_price': fabric_price,
+                'tailoring_order_id': _to_str(data.get('tailoring_order_id')) or f"T-{master_order_id}",
+                'tailoring_price': tailoring_price,
+                'total_amount': _to_float(data.get('total_amount'), fabric_price + tailoring_price),
+                'payment_status': _to_str(data.get('paid_status', data.get('payment_status'))) or 'Unpaid',
+            }
+            pending = self._combined_orders_queue.submit(order)
+            self._combined_orders[combined_order_id] = pending
+            # Forget the oldest written orders; queued ones are kept until written
+            while len(self._combined_orders) > COMBINED_ORDERS_REMEMBERED:
+                oldest_id, oldest = next(iter(self._combined_orders.items()))
+                if not oldest.committed:
+                    break
+                del self._combined_orders[oldest_id]
+        logger.info(f"Queued combined order {combined_order_id} ({len(self._combined_orders_queue)} waiting to be written)")
+        return pending
+
+    def combined_orders_configured(self) -> bool:
+        """Whether new combined orders have a sheet to go to: COMBINED_ORDERS_SHEETS_ID is set, or data is mock or fake."""
+        return bool(settings.COMBINED_ORDERS_SHEETS_ID) or self.mock or self.client is None
+
+    def _new_master_order_id(self) -> str:
+        """A Master Order ID in the order form's format (CMB, epoch milliseconds, 3 random digits)."""
+        while True:
+            master_order_id = f"CMB{int(time.time() * 1000)}{random.randrange(1000):03d}"
+            if f"C-{master_order_id}" not in self._combined_orders:
+                return master_order_id
+
+    def _append_combined_orders(self, orders: List[CombinedOrder], attempt: int) -> List[Optional[int]]:
+        """Append a batch of combined orders to the Combine Orders sheet in one request.
+
+        The commit function of the combined orders queue. When retrying a
+        failed batch, orders already in the sheet (an append whose response was
+        lost may still have been applied) are located instead of appended again.
+
+        Returns:
+            List[Optional[int]]: The sheet row of each order.
+        """
+        if self.mock:
+            first = len(self._mock_combined_orders) + 2  # Row 1 is the header
+            self._mock_combined_orders.extend(orders)
+            return list(range(first, first + len(orders)))
+
+        try:
+            worksheet = self._combined_orders_sheet()
+            rows: Dict[str, int] = {}
+            if attempt:
+                rows = self._find_combined_orders(worksheet, {order['combined_order_id'] for order in orders})
+            missing = [order for order in orders if order['combined_order_id'] not in rows]
+            if missing:
+                logger.info(f"Appending {len(missing)} combined orders in one request")
+                response = worksheet.append_rows(
+                    [[order[field] for field, _, _, _ in COMBINED_ORDER_COLUMNS] for order in missing],  # type: ignore[literal-required]
+                    value_input_option='USER_ENTERED', table_range='A1'
+                )
+                updated_range = response['updates']['updatedRange']
+                first, _ = a1_to_rowcol(updated_range.split('!')[-1].split(':')[0])
+                for row, order in enumerate(missing, start=first):
+                    rows[order['combined_order_id']] = row
+            return [rows.get(order['combined_order_id']) for order in orders]
         except Exception as e:
-            logger.error(f"Error fetching measurements for order {order_id}: {e}", exc_info=True)
-            return {'shirt': None, 'pants': None, 'others': None}
-    
+            self.invalidate_worksheets()
+            if self._needs_reconnect(e):
+                self.initialize_client()
+            raise
+
+    def _combined_orders_sheet(self) -> gspread.Worksheet:
+        """The Combine Orders worksheet, created with its header row if the spreadsheet has none yet."""
+        sheets_id = settings.COMBINED_ORDERS_SHEETS_ID
+        if not sheets_id or sheets_id == self.spreadsheet_id or self.client is None:
+            try:
+                return self.worksheet(COMBINED_ORDERS_SHEET)
+            except gspread.exceptions.WorksheetNotFound:
+                assert self.spreadsheet is not None
+                worksheet = self._add_combined_orders_sheet(self.spreadsheet)
+                self.invalidate_worksheets()
+                return worksheet
+
+        with self._worksheets_lock:
+            if self._combined_orders_worksheet is None:
+                spreadsheet = self.client.open_by_key(sheets_id)
+                try:
+                    self._combined_orders_worksheet = spreadsheet.worksheet(COMBINED_ORDERS_SHEET)
+                except gspread.exceptions.WorksheetNotFound:
+                    self._combined_orders_worksheet = self._add_combined_orders_sheet(spreadsheet)
+            return self._combined_orders_worksheet
+
+    def _add_combined_orders_sheet(self, spreadsheet: gspread.Spreadsheet) -> gspread.Worksheet:
+        logger.info(f"Creating the {COMBINED_ORDERS_SHEET} sheet")
+        worksheet = spreadsheet.add_worksheet(COMBINED_ORDERS_SHEET, rows=1000, cols=len(COMBINED_ORDER_COLUMNS))
+        worksheet.append_row([name for _, name, _, _ in COMBINED_ORDER_COLUMNS])
+        return worksheet
+
+    def _find_combined_orders(self, worksheet: gspread.Worksheet, combined_order_ids: Set[str]) -> Dict[str, int]:
+        """Rows of the Combine Orders sheet holding any of ``combined_order_ids``, read from the ID column only."""
+        column = _column_letter([field for field, _, _, _ in COMBINED_ORDER_COLUMNS].index('combined_order_id') + 1)
+        rows: Dict[str, int] = {}
+        for row, cells in enumerate(worksheet.get(f"{column}:{column}"), start=1):
+            combined_order_id = _to_str(cells[0]) if cells else ''
+            if row > 1 and combined_order_id in combined_order_ids:
+                rows.setdefault(combined_order_id, row)
+        if rows:
+            logger.info(f"{len(rows)} combined orders from the failed append were already written")
+        return rows
+
     def update_order_status(self, order_id: str, new_status: str) -> bool:
         """Update status for an order in all relevant sheets.
         
@@ -400,141 +1186,329 @@ class GoogleSheetsService:
         Returns:
             bool: True if any sheet was updated successfully, False otherwise.
         """
+        return self.update_order_statuses({order_id: new_status}).get(order_id, False)
+
+    def update_order_statuses(self, updates: Dict[str, str]) -> Dict[str, bool]:
+        """Update the status of several orders in all relevant sheets with one batched write.
+
+        With STATUS_JOURNAL_PATH set, changes to orders in the cached snapshots
+        are committed to the local status journal and applied to the snapshots
+        instead, and written to the sheets in the background (see
+        flush_status_journal), so this returns without waiting for Google.
+        
+        Args:
+            updates (Dict[str, str]): The new status value keyed by order ID.
+        
+        Returns:
+            Dict[str, bool]: For each order ID, True if any sheet was updated, False otherwise.
+        """
+        results = {order_id: False for order_id in updates}
         try:
-            logger.info(f"=== Updating status for order {order_id} to '{new_status}' ===")
+            logger.info(f"=== Updating status for {len(updates)} orders ===")
             
             if self.mock:
                 logger.info("Using mock data")
-                updated = False
                 for order in self._mock_orders:
-                    if order['order_id'] == order_id:
-                        logger.info(f"Found matching mock order {order_id}")
-                        order['delivery_status'] = new_status
-                        updated = True
-                return updated
+                    if order['order_id'] in updates:
+                        logger.info(f"Found matching mock order {order['order_id']}")
+                        order['delivery_status'] = updates[order['order_id']]
+                        results[order['order_id']] = True
+                self._patch_cached_statuses({order_id: updates[order_id] for order_id, ok in results.items() if ok})
+                return results
+
+            if self.status_journal is not None:
+                journaled = self._journal_statuses(updates)
+                results.update({order_id: True for order_id in journaled})
+                # Orders the cached snapshots don't know (e.g. created since the last load) are looked up in the sheets
+                updates = {order_id: status for order_id, status in updates.items() if order_id not in journaled}
+                if not updates:
+                    return results
 
             if not self.spreadsheet:
                 logger.error("No active spreadsheet connection")
-                return False
-            
-            sheets_to_update = [
-                ('Orders', 9),  # Column I (Delivery Status)
-                ('Shirts', 16),  # Column P (Status)
-                ('Pants', 16),  # Column P (Status)
-                ('Others', 10)  # Column J (Status)
-            ]
-            
-            any_updated = False
+                return results
             
-            for sheet_name, status_column in sheets_to_update:
-                try:
-                    logger.info(f"Updating {sheet_name} sheet for order {order_id}")
-                    worksheet = self.spreadsheet.worksheet(sheet_name)
-                    records = worksheet.get_all_records()
-                    
-                    found = False
-                    for i, record in enumerate(records, start=2):  # Start from row 2 (skip header)
-                        if record.get('Order ID') == order_id:
-                            logger.info(f"Found matching record in {sheet_name} sheet")
-                            worksheet.update_cell(i, status_column, new_status)
-                            logger.info(f"Updated {sheet_name} sheet status to '{new_status}'")
-                            any_updated = True
-                            found = True
-                            break
-                    
-                    if not found:
-                        logger.info(f"No matching record found in {sheet_name} sheet")
-                        
-                except Exception as sheet_error:
-                    logger.error(f"Error updating {sheet_name} sheet for order {order_id}: {sheet_error}", exc_info=True)
-                    if 'Invalid credentials' in str(sheet_error):
-                        logger.info("Attempting to reinitialize client due to credential error")
-                        if not self.initialize_client():
-                            logger.error("Failed to reinitialize client")
-                            return False
-                        try:
-                            # Retry once after reinitialization
-                            logger.info(f"Retrying update of {sheet_name} sheet after client reinitialization")
-                            worksheet = self.spreadsheet.worksheet(sheet_name)
-                            records = worksheet.get_all_records()
-                            for i, record in enumerate(records, start=2):
-                                if record.get('Order ID') == order_id:
-                                    worksheet.update_cell(i, status_column, new_status)
-                                    logger.info(f"Successfully updated {sheet_name} sheet on retry")
-                                    any_updated = True
-                                    break
-                        except Exception as retry_error:
-                            logger.error(f"Retry failed for {sheet_name} sheet: {retry_error}", exc_info=True)
-            
-            if any_updated:
-                logger.info(f"Successfully updated one or more sheets for order {order_id}")
-            else:
-                logger.warning(f"No sheets were updated for order {order_id}")
+            try:
+                written = self._write_statuses(updates)
+            except Exception as write_error:
+                logger.error(f"Error updating order statuses: {write_error}", exc_info=True)
+                if 'Invalid credentials' not in str(write_error):
+                    return results
+                logger.info("Attempting to reinitialize client due to credential error")
+                if not self.initialize_client():
+                    logger.error("Failed to reinitialize client")
+                    return results
+                # Retry once after reinitialization
+                logger.info("Retrying status update after client reinitialization")
+                written = self._write_statuses(updates)
+
+            for order_id in updates:
+                if order_id in written:
+                    logger.info(f"Updated {', '.join(written[order_id])} for order {order_id} to '{updates[order_id]}'")
+                    results[order_id] = True
+                else:
+                    logger.warning(f"No sheets were updated for order {order_id}")
+            self._patch_cached_statuses({order_id: updates[order_id] for order_id in written})
                 
-            return any_updated
+            return results
             
         except Exception as e:
-            logger.error(f"Error updating status for order {order_id}: {e}", exc_info=True)
-            return False
+            logger.error(f"Error updating order statuses: {e}", exc_info=True)
+            return results
         finally:
             logger.info("=== Completed status update ===")
-            
-    def filter_orders(self, orders: List[Order], filters: Dict[str, str]) -> List[Order]:
-        """Filter orders based on provided criteria.
-        
-        Args:
-            orders (List[Order]): The list of orders to filter.
-            filters (Dict[str, str]): Filter criteria including:
-                - status: Filter by delivery status (e.g., 'pending', 'delivered')
-                - garment_type: Filter by garment type (e.g., 'shirt', 'pants')
-                - search: Search term for customer name, address, or order ID
-        
+
+    def _journal_statuses(self, updates: Dict[str, str]) -> Dict[str, str]:
+        """Durably journal the new statuses of orders in the cached snapshots and apply them to those snapshots.
+
+        They are written to the sheets by flush_status_journal in the background.
+
         Returns:
-            List[Order]: The filtered list of orders.
+            Dict[str, str]: The statuses journaled; orders not found in the snapshots are left out.
+        """
+        assert self.status_journal is not None
+        known = self._known_order_ids(list(updates))
+        journaled = {order_id: status for order_id, status in updates.items() if order_id in known}
+        if not journaled:
+            return {}
+        self.status_journal.append(journaled)
+        self._patch_cached_statuses(journaled)
+        logger.info(f"Journaled new status of {len(journaled)} orders for writing to Google Sheets")
+        if self._status_flush is not None:
+            self._status_flush.wake()
+        return journaled
+
+    def _known_order_ids(self, order_ids: List[str]) -> Set[str]:
+        """The IDs among ``order_ids`` found in the cached Orders or measurement snapshots."""
+        wanted = set(order_ids)
+        known: Set[str] = set()
+        orders = self._orders_cache.peek()
+        if orders is not None:
+            known.update(order_id for order_id in wanted if order_id in orders.data)
+        measurements = self._measurements_cache.peek()
+        if measurements is not None:
+            known.update(order_id for order_id in wanted if order_id in measurements.data)
+        return known
+
+    def _journal_checkpoint(self) -> Optional[int]:
+        """Where journaled changes a sheet read starting now may be missing begin; taken before the read."""
+        return None if self.status_journal is None else self.status_journal.checkpoint()
+
+    def _journaled_statuses(self, checkpoint: Optional[int]) -> Dict[str, str]:
+        """The status of each order changed in the journal since ``checkpoint``, to apply over values read after it.
+
+        Changes flushed while the sheets were being read are included: the
+        values read may or may not have them, and they are the current status
+        either way. Journal errors are raised, so a load never publishes values
+        missing acknowledged changes.
         """
+        if self.status_journal is None or checkpoint is None:
+            return {}
+        return self.status_journal.latest_since(checkpoint)
+
+    def _start_status_flush(self) -> None:
+        if self.status_journal is not None and self._status_flush is None:
+            self._status_flush = BackgroundSync('status-journal', self.flush_status_journal, settings.STATUS_FLUSH_INTERVAL)
+        if self._status_flush is not None:
+            self._status_flush.start()
+
+    def flush_status_journal(self) -> int:
+        """Write journaled status changes to the sheets: the latest status of each order, in one batch update.
+
+        Runs on the status-journal thread of the worker process holding the
+        flush lease. Raises when the write fails, so it is retried with backoff;
+        the changes stay journaled (and applied to loaded snapshots) meanwhile.
+
+        Returns:
+            int: Orders whose status was written.
+        """
+        journal = self.status_journal
+        if journal is None or self.mock or not self.spreadsheet:
+            return 0
+        if not journal.claim_flush(STATUS_FLUSH_LEASE):
+            return 0
+        through_seq, updates = journal.pending()
+        if not updates:
+            return 0
+
         try:
-            logger.info("=== Starting order filtering ===")
-            logger.info(f"Initial orders count: {len(orders)}")
-            logger.info(f"Applied filters: {filters}")
-            
-            filtered_orders = orders
-            
-            # Filter by status
-            if filters.get('status') and filters['status'] != 'all':
-                logger.info(f"Filtering by status: {filters['status']}")
-                filtered_orders = [order for order in filtered_orders 
-                                if order['delivery_status'].lower() == filters['status'].lower()]
-                logger.info(f"After status filter: {len(filtered_orders)} orders")
-            
-            # Filter by garment type
-            if filters.get('garment_type') and filters['garment_type'] != 'all':
-                logger.info(f"Filtering by garment type: {filters['garment_type']}")
-                garment_filter = filters['garment_type'].lower()
-                filtered_orders = [order for order in filtered_orders 
-                                if garment_filter in order['garment_types'].lower()]
-                logger.info(f"After garment type filter: {len(filtered_orders)} orders")
-            
-            # Search by customer name
-            if filters.get('search'):
-                logger.info(f"Searching for: {filters['search']}")
-                search_term = filters['search'].lower()
-                filtered_orders = [order for order in filtered_orders 
-                                if search_term in order['customer_name'].lower() or 
-                                   search_term in order['address'].lower() or
-                                   search_term in order['order_id'].lower()]
-                logger.info(f"After search filter: {len(filtered_orders)} orders")
-            
-            logger.info(f"Final filtered orders count: {len(filtered_orders)}")
-            return filtered_orders
-            
+            written = self._write_statuses(updates)
         except Exception as e:
-            logger.error(f"Error filtering orders: {e}", exc_info=True)
-            return []
-        finally:
-            logger.info("=== Completed order filtering ===")
+            if self._needs_reconnect(e):
+                self.initialize_client()
+            raise
+        journal.mark_flushed(through_seq)
+        for order_id, status in updates.items():
+            if order_id not in written:
+                logger.warning(f"Order {order_id} is in no status sheet; dropped its journaled status '{status}'")
+        logger.info(f"Flushed journaled status of {len(written)} orders to Google Sheets")
+        journal.purge(time.time() - STATUS_JOURNAL_RETENTION)
+        return len(written)
+
+    def _write_statuses(self, updates: Dict[str, str]) -> Dict[str, List[str]]:
+        """Write new statuses for several orders to every status sheet in one batch update.
+
+        Args:
+            updates (Dict[str, str]): New status keyed by order ID.
+
+        Returns:
+            Dict[str, List[str]]: The sheets written for each order that was found;
+            orders missing from every sheet are left out.
+        """
+        assert self.spreadsheet is not None
+        rows = self._locate_rows(list(updates))
+
+        data: List[Dict[str, Any]] = []
+        written: Dict[str, List[str]] = {}
+        cells: Dict[str, List[Tuple[int, int, Any]]] = {}
+        for sheet_name, _, status_column in STATUS_SHEETS:
+            for order_id, row in rows[sheet_name].items():
+                data.append({
+                    'range': f"'{sheet_name}'!{rowcol_to_a1(row, status_column)}",
+                    'values': [[updates[order_id]]]
+                })
+                written.setdefault(order_id, []).append(sheet_name)
+                cells.setdefault(sheet_name, []).append((row, status_column, updates[order_id]))
+
+        if not data:
+            return {}
+
+        logger.info(f"Writing {len(data)} status cells for {len(written)} orders in one batch update")
+        self.spreadsheet.values_batch_update({'valueInputOption': 'USER_ENTERED', 'data': data})
+
+        if self.mirror is not None:
+            try:
+                for sheet_name, sheet_cells in cells.items():
+                    self.mirror.update_cells(sheet_name, sheet_cells)
+            except Exception as e:
+                # The sheet itself was written; the next sync brings the mirror up to date
+                logger.error(f"Failed to apply status writes to sheet mirror: {e}")
+        return written
+
+    def _locate_rows(self, order_ids: List[str]) -> Dict[str, Dict[str, int]]:
+        """Find the row of each order in every status sheet using the Order ID index.
+
+        One batch read both verifies the indexed rows still hold the expected IDs
+        and picks up rows appended since the index was last read. Sheets whose
+        rows moved (e.g. a row was deleted) are re-indexed from their ID column.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Row numbers keyed by sheet name, then order ID.
+            Orders not present in a sheet are omitted for that sheet.
+        """
+        assert self.spreadsheet is not None
+        with self._row_index_lock:
+            if len(self._row_index) < len(STATUS_SHEETS) and self.mirror is not None:
+                self._seed_row_index_from_mirror()
+            if len(self._row_index) < len(STATUS_SHEETS):
+                self._rebuild_row_index([name for name, _, _ in STATUS_SHEETS])
+                return self._lookup_rows(order_ids)
+
+            # Verify the indexed rows and read any appended rows in the same request
+            checks: List[Tuple[str, str, int]] = []
+            ranges: List[str] = []
+            for sheet_name, id_column, _ in STATUS_SHEETS:
+                for order_id in order_ids:
+                    row = self._row_index[sheet_name].get(order_id)
+                    if row is not None:
+                        checks.append((sheet_name, order_id, row))
+                        ranges.append(f"'{sheet_name}'!{rowcol_to_a1(row, id_column)}")
+            for sheet_name, id_column, _ in STATUS_SHEETS:
+                # Start at the last known row rather than below it: reading past the grid is an error
+                column = _column_letter(id_column)
+                ranges.append(f"'{sheet_name}'!{column}{self._row_index_last[sheet_name]}:{column}")
+
+            try:
+                value_ranges = self._batch_get_values(ranges)
+            except gspread.exceptions.APIError as e:
+                # e.g. the sheet shrank below our last known row after rows were deleted
+                logger.warning(f"Row index check failed, rebuilding index: {e}")
+                self.invalidate_worksheets()
+                self._rebuild_row_index([name for name, _, _ in STATUS_SHEETS])
+                return self._lookup_rows(order_ids)
+
+            stale = set()
+            for (sheet_name, order_id, _), values in zip(checks, value_ranges):
+                if not values or _to_str(values[0][0] if values[0] else '') != order_id:
+                    logger.info(f"Row index for {sheet_name} is out of date (order {order_id} moved)")
+                    stale.add(sheet_name)
+
+            for (sheet_name, _, _), values in zip(STATUS_SHEETS, value_ranges[len(checks):]):
+                if values:
+                    self._index_id_column(sheet_name, values, self._row_index_last[sheet_name])
+
+            # An ID still unknown to the Orders sheet may have landed above our last row after deletions
+            if any(order_id not in self._row_index['Orders'] for order_id in order_ids):
+                stale.add('Orders')
+
+            if stale:
+                self._rebuild_row_index(sorted(stale))
+            return self._lookup_rows(order_ids)
+
+    def _seed_row_index_from_mirror(self) -> None:
+        """Start the row index from the mirror's indexed Order ID column; it is verified before use."""
+        assert self.mirror is not None
+        for sheet_name, _, _ in STATUS_SHEETS:
+            row_count = self.mirror.row_count(sheet_name)
+            if row_count:
+                self._row_index[sheet_name] = self.mirror.order_rows(sheet_name)
+                self._row_index_last[sheet_name] = row_count
+        logger.info(f"Seeded Order ID row index from sheet mirror for {len(self._row_index)} sheets")
+
+    def _rebuild_row_index(self, sheet_names: List[str]) -> None:
+        """Re-read the Order ID column of ``sheet_names`` and rebuild their row index."""
+        id_columns = {name: id_column for name, id_column, _ in STATUS_SHEETS}
+        ranges = []
+        for sheet_name in sheet_names:
+            column = _column_letter(id_columns[sheet_name])
+            ranges.append(f"'{sheet_name}'!{column}:{column}")
+
+        logger.info(f"Building Order ID row index for {', '.join(sheet_names)}")
+        for sheet_name, values in zip(sheet_names, self._batch_get_values(ranges)):
+            self._row_index[sheet_name] = {}
+            self._row_index_last[sheet_name] = 1
+            self._index_id_column(sheet_name, values, 1)
+
+    def _index_id_column(self, sheet_name: str, values: List[List[Any]], first_row: int) -> None:
+        index = self._row_index.setdefault(sheet_name, {})
+        for row, cells in enumerate(values, start=first_row):
+            order_id = _to_str(cells[0]) if cells else ''
+            if order_id and row > 1:  # Row 1 is the header
+                index.setdefault(order_id, row)  # First match wins, as with the old linear scan
+        self._row_index_last[sheet_name] = max(self._row_index_last.get(sheet_name, 1), first_row + len(values) - 1)
+
+    def _lookup_rows(self, order_ids: List[str]) -> Dict[str, Dict[str, int]]:
+        return {
+            sheet_name: {order_id: self._row_index[sheet_name][order_id]
+                         for order_id in order_ids if order_id in self._row_index[sheet_name]}
+            for sheet_name, _, _ in STATUS_SHEETS
+        }
+
+    def _batch_get_values(self, ranges: List[str]) -> List[List[List[Any]]]:
+        """Read several A1 ranges in one request, returning each range's values in order."""
+        assert self.spreadsheet is not None
+        response = self.spreadsheet.values_batch_get(ranges, params=VALUE_RENDER_PARAMS)
+        value_ranges = response.get('valueRanges', [])
+        return [value_range.get('values', []) for value_range in value_ranges]
+
+    def _patch_cached_statuses(self, updates: Dict[str, str]) -> None:
+        """Apply successful status writes to the cached snapshots so reads stay consistent."""
+        if not updates:
+            return
+
+        if self._orders_cache.patch(lambda index: index.with_statuses(updates)) is not None:
+            logger.info(f"Patched cached status of {len(updates)} orders")
+        self._measurements_cache.patch(lambda by_order: _with_measurement_statuses(by_order, updates))
+            
+    def filter_orders(self, orders: List[Order], filters: Dict[str, str]) -> List[Order]:
+        """Filter orders based on provided criteria; see apply_order_filters."""
+        return self.apply_order_filters(orders, filters)
     
     def apply_order_filters(self, orders: List[Order], filters: Dict[str, str]) -> List[Order]:
         """Filter orders based on provided criteria.
+
+        Request handlers filter the cached snapshot's index directly; this is
+        for arbitrary lists of orders.
         
         Args:
             orders (List[Order]): The list of orders to filter.
@@ -547,45 +1521,21 @@ class GoogleSheetsService:
             List[Order]: The filtered list of orders.
         """
         try:
-            logger.info("=== Starting order filtering ===")
-            logger.info(f"Initial orders count: {len(orders)}")
-            logger.info(f"Applied filters: {filters}")
-            
-            filtered_orders = orders
-            
-            # Filter by status
-            if filters.get('status') and filters['status'] != 'all':
-                logger.info(f"Filtering by status: {filters['status']}")
-                filtered_orders = [order for order in filtered_orders 
-                                if order['delivery_status'].lower() == filters['status'].lower()]
-                logger.info(f"After status filter: {len(filtered_orders)} orders")
-            
-            # Filter by garment type
-            if filters.get('garment_type') and filters['garment_type'] != 'all':
-                logger.info(f"Filtering by garment type: {filters['garment_type']}")
-                garment_filter = filters['garment_type'].lower()
-                filtered_orders = [order for order in filtered_orders 
-                                if garment_filter in order['garment_types'].lower()]
-                logger.info(f"After garment type filter: {len(filtered_orders)} orders")
-            
-            # Search by customer name
-            if filters.get('search'):
-                logger.info(f"Searching for: {filters['search']}")
-                search_term = filters['search'].lower()
-                filtered_orders = [order for order in filtered_orders 
-                                if search_term in order['customer_name'].lower() or 
-                                   search_term in order['address'].lower() or
-                                   search_term in order['order_id'].lower()]
-                logger.info(f"After search filter: {len(filtered_orders)} orders")
+            logger.debug("Filtering %d orders with %s", len(orders), filters)
+
+            index = OrderIndex(OrderTable.from_orders(orders), trigram_search=False)
+            filtered_orders = index.filter(
+                status=filters.get('status'),
+                garment_type=filters.get('garment_type'),
+                search=filters.get('search')
+            )
             
-            logger.info(f"Final filtered orders count: {len(filtered_orders)}")
+            logger.debug("Final filtered orders count: %d", len(filtered_orders))
             return filtered_orders
             
         except Exception as e:
             logger.error(f"Error filtering orders: {e}", exc_info=True)
             return []
-        finally:
-            logger.info("=== Completed order filtering ===")
 
 # Create global instance
 sheets_service = GoogleSheetsService()
\ No newline at end of file
@@ -0,0 +1,146 @@
+import atexit
+import logging
+import threading
+import time
+from typing import Callable, Generic, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Seconds the first queued item waits for others to join its batch
+COMMIT_WINDOW = 0.2
+
+# Most items written by one commit
+COMMIT_MAX_BATCH = 200
+
+# Backoff between attempts to commit a failed batch
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+
+# Seconds queued items get to be committed when the process exits
+DRAIN_TIMEOUT = 10.0
+
+
+class PendingWrite(Generic[T]):
+    """An item queued in a GroupCommitQueue; ``row`` is set once its batch is committed."""
+
+    __slots__ = ('item', 'row', 'queued_at', '_committed')
+
+    def __init__(self, item: T):
+        self.item = item
+        self.row: Optional[int] = None
+        self.queued_at = time.monotonic()
+        self._committed = threading.Event()
+
+    @property
+    def committed(self) -> bool:
+        return self._committed.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the item to be committed; returns False if it is still queued after ``timeout`` seconds."""
+        return self._committed.wait(timeout)
+
+
+class GroupCommitQueue(Generic[T]):
+    """Writes queued items in batches from a background thread (group commit).
+
+    A batch is cut ``window`` seconds after its first item was queued, or as
+    soon as ``max_batch`` items are waiting, and items queued while a batch is
+    being written go into the next one, so under load each write carries
+    everything that arrived meanwhile. ``commit(items, attempt)`` writes a
+    batch and returns the row number of each item; a batch that fails is
+    retried with backoff, ahead of anything queued after it, until it
+    succeeds. ``attempt`` counts earlier failures, so ``commit`` can check
+    what a failed write may have applied before writing again.
+    """
+
+    def __init__(self, name: str, commit: Callable[[List[T], int], List[Optional[int]]],
+                 window: float = COMMIT_WINDOW, max_batch: int = COMMIT_MAX_BATCH):
+        self.name = name
+        self.window = window
+        self.max_batch = max_batch
+        self._commit = commit
+        self._queue: List[PendingWrite[T]] = []
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {'committed': 0, 'batches': 0, 'failures': 0}
+
+    def submit(self, item: T) -> PendingWrite[T]:
+        """Queue ``item`` for the next batch."""
+        pending = PendingWrite(item)
+        with self._cond:
+            self._queue.append(pending)
+            self._cond.notify_all()
+            if self._thread is None or not self._thread.is_alive():
+                # Started on first use, so it runs in the process serving requests (not a preloading parent)
+                self._thread = threading.Thread(target=self._run, name=f'commit-{self.name}', daemon=True)
+                self._thread.start()
+                atexit.register(self.drain, DRAIN_TIMEOUT)
+        return pending
+
+    def __len__(self) -> int:
+        """Items queued or being committed."""
+        with self._cond:
+            return len(self._queue) + self._in_flight
+
+    def drain(self, timeout: float) -> bool:
+        """Wait until everything queued so far is committed; returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.error(f"{self.name}: {len(self._queue) + self._in_flight} writes still uncommitted")
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {**self._stats, 'queued': len(self._queue) + self._in_flight}
+
+    def _next_batch(self) -> List[PendingWrite[T]]:
+        with self._cond:
+            while not self._queue:
+                self._cond.wait()
+            deadline = self._queue[0].queued_at + self.window
+            while len(self._queue) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = self._queue[:self.max_batch]
+            del self._queue[:self.max_batch]
+            self._in_flight = len(batch)
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            items = [pending.item for pending in batch]
+            attempt = 0
+            while True:
+                try:
+                    started = time.perf_counter()
+                    rows = self._commit(items, attempt)
+                    break
+                except Exception as e:
+                    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)
+                    attempt += 1
+                    with self._cond:
+                        self._stats['failures'] += 1
+                    logger.error(f"{self.name}: failed to commit {len(batch)} writes (attempt {attempt}), "
+                                 f"retrying in {delay:.1f}s: {e}")
+                    time.sleep(delay)
+
+            logger.info(f"{self.name}: committed {len(batch)} writes in {(time.perf_counter() - started) * 1000:.0f} ms")
+            for pending, row in zip(batch, rows):
+                pending.row = row
+                pending._committed.set()
+            with self._cond:
+                self._in_flight = 0
+                self._stats['committed'] += len(batch)
+                self._stats['batches'] += 1
+                self._cond.notify_all()
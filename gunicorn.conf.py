@@ -0,0 +1,41 @@
+# Gunicorn settings for Shop Manager, read from the environment (see start.sh)
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('WORKERS', '4'))
+
+# Sheets-bound requests spend most of their time waiting on Google, so each worker
+# serves several at once on threads instead of one at a time; long-lived
+# /api/orders/events streams only tie up a thread. WORKER_CLASS=gevent (with gevent
+# installed) serves up to WORKER_CONNECTIONS requests per worker instead.
+worker_class = os.getenv('WORKER_CLASS', 'gthread')
+threads = int(os.getenv('WORKER_THREADS', '16'))
+worker_connections = int(os.getenv('WORKER_CONNECTIONS', '1000'))
+
+timeout = 120
+keepalive = 5
+
+# Import the app once in the master so workers fork with it already loaded (shared
+# memory, near-instant restarts); each worker then connects to Sheets in post_fork.
+# PRELOAD_APP=0 imports it in every worker instead (needed for --reload).
+preload_app = os.getenv('PRELOAD_APP', 'true').lower() in ('1', 'true', 'yes')
+if preload_app:
+    os.environ['SHOP_PRELOAD'] = '1'
+
+
+def post_fork(server, worker):
+    """Start the worker's Sheets connection and background threads, which the preloaded app left unstarted."""
+    if server.cfg.preload_app:
+        import shop
+        shop.start_worker()
+
+
+def child_exit(server, worker):
+    """Drop an exited worker's live gauges from the merged Prometheus metrics."""
+    if not os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        return
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,179 @@
+import gzip
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from flask import Flask, Response, current_app, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Falls back to the stdlib encoder
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # Only gzip is offered then
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed; compression wouldn't pay for its headers
+MIN_COMPRESS_BYTES = 1024
+
+# Compression settings: each variant is built once per cached body, so favour size over speed a little
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Content codings we can produce, in order of preference
+ENCODINGS = (['br'] if brotli is not None else []) + ['gzip']
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode ``obj`` as compact UTF-8 JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=DefaultJSONProvider.default,
+                            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(obj, default=DefaultJSONProvider.default, ensure_ascii=False,
+                      separators=(',', ':')).encode('utf-8')
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider, encoding compact responses with orjson when it is installed.
+
+    Keys keep their insertion order instead of being sorted. Debug mode keeps
+    the stock indented output.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs or orjson is None:
+            return super().dumps(obj, **kwargs)
+        return dumps(obj).decode('utf-8')
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        if self._app.debug or orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class EncodedBody:
+    """A JSON response body encoded once, with compressed variants built on first request."""
+
+    __slots__ = ('identity', 'on_grow', '_variants', '_lock')
+
+    def __init__(self, identity: bytes):
+        self.identity = identity
+        # Called with the size of each compressed variant once it is built
+        self.on_grow: Optional[Callable[[int], None]] = None
+        self._variants: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return len(self.identity) + sum(len(variant) for variant in self._variants.values())
+
+    def variant(self, encoding: Optional[str]) -> bytes:
+        """The body in ``encoding`` ('br', 'gzip' or None for uncompressed)."""
+        if encoding is None:
+            return self.identity
+        variant = self._variants.get(encoding)
+        if variant is None:
+            with self._lock:
+                variant = self._variants.get(encoding)
+                if variant is not None:
+                    return variant
+                variant = self._variants[encoding] = _compress(self.identity, encoding)
+            if self.on_grow is not None:
+                self.on_grow(len(variant))
+        return variant
+
+
+class ResponseCache:
+    """Encoded response bodies by key, least recently used first out once ``max_bytes`` is exceeded.
+
+    Keys must change whenever the body would (e.g. an ETag covering the data
+    version and the normalized query), so entries never need invalidating.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, EncodedBody]' = OrderedDict()
+        # Running size of the cached bodies, kept up to date as variants are built
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key: str, build: Callable[[], Any]) -> EncodedBody:
+        """The cached body for ``key``, or ``build()`` encoded and cached."""
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return body
+            self.misses += 1
+        # Concurrent misses may encode the same body twice; the first one cached wins
+        body = EncodedBody(dumps(build()))
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                return cached
+            body.on_grow = lambda size: self._grown(key, body, size)
+            self._entries[key] = body
+            self._size += body.size
+            self._trim()
+        return body
+
+    def _grown(self, key: str, body: EncodedBody, size: int) -> None:
+        with self._lock:
+            # Bodies already evicted were subtracted with all their variants
+            if self._entries.get(key) is body:
+                self._size += size
+                self._trim()
+
+    def trim(self) -> None:
+        """Evict least recently used bodies until the cache fits in ``max_bytes`` again."""
+        with self._lock:
+            self._trim()
+
+    def _trim(self) -> None:
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= evicted.size
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._size, 'hits': self.hits, 'misses': self.misses}
+
+
+def negotiate_encoding(size: int) -> Optional[str]:
+    """The content coding to send a body of ``size`` bytes in, given the request's Accept-Encoding."""
+    if size < MIN_COMPRESS_BYTES:
+        return None
+    accepted = request.accept_encodings
+    for encoding in ENCODINGS:
+        if accepted[encoding]:
+            return encoding
+    return None
+
+
+def encoded_response(body: EncodedBody, status: int = 200) -> Response:
+    """A JSON response sending ``body`` in the best encoding the client accepts."""
+    encoding = negotiate_encoding(len(body.identity))
+    response = current_app.response_class(body.variant(encoding), status=status, mimetype='application/json')
+    if encoding is not None:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def init_app(app: Flask) -> None:
+    """Encode every jsonify response with the fast encoder."""
+    app.json = FastJSONProvider(app)
@@ -0,0 +1,146 @@
+import os
+import time
+from typing import Optional, Tuple
+
+from flask import Flask, Response, g, has_request_context, request
+
+try:
+    import prometheus_client
+    from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, multiprocess
+except ImportError:  # Metrics are optional; /metrics reports them as unavailable
+    prometheus_client = None
+
+ENABLED = prometheus_client is not None
+
+# Under gunicorn each worker writes its samples to files in this directory and /metrics merges them.
+# It has to be set (and emptied) before the workers start; see start.sh and gunicorn.conf.py.
+MULTIPROCESS = ENABLED and bool(os.getenv('PROMETHEUS_MULTIPROC_DIR'))
+
+# Histogram buckets (seconds) for requests served by the app and for calls to the Sheets API
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SHEETS_CALL_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0)
+
+if ENABLED:
+    HTTP_REQUESTS = Counter(
+        'shop_http_requests_total', 'HTTP requests handled, by route and status',
+        ['method', 'route', 'status']
+    )
+    HTTP_REQUEST_SECONDS = Histogram(
+        'shop_http_request_duration_seconds', 'Time to handle an HTTP request (streamed responses until closed)',
+        ['method', 'route'], buckets=REQUEST_BUCKETS
+    )
+    SHEETS_CALLS = Counter(
+        'shop_sheets_api_calls_total', 'Google Sheets API requests sent (retries included), by the route that caused them',
+        ['kind', 'sheet', 'caller']
+    )
+    SHEETS_CALL_SECONDS = Histogram(
+        'shop_sheets_api_call_duration_seconds', 'Latency of Google Sheets API requests',
+        ['kind', 'sheet'], buckets=SHEETS_CALL_BUCKETS
+    )
+    SHEETS_ERRORS = Counter(
+        'shop_sheets_api_errors_total', 'Failed Google Sheets API requests, by HTTP status or exception type',
+        ['kind', 'sheet', 'error']
+    )
+    SHEETS_RETRIES = Counter(
+        'shop_sheets_api_retries_total', 'Google Sheets API requests retried after a transient failure',
+        ['kind']
+    )
+    SHEETS_THROTTLED_SECONDS = Counter(
+        'shop_sheets_api_throttled_seconds_total', 'Time spent waiting for Sheets API quota',
+        ['kind', 'lane']
+    )
+    CACHE_READS = Counter(
+        'shop_snapshot_cache_reads_total', 'Snapshot cache reads: hit (fresh), stale (served while refreshing) or miss (loaded)',
+        ['cache', 'result']
+    )
+    SNAPSHOT_LOADED = Gauge(
+        'shop_snapshot_loaded_timestamp_seconds', 'Unix time the cached snapshot was loaded or confirmed current (oldest worker)',
+        ['cache'], multiprocess_mode='livemin'
+    )
+    MIRROR_SYNCED = Gauge(
+        'shop_sheet_mirror_synced_timestamp_seconds', 'Unix time the local sheet mirror last finished a sync',
+        multiprocess_mode='max'
+    )
+
+
+def current_route(default: str) -> str:
+    """The URL rule of the request being handled on this thread, or ``default`` outside a request."""
+    if not has_request_context():
+        return default
+    return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+
+def observe_sheets_call(kind: str, sheet: str, caller: str, seconds: float, error: Optional[str] = None) -> None:
+    if not ENABLED:
+        return
+    SHEETS_CALLS.labels(kind, sheet, caller).inc()
+    SHEETS_CALL_SECONDS.labels(kind, sheet).observe(seconds)
+    if error is not None:
+        SHEETS_ERRORS.labels(kind, sheet, error).inc()
+
+
+def count_sheets_retry(kind: str) -> None:
+    if ENABLED:
+        SHEETS_RETRIES.labels(kind).inc()
+
+
+def add_sheets_throttled(kind: str, lane: str, seconds: float) -> None:
+    if ENABLED:
+        SHEETS_THROTTLED_SECONDS.labels(kind, lane).inc(seconds)
+
+
+def count_cache_read(cache: str, result: str) -> None:
+    if ENABLED:
+        CACHE_READS.labels(cache, result).inc()
+
+
+def mark_snapshot_loaded(cache: str, loaded_at: float) -> None:
+    if ENABLED:
+        SNAPSHOT_LOADED.labels(cache).set(loaded_at)
+
+
+def mark_mirror_synced(synced_at: float) -> None:
+    if ENABLED:
+        MIRROR_SYNCED.set(synced_at)
+
+
+def render() -> Optional[Tuple[bytes, str]]:
+    """The current metrics of every worker in the Prometheus text format, with its content type.
+
+    Returns None if prometheus_client is not installed.
+    """
+    if not ENABLED:
+        return None
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
+
+
+def init_app(app: Flask) -> None:
+    """Count requests and time them per route (the URL rule, so IDs in paths don't add series)."""
+    if not ENABLED:
+        return
+
+    @app.before_request
+    def start_request_timer() -> None:
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def observe_request(response: Response) -> Response:
+        started = g.get('metrics_started')
+        if started is None:
+            return response
+        method, route, status = request.method, current_route('unmatched'), str(response.status_code)
+
+        def observe() -> None:
+            HTTP_REQUESTS.labels(method, route, status).inc()
+            HTTP_REQUEST_SECONDS.labels(method, route).observe(time.perf_counter() - started)
+
+        if response.is_streamed:
+            response.call_on_close(observe)
+        else:
+            observe()
+        return response
@@ -0,0 +1,113 @@
+import json
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from order_table import OrderTable
+
+# (event name, JSON payload) as sent to /api/orders/events clients
+OrderEvent = Tuple[str, Dict[str, Any]]
+
+# Snapshot changes remembered for clients resuming with Last-Event-ID
+EVENT_LOG_CAPACITY = 256
+
+# Changes beyond this many orders in one snapshot are sent as a single reset event
+MAX_EVENTS_PER_CHANGE = 500
+
+
+class OrderEventBatch(NamedTuple):
+    """The events produced by one change of the orders snapshot."""
+    seq: int
+    digest: str  # Orders digest after the change; used as the SSE event ID
+    events: List[OrderEvent]
+
+
+def diff_orders(old: OrderTable, new: OrderTable) -> List[OrderEvent]:
+    """Events turning ``old`` into ``new``: created, status changed and deleted orders.
+
+    Falls back to a single ``reset`` event when more than MAX_EVENTS_PER_CHANGE
+    orders changed, since clients are better off refetching then.
+    """
+    old_column = old.category_column('delivery_status')
+    old_categories, old_codes = old_column.categories, old_column.codes
+    remaining = {order_id: old_categories[old_codes[pos]] for pos, order_id in enumerate(old.order_ids)}
+
+    new_column = new.category_column('delivery_status')
+    new_categories, new_codes = new_column.categories, new_column.codes
+    events: List[OrderEvent] = []
+    for pos, order_id in enumerate(new.order_ids):
+        status = new_categories[new_codes[pos]]
+        previous = remaining.pop(order_id, None)
+        if previous is None:
+            events.append(('order_created', new.row(pos)))
+        elif previous != status:
+            events.append(('order_status', {'order_id': order_id, 'delivery_status': status, 'previous_status': previous}))
+        if len(events) > MAX_EVENTS_PER_CHANGE:
+            return [('reset', {'reason': 'too_many_changes'})]
+
+    events.extend(('order_deleted', {'order_id': order_id}) for order_id in remaining)
+    if len(events) > MAX_EVENTS_PER_CHANGE:
+        return [('reset', {'reason': 'too_many_changes'})]
+    return events
+
+
+def format_sse(event: str, data: Dict[str, Any], event_id: Optional[str] = None) -> str:
+    """Encode one Server-Sent Events message."""
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False, separators=(',', ':'))}")
+    return '\n'.join(lines) + '\n\n'
+
+
+class OrderEventLog:
+    """Recent changes of the orders snapshot, for streaming to clients.
+
+    Every installed snapshot is recorded as a batch identified by the orders
+    digest after it (even when it produced no events), so a client resuming
+    with the digest it last saw can be sent exactly the batches it missed.
+    Digests depend only on content, so this also works when the reconnect
+    lands on another worker process that loaded the same data.
+    """
+
+    def __init__(self, capacity: int = EVENT_LOG_CAPACITY):
+        self._batches: Deque[OrderEventBatch] = deque(maxlen=capacity)
+        self._seq = 0
+        self._changed = threading.Condition()
+
+    def record(self, digest: str, events: List[OrderEvent]) -> None:
+        with self._changed:
+            self._seq += 1
+            self._batches.append(OrderEventBatch(self._seq, digest, events))
+            self._changed.notify_all()
+
+    def resume(self, last_event_id: Optional[str]) -> Tuple[int, bool]:
+        """Where to start streaming for a client that last saw ``last_event_id``.
+
+        Returns:
+            Tuple[int, bool]: The sequence number to stream after, and whether the
+            client missed changes that can no longer be replayed (so it must refetch).
+        """
+        with self._changed:
+            if not last_event_id:
+                return self._seq, False
+            for batch in reversed(self._batches):
+                if batch.digest == last_event_id:
+                    return batch.seq, False
+            return self._seq, True
+
+    def wait(self, after_seq: int, timeout: float) -> Tuple[List[OrderEventBatch], bool]:
+        """Wait up to ``timeout`` seconds for batches newer than ``after_seq``.
+
+        Returns:
+            Tuple[List[OrderEventBatch], bool]: The new batches, and whether some were
+            already evicted (the caller fell too far behind and must reset its client).
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self._seq > after_seq, timeout)
+            batches = [batch for batch in self._batches if batch.seq > after_seq]
+            evicted = bool(batches) and batches[0].seq > after_seq + 1
+            return batches, evicted
+
+    def current(self) -> Optional[OrderEventBatch]:
+        with self._changed:
+            return self._batches[-1] if self._batches else None
@@ -0,0 +1,202 @@
+import threading
+from array import array
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set
+
+from order_table import OrderTable
+
+if TYPE_CHECKING:
+    from google_sheets_service import Order
+
+_EMPTY: FrozenSet[int] = frozenset()
+
+# Separates the searchable fields of an order so matches can't span two fields
+_FIELD_SEPARATOR = '\x00'
+
+# Distinct garment filters remembered per index
+_MAX_CACHED_GARMENT_FILTERS = 64
+
+# Stop intersecting posting lists once the next one is this many times larger than the candidates
+_MAX_INTERSECT_RATIO = 8
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """Maps every 3-character substring to the (ascending) positions of the texts containing it."""
+
+    def __init__(self, texts: List[str]):
+        postings: Dict[str, List[int]] = {}
+        for pos, text in enumerate(texts):
+            for gram in _trigrams(text):
+                postings.setdefault(gram, []).append(pos)
+        self._postings: Dict[str, array] = {gram: array('I', positions) for gram, positions in postings.items()}
+
+    def candidates(self, term: str) -> Set[int]:
+        """Positions of texts that may contain ``term`` (a superset of the real matches)."""
+        lists = sorted((self._postings.get(gram, ()) for gram in _trigrams(term)), key=len)
+        if not lists or not lists[0]:
+            return set()
+        result = set(lists[0])
+        for positions in lists[1:]:
+            if len(positions) > _MAX_INTERSECT_RATIO * len(result):
+                break  # Cheaper to let the caller verify the remaining candidates directly
+            result.intersection_update(positions)
+            if not result:
+                break
+        return result
+
+
+class _LazyTrigramIndex:
+    """Builds a TrigramIndex on first use; shared by every copy of an OrderIndex."""
+
+    def __init__(self, texts: List[str]):
+        self._texts = texts
+        self._index: Optional[TrigramIndex] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> TrigramIndex:
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = TrigramIndex(self._texts)
+        return self._index
+
+
+class OrderIndex:
+    """An OrderTable from one load of the Orders sheet plus lookup structures over it.
+
+    Lowercased search text, a hash of Order ID to position and status/garment
+    position sets are built once per load; the trigram index used for
+    ``search`` is built on first use. All but the status sets are shared with
+    the copies made by :meth:`with_statuses`, since status changes don't affect
+    the searchable fields or IDs.
+    """
+
+    def __init__(self, table: OrderTable, trigram_search: bool = True):
+        """Index ``table``.
+
+        Args:
+            table (OrderTable): Orders in sheet order.
+            trigram_search (bool): Answer searches from a trigram index. Disable for
+                one-off filtering, where building the index costs more than a scan.
+        """
+        self.table = table
+        names, addresses, order_ids = (table.column(field) for field in ('customer_name', 'address', 'order_id'))
+        self._search_texts = [
+            _FIELD_SEPARATOR.join((names[pos], addresses[pos], order_ids[pos])).lower()
+            for pos in range(len(table))
+        ]
+        self._trigrams = _LazyTrigramIndex(self._search_texts) if trigram_search else None
+        self._by_id: Dict[str, int] = {}
+        for pos, order_id in enumerate(order_ids):
+            self._by_id.setdefault(order_id, pos)  # First row wins when the sheet repeats an ID
+        self._index_positions()
+
+    def _index_positions(self) -> None:
+        # Work per distinct value: every order sharing a status or garment string shares its positions
+        statuses: Dict[str, Set[int]] = {}
+        column = self.table.category_column('delivery_status')
+        for status, positions in zip(column.categories, column.positions_by_category()):
+            statuses.setdefault(status.lower(), set()).update(positions)
+        garments: Dict[str, Set[int]] = {}
+        column = self.table.category_column('garment_types')
+        for garment_types, positions in zip(column.categories, column.positions_by_category()):
+            garments.setdefault(garment_types.lower(), set()).update(positions)
+
+        self._by_status: Dict[str, FrozenSet[int]] = {key: frozenset(value) for key, value in statuses.items() if value}
+        self._by_garments: Dict[str, FrozenSet[int]] = {key: frozenset(value) for key, value in garments.items() if value}
+        self._garment_filters: Dict[str, FrozenSet[int]] = {}
+
+    @property
+    def digest(self) -> str:
+        """Hash of the orders' content; equal data loaded by different workers hashes equally."""
+        return self.table.digest
+
+    def build_search_index(self) -> None:
+        """Build the trigram index now rather than on the first search."""
+        if self._trigrams is not None:
+            self._trigrams.get()
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def with_statuses(self, updates: Dict[str, str]) -> 'OrderIndex':
+        """Return a copy with new delivery statuses applied; this index is left untouched."""
+        copy = OrderIndex.__new__(OrderIndex)
+        copy.table = self.table.with_statuses(updates)
+        copy._search_texts = self._search_texts
+        copy._trigrams = self._trigrams
+        copy._by_id = self._by_id
+        copy._index_positions()
+        return copy
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self._by_id
+
+    def position(self, order_id: str) -> Optional[int]:
+        """Position of the order with exactly this ID (the first one if the sheet repeats it), or None."""
+        return self._by_id.get(order_id)
+
+    def get(self, order_id: str, fields: Optional[List[str]] = None) -> Optional['Order']:
+        """The order with exactly this ID as a dict (only ``fields`` if given), or None."""
+        pos = self._by_id.get(order_id)
+        return None if pos is None else self.table.row(pos, fields)  # type: ignore[return-value]
+
+    def status_positions(self, status: str) -> FrozenSet[int]:
+        """Positions whose delivery status equals ``status``, ignoring case."""
+        return self._by_status.get(status.lower(), _EMPTY)
+
+    def garment_positions(self, garment_type: str) -> FrozenSet[int]:
+        """Positions whose garment types contain ``garment_type``, ignoring case."""
+        garment_filter = garment_type.lower()
+        positions = self._garment_filters.get(garment_filter)
+        if positions is None:
+            # Only the distinct garment type strings are scanned, not every order
+            matched: Set[int] = set()
+            for value, value_positions in self._by_garments.items():
+                if garment_filter in value:
+                    matched.update(value_positions)
+            positions = frozenset(matched)
+            if len(self._garment_filters) < _MAX_CACHED_GARMENT_FILTERS:
+                self._garment_filters[garment_filter] = positions
+        return positions
+
+    def search_positions(self, term: str) -> Set[int]:
+        """Positions whose customer name, address or order ID contains ``term``, ignoring case."""
+        term = term.lower().replace(_FIELD_SEPARATOR, '')
+        texts = self._search_texts
+        if len(term) < 3 or self._trigrams is None:
+            return {pos for pos, text in enumerate(texts) if term in text}
+        return {pos for pos in self._trigrams.get().candidates(term) if term in texts[pos]}
+
+    def filter_positions(self, status: Optional[str] = None, garment_type: Optional[str] = None,
+                         search: Optional[str] = None) -> Sequence[int]:
+        """Positions of the orders matching every given filter, ascending (sheet order).
+
+        'all' or empty filter values are ignored.
+        """
+        sets: List[Iterable[int]] = []
+        if status and status != 'all':
+            sets.append(self.status_positions(status))
+        if garment_type and garment_type != 'all':
+            sets.append(self.garment_positions(garment_type))
+        if search:
+            sets.append(self.search_positions(search))
+
+        if not sets:
+            return range(len(self.table))
+
+        sets.sort(key=len)  # type: ignore[arg-type]
+        result = set(sets[0])
+        for positions in sets[1:]:
+            result.intersection_update(positions)
+            if not result:
+                break
+        return sorted(result)
+
+    def filter(self, status: Optional[str] = None, garment_type: Optional[str] = None,
+               search: Optional[str] = None) -> List['Order']:
+        """Orders matching every given filter as dicts, in sheet order."""
+        return list(self.table.iter_rows(self.filter_positions(status, garment_type, search)))  # type: ignore[arg-type]
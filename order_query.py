@@ -0,0 +1,192 @@
+import base64
+import binascii
+import json
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from json_responses import dumps
+from order_table import FIELDS, CategoryColumn, OrderTable
+
+# Fields /api/orders can be sorted by; ties are broken by order_id
+SORT_FIELDS = [
+    'order_id', 'customer_name', 'order_date', 'delivery_date',
+    'delivery_status', 'payment_status', 'price', 'created_at'
+]
+
+# Largest page /api/orders will return in one response
+MAX_PAGE_SIZE = 1000
+
+# Response formats for /api/orders: a buffered JSON document, the same document
+# streamed with chunked encoding, or newline-delimited JSON with one order per line
+OUTPUT_FORMATS = ['json', 'stream', 'ndjson']
+
+# Bytes of encoded orders collected before a chunk is sent when streaming
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class OrderQuery(NamedTuple):
+    """Sorting, paging and projection options for an order listing."""
+    sort: Optional[str]
+    descending: bool
+    limit: Optional[int]
+    after: Optional[Tuple[Any, str]]
+    fields: Optional[List[str]]
+    output: str = 'json'
+
+    @property
+    def paginated(self) -> bool:
+        return self.limit is not None
+
+    @property
+    def streaming(self) -> bool:
+        return self.output != 'json'
+
+
+class OrderPage(NamedTuple):
+    """Table positions of the orders on one page, in response order."""
+    positions: Sequence[int]
+    next_cursor: Optional[str]
+
+
+def parse_order_query(args: Mapping[str, str]) -> OrderQuery:
+    """Parse the ``sort``, ``limit``, ``cursor``, ``fields`` and ``format`` query parameters.
+
+    Raises:
+        ValueError: If any parameter is invalid; the message is safe to show to clients.
+    """
+    sort = args.get('sort') or None
+    descending = False
+    if sort and sort.startswith('-'):
+        sort, descending = sort[1:], True
+    if sort is not None and sort not in SORT_FIELDS:
+        raise ValueError(f"Invalid sort field. Must be one of: {', '.join(SORT_FIELDS)}")
+
+    limit: Optional[int] = None
+    if args.get('limit'):
+        try:
+            limit = int(args['limit'])
+        except ValueError:
+            raise ValueError("limit must be an integer")
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+        if sort is None:
+            sort = 'order_id'  # Keyset pagination needs a total order
+
+    after = None
+    if args.get('cursor'):
+        if limit is None:
+            raise ValueError("cursor requires limit")
+        after = _decode_cursor(args['cursor'], sort, descending)
+
+    fields = None
+    if args.get('fields'):
+        fields = [field.strip() for field in args['fields'].split(',') if field.strip()]
+        unknown = [field for field in fields if field not in FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    output = args.get('format') or 'json'
+    if output not in OUTPUT_FORMATS:
+        raise ValueError(f"Invalid format. Must be one of: {', '.join(OUTPUT_FORMATS)}")
+
+    return OrderQuery(sort, descending, limit, after, fields, output)
+
+
+def page_orders(table: OrderTable, positions: Sequence[int], query: OrderQuery) -> OrderPage:
+    """Sort and paginate the already-filtered orders at ``positions`` of ``table``.
+
+    Pages are keyed on (sort value, order_id) rather than offsets, so orders
+    added or removed between requests don't shift later pages. Projection is
+    left to the caller (see OrderTable.iter_rows) so rows are only built for
+    the page being returned.
+    """
+    if query.sort is None:
+        return OrderPage(positions, None)
+
+    sort_key = _sort_key(table, query.sort)
+    ordered = sorted(positions, key=sort_key)
+    keys = [sort_key(pos) for pos in ordered]
+    if query.descending:
+        end = bisect_left(keys, query.after) if query.after is not None else len(ordered)
+        start = 0 if query.limit is None else max(0, end - query.limit)
+        page = ordered[start:end][::-1]
+        has_more = start > 0
+    else:
+        start = bisect_right(keys, query.after) if query.after is not None else 0
+        end = len(ordered) if query.limit is None else start + query.limit
+        page = ordered[start:end]
+        has_more = end < len(ordered)
+
+    next_cursor = None
+    if query.limit is not None and has_more and page:
+        next_cursor = _encode_cursor(query.sort, query.descending, sort_key(page[-1]))
+    return OrderPage(page, next_cursor)
+
+
+def stream_orders(orders: Iterable[Dict[str, Any]], trailer: Dict[str, Any], ndjson: bool) -> Iterator[bytes]:
+    """Encode orders one at a time into response chunks.
+
+    With ``ndjson`` each order is written on its own line. Otherwise the output
+    is the same JSON document a buffered response would contain: an object
+    whose ``orders`` array is followed by the keys in ``trailer`` (anything not
+    known until the orders have been written, like the response time).
+    Trailer values that are callables are evaluated after the last order.
+    """
+    chunk: List[bytes] = [] if ndjson else [b'{"success":true,"orders":[']
+    size = 0
+    first = True
+    for order in orders:
+        encoded = dumps(order)
+        if ndjson:
+            chunk.append(encoded)
+            chunk.append(b'\n')
+        else:
+            if not first:
+                chunk.append(b',')
+            chunk.append(encoded)
+        first = False
+        size += len(encoded) + 1
+        if size >= STREAM_CHUNK_SIZE:
+            yield b''.join(chunk)
+            chunk, size = [], 0
+
+    if not ndjson:
+        chunk.append(b']')
+        for key, value in trailer.items():
+            chunk.append(b',' + dumps(key) + b':' + dumps(value() if callable(value) else value))
+        chunk.append(b'}')
+    if chunk:
+        yield b''.join(chunk)
+
+
+def _sort_key(table: OrderTable, field: str) -> Callable[[int], Tuple[Any, str]]:
+    """Key function mapping a table position to (case-folded sort value, order_id)."""
+    column = table.column(field)
+    order_ids = table.order_ids
+    if isinstance(column, CategoryColumn):
+        lowered = [category.lower() for category in column.categories]
+        codes = column.codes
+        return lambda pos: (lowered[codes[pos]], order_ids[pos])
+    if field == 'price':
+        return lambda pos: (column[pos], order_ids[pos])
+    return lambda pos: (column[pos].lower(), order_ids[pos])  # type: ignore[union-attr]
+
+
+def _encode_cursor(sort: str, descending: bool, key: Tuple[Any, str]) -> str:
+    payload = json.dumps([sort, descending, key[0], key[1]], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def _decode_cursor(cursor: str, sort: Optional[str], descending: bool) -> Tuple[Any, str]:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        cursor_sort, cursor_descending, value, order_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if cursor_sort != sort or cursor_descending != descending:
+        raise ValueError("cursor does not match the requested sort")
+    if sort == 'price' and not isinstance(value, (int, float)):
+        raise ValueError("Invalid cursor")
+    if sort != 'price' and not isinstance(value, str):
+        raise ValueError("Invalid cursor")
+    return value, str(order_id)
@@ -0,0 +1,186 @@
+import hashlib
+from array import array
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Union
+
+if TYPE_CHECKING:
+    from google_sheets_service import Order
+
+# Order fields in serialization order (matches the Order TypedDict)
+FIELDS = [
+    'order_id', 'customer_name', 'contact_info', 'address', 'customer_type',
+    'garment_types', 'order_date', 'delivery_date', 'delivery_status', 'price',
+    'payment_status', 'season', 'festival', 'notes', 'created_at'
+]
+
+# Low-cardinality fields stored as codes into a shared list of distinct values
+CATEGORY_FIELDS = [
+    'customer_type', 'garment_types', 'order_date', 'delivery_date',
+    'delivery_status', 'payment_status', 'season', 'festival'
+]
+
+# Fields that are (nearly) unique per order, stored as plain lists of strings
+TEXT_FIELDS = ['order_id', 'customer_name', 'contact_info', 'address', 'notes', 'created_at']
+
+
+class CategoryColumn:
+    """A column of repeated strings stored as small integer codes into ``categories``."""
+
+    __slots__ = ('categories', 'codes')
+
+    def __init__(self, categories: List[str], codes: array):
+        self.categories = categories
+        self.codes = codes
+
+    @classmethod
+    def from_values(cls, values: Iterable[str]) -> 'CategoryColumn':
+        lookup: Dict[str, int] = {}
+        categories: List[str] = []
+        codes: List[int] = []
+        for value in values:
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(categories)
+                categories.append(value)
+            codes.append(code)
+        return cls(categories, array('H' if len(categories) <= 0xFFFF else 'I', codes))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, pos: int) -> str:
+        return self.categories[self.codes[pos]]
+
+    def positions_by_category(self) -> List[List[int]]:
+        """Positions holding each category, indexed by code."""
+        positions: List[List[int]] = [[] for _ in self.categories]
+        for pos, code in enumerate(self.codes):
+            positions[code].append(pos)
+        return positions
+
+    def canonical(self) -> 'CategoryColumn':
+        """The same values coded as :meth:`from_values` would: by first appearance, without unused categories."""
+        order = list(dict.fromkeys(self.codes))
+        remap = {code: canonical for canonical, code in enumerate(order)}
+        return CategoryColumn([self.categories[code] for code in order], array('I', map(remap.__getitem__, self.codes)))
+
+    def with_values(self, changes: Dict[int, str]) -> 'CategoryColumn':
+        """Return a copy with the values at the given positions replaced."""
+        categories = list(self.categories)
+        lookup = {value: code for code, value in enumerate(categories)}
+        codes = array(self.codes.typecode, self.codes)
+        for pos, value in changes.items():
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(categories)
+                categories.append(value)
+            if code > 0xFFFF and codes.typecode == 'H':
+                codes = array('I', codes)
+            codes[pos] = code
+        return CategoryColumn(categories, codes)
+
+
+Column = Union[List[str], CategoryColumn, array]
+
+
+class OrderTable:
+    """Orders stored column by column instead of as one dict per order.
+
+    Repeated values (statuses, garment types, dates, ...) are stored once per
+    distinct value and prices in a float array, which keeps a cached snapshot
+    several times smaller than a list of dicts. Dicts are only built for the
+    rows actually being returned, by :meth:`row` and :meth:`iter_rows`.
+
+    Tables are immutable once built; :meth:`with_statuses` returns a copy that
+    shares every unchanged column.
+    """
+
+    def __init__(self, columns: Dict[str, Column]):
+        self._columns = columns
+        self._column_digests: Dict[str, bytes] = {}
+        self._digest: Optional[str] = None
+
+    @classmethod
+    def from_columns(cls, values: Mapping[str, Sequence[Any]]) -> 'OrderTable':
+        """Build a table from one sequence of values per field (all of equal length)."""
+        columns: Dict[str, Column] = {}
+        for field in TEXT_FIELDS:
+            columns[field] = list(values[field])
+        for field in CATEGORY_FIELDS:
+            columns[field] = CategoryColumn.from_values(values[field])
+        columns['price'] = array('d', values['price'])
+        return cls(columns)
+
+    @classmethod
+    def from_orders(cls, orders: Iterable['Order']) -> 'OrderTable':
+        orders = list(orders)
+        return cls.from_columns({field: [order[field] for order in orders] for field in FIELDS})  # type: ignore[literal-required]
+
+    def __len__(self) -> int:
+        return len(self._columns['order_id'])
+
+    def column(self, field: str) -> Column:
+        """The column for ``field``; index it by position to read a value."""
+        return self._columns[field]
+
+    def category_column(self, field: str) -> CategoryColumn:
+        column = self._columns[field]
+        assert isinstance(column, CategoryColumn)
+        return column
+
+    @property
+    def order_ids(self) -> List[str]:
+        return self._columns['order_id']  # type: ignore[return-value]
+
+    def row(self, pos: int, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Materialize the order at ``pos`` as a dict, optionally reduced to ``fields``."""
+        columns = self._columns
+        return {field: columns[field][pos] for field in (fields or FIELDS)}
+
+    def iter_rows(self, positions: Iterable[int], fields: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield the orders at ``positions`` as dicts, one at a time."""
+        selected = [(field, self._columns[field]) for field in (fields or FIELDS)]
+        for pos in positions:
+            yield {field: column[pos] for field, column in selected}
+
+    def to_orders(self) -> List['Order']:
+        """Materialize every order; prefer iter_rows for anything sheet-sized."""
+        return list(self.iter_rows(range(len(self))))  # type: ignore[arg-type]
+
+    def with_statuses(self, updates: Dict[str, str]) -> 'OrderTable':
+        """Return a copy with new delivery statuses for the given order IDs; other columns are shared."""
+        changes = {pos: updates[order_id] for pos, order_id in enumerate(self.order_ids) if order_id in updates}
+        columns = dict(self._columns)
+        columns['delivery_status'] = self.category_column('delivery_status').with_values(changes)
+        table = OrderTable(columns)
+        # Only the patched column is rehashed
+        table._column_digests = {
+            field: digest for field, digest in self._column_digests.items() if field != 'delivery_status'
+        }
+        return table
+
+    @property
+    def digest(self) -> str:
+        """Hash of the table's content; equal data hashes equally however it was built or patched."""
+        if self._digest is None:
+            hasher = hashlib.blake2b(digest_size=16)
+            for field in FIELDS:
+                hasher.update(self._column_digest(field))
+            self._digest = hasher.hexdigest()
+        return self._digest
+
+    def _column_digest(self, field: str) -> bytes:
+        digest = self._column_digests.get(field)
+        if digest is None:
+            hasher = hashlib.blake2b(field.encode('utf-8'), digest_size=16)
+            column = self._columns[field]
+            if isinstance(column, CategoryColumn):
+                # Codes depend on the order categories were added in, so hash them canonically
+                column = column.canonical()
+                hasher.update(repr(column.categories).encode('utf-8'))
+                hasher.update(column.codes.tobytes())
+            elif isinstance(column, array):
+                hasher.update(column.tobytes())
+            else:
+                hasher.update(repr(column).encode('utf-8'))
+            digest = self._column_digests[field] = hasher.digest()
+        return digest
@@ -0,0 +1,187 @@
+import atexit
+import contextlib
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from flask import Flask, Response, g, has_request_context, request
+
+# Loggers whose DEBUG records are kept for sampled requests
+APP_LOGGERS = [
+    'shop', 'google_sheets_service', 'sheets_cache', 'sheets_mirror',
+    'sheets_scheduler', 'sheets_sync', 'request_logging'
+]
+
+summary_logger = logging.getLogger('shop.requests')
+
+# Whether the request being handled on this thread has its DEBUG logs kept
+_sampled: ContextVar[bool] = ContextVar('log_sampled', default=False)
+
+_PRIMITIVES = (str, int, float, bool, type(None))
+
+
+class LevelOrSampledFilter(logging.Filter):
+    """Pass records at or above ``level``, plus every record of a sampled request."""
+
+    def __init__(self, level: int):
+        super().__init__()
+        self.level = level
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= self.level or _sampled.get()
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """Queue records for the listener thread without formatting them first.
+
+    The stock QueueHandler formats every message on the logging thread so
+    records can cross process boundaries; ours stays in-process, so only
+    messages whose arguments could change before the listener gets to them
+    (anything but plain values) are merged eagerly.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        args = record.args
+        if args and not all(isinstance(arg, _PRIMITIVES) for arg in (args.values() if isinstance(args, dict) else args)):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+def configure_logging(level: int, handlers: List[logging.Handler], use_queue: bool = True,
+                      debug_sample_rate: float = 0.0) -> Optional[logging.handlers.QueueListener]:
+    """Install ``handlers`` on the root logger.
+
+    With ``use_queue``, records are handed to a background listener thread
+    that runs the (blocking) handlers, so requests never wait on console or
+    file writes. With a ``debug_sample_rate`` above zero, that fraction of
+    requests also keeps DEBUG records from the app's own loggers.
+
+    Returns:
+        Optional[QueueListener]: The running listener, stopped (and flushed) at exit.
+    """
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(level)
+
+    listener = None
+    if use_queue:
+        queue_handler = LazyQueueHandler(queue.SimpleQueue())
+        listener = logging.handlers.QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        installed: List[logging.Handler] = [queue_handler]
+
+        def restart_in_child() -> None:
+            # The listener thread doesn't survive a fork (e.g. gunicorn workers of a preloaded app)
+            queue_handler.queue = queue.SimpleQueue()
+            child_listener = logging.handlers.QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+            child_listener.start()
+            atexit.register(child_listener.stop)
+
+        os.register_at_fork(after_in_child=restart_in_child)
+    else:
+        installed = handlers
+
+    record_filter = LevelOrSampledFilter(level)
+    for handler in installed:
+        handler.addFilter(record_filter)
+        root.addHandler(handler)
+
+    if debug_sample_rate > 0:
+        # Let app loggers create DEBUG records; the filter drops those of unsampled requests
+        for name in APP_LOGGERS:
+            logging.getLogger(name).setLevel(min(level, logging.DEBUG))
+    return listener
+
+
+class RequestLog:
+    """Timings and counts gathered while handling one request, logged as a single summary line."""
+
+    def __init__(self, request_id: str, method: str, path: str):
+        self.request_id = request_id
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.fields: Dict[str, Any] = {}
+
+    def summary(self, response: Response) -> Dict[str, Any]:
+        return {
+            'request_id': self.request_id,
+            'method': self.method,
+            'path': self.path,
+            'status': response.status_code,
+            'duration_ms': round((time.perf_counter() - self.started) * 1000, 2),
+            'phases_ms': {name: round(seconds * 1000, 2) for name, seconds in self.phases.items()},
+            **self.fields,
+        }
+
+
+def current_log() -> Optional[RequestLog]:
+    return g.get('request_log') if has_request_context() else None
+
+
+def log_fields(**fields: Any) -> None:
+    """Add fields (row counts, cache versions, ...) to the current request's summary line."""
+    request_log = current_log()
+    if request_log is not None:
+        request_log.fields.update(fields)
+
+
+@contextlib.contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time the enclosed block as ``name`` in the current request's summary line."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        request_log = current_log()
+        if request_log is not None:
+            request_log.phases[name] = request_log.phases.get(name, 0.0) + time.perf_counter() - started
+
+
+def init_app(app: Flask, debug_sample_rate: float = 0.0) -> None:
+    """Give every request a ``g.request_id`` and log one summary line when it completes.
+
+    Streamed responses are summarized when the stream closes, so the duration
+    covers the whole body.
+    """
+
+    @app.before_request
+    def start_request_log() -> None:
+        g.request_id = datetime.now().strftime("%Y%m%d%H%M%S%f")
+        g.request_log = RequestLog(g.request_id, request.method, request.path)
+        _sampled.set(debug_sample_rate > 0 and random.random() < debug_sample_rate)
+
+    @app.after_request
+    def finish_request_log(response: Response) -> Response:
+        request_log = g.get('request_log')
+        if request_log is None or request.path.startswith('/static/'):
+            return response
+
+        def emit() -> None:
+            if summary_logger.isEnabledFor(logging.INFO):
+                summary_logger.info('%s', json.dumps(request_log.summary(response), separators=(',', ':'), default=str))
+
+        if response.is_streamed:
+            response.call_on_close(emit)
+        else:
+            emit()
+        return response
+
+    @app.teardown_request
+    def end_sampling(error: Optional[BaseException]) -> None:
+        _sampled.set(False)
@@ -0,0 +1,178 @@
+import collections
+import cProfile
+import hmac
+import io
+import itertools
+import logging
+import os
+import pstats
+import re
+import sys
+import threading
+from typing import Counter, List, Optional
+
+from flask import Flask, Response, g, request
+
+from request_logging import log_fields
+
+logger = logging.getLogger(__name__)
+
+# Profiles kept in the profile directory; older ones are deleted
+MAX_STORED_PROFILES = 100
+
+# Seconds between stack samples in 'sample' mode
+SAMPLE_INTERVAL = 0.001
+
+# Profile file suffix per mode
+PROFILE_SUFFIXES = {'cprofile': '.pstats', 'sample': '.collapsed.txt'}
+
+# Profile IDs: request ID, worker process ID and a per-process counter, so concurrent requests never share one
+PROFILE_ID_PATTERN = re.compile(r'\d{20}-\d+-\d+')
+_profile_counter = itertools.count(1)
+
+
+class StackSampler:
+    """Samples one thread's Python stack from a helper thread.
+
+    Unlike cProfile it adds no per-call overhead to the profiled thread, so
+    timings stay realistic; the result is in the collapsed-stack format
+    flame graph tools read (``frame;frame;frame count`` per line).
+    """
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            frames: List[str] = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if frames:
+                self.stacks[';'.join(reversed(frames))] += 1
+
+    def dump(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def new_profile_id(request_id: str) -> str:
+    """A profile ID for a request, unique across threads and worker processes."""
+    return f"{request_id}-{os.getpid()}-{next(_profile_counter)}"
+
+
+def profile_path(directory: str, profile_id: str) -> Optional[str]:
+    """The stored profile named ``profile_id``, or None if there is none."""
+    if not PROFILE_ID_PATTERN.fullmatch(profile_id):
+        return None
+    for suffix in PROFILE_SUFFIXES.values():
+        path = os.path.join(directory, profile_id + suffix)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def profile_summary(path: str, limit: int = 40) -> str:
+    """A plain-text report of a stored profile: the top functions by cumulative time, or the hottest stacks."""
+    if path.endswith(PROFILE_SUFFIXES['sample']):
+        with open(path, encoding='utf-8') as f:
+            return ''.join(f.readlines()[:limit])
+    out = io.StringIO()
+    pstats.Stats(path, stream=out).sort_stats('cumulative').print_stats(limit)
+    return out.getvalue()
+
+
+def is_authorized(token: str) -> bool:
+    """Whether the current request carries the profiling token (X-Profile header or _profile query parameter)."""
+    given = request.headers.get('X-Profile') or request.args.get('_profile') or ''
+    return bool(token) and hmac.compare_digest(given.encode('utf-8'), token.encode('utf-8'))
+
+
+def init_app(app: Flask, token: str, directory: str) -> None:
+    """Profile requests that present ``token``, storing each profile in ``directory`` under a new profile ID.
+
+    Does nothing (no hooks are installed) unless ``token`` is set. The mode is
+    chosen with the X-Profile-Mode header or _profile_mode parameter:
+    'cprofile' (default; every call, as pstats) or 'sample' (stack samples,
+    as collapsed stacks). The response's X-Profile-Id header names the
+    profile (see :func:`new_profile_id`), which /debug/profiles/<profile_id> serves.
+    """
+    if not token:
+        return
+    os.makedirs(directory, exist_ok=True)
+
+    @app.before_request
+    def start_profile() -> None:
+        if request.path.startswith('/debug/profiles/') or not is_authorized(token):
+            return
+        mode = request.headers.get('X-Profile-Mode') or request.args.get('_profile_mode') or 'cprofile'
+        if mode not in PROFILE_SUFFIXES:
+            mode = 'cprofile'
+        if mode == 'sample':
+            profiler = StackSampler(threading.get_ident())
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError as e:  # Another profiler is active (on Python 3.12+, possibly another request's)
+                logger.warning(f"Cannot profile request {g.request_id}: {e}")
+                return
+        g.profiler = (mode, profiler, new_profile_id(g.request_id))
+
+    @app.after_request
+    def finish_profile(response: Response) -> Response:
+        started = g.get('profiler')
+        if started is None:
+            return response
+        mode, profiler, profile_id = started
+        request_id = g.request_id
+        path = os.path.join(directory, profile_id + PROFILE_SUFFIXES[mode])
+
+        def save() -> None:
+            try:
+                if isinstance(profiler, StackSampler):
+                    profiler.stop()
+                    profiler.dump(path)
+                else:
+                    profiler.disable()
+                    profiler.dump_stats(path)
+                _prune(directory)
+                logger.info(f"Saved {mode} profile of request {request_id} to {path}")
+            except Exception as e:
+                logger.error(f"Failed to save profile of request {request_id}: {e}")
+
+        response.headers['X-Profile-Id'] = profile_id
+        log_fields(profile=path)
+        if response.is_streamed:
+            response.call_on_close(save)
+        else:
+            save()
+        return response
+
+
+def _prune(directory: str) -> None:
+    paths = [os.path.join(directory, name) for name in os.listdir(directory)
+             if name.endswith(tuple(PROFILE_SUFFIXES.values()))]
+    if len(paths) <= MAX_STORED_PROFILES:
+        return
+    paths.sort(key=os.path.getmtime)
+    for path in paths[:-MAX_STORED_PROFILES]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
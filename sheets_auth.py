@@ -0,0 +1,88 @@
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from typing import List, Optional, Type
+
+import gspread
+import requests
+from google.auth.transport.requests import Request
+from google.oauth2.service_account import Credentials
+from gspread.http_client import HTTPClient
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Access tokens are refreshed this many seconds before they expire, off the request path
+# (google-auth would otherwise refresh inline on the first request in the last few minutes)
+TOKEN_REFRESH_MARGIN = 600.0
+
+# Seconds between checks of the access token's expiry
+TOKEN_CHECK_INTERVAL = 60.0
+
+
+class ServiceAccount:
+    """Service account credentials, read from ``path`` once and kept fresh.
+
+    The key file is only re-read when it changes on disk (e.g. a rotated key),
+    so reconnecting costs no file I/O or JSON parsing. The same Credentials
+    object is shared by every session built from it, so refreshing it here
+    refreshes them all.
+    """
+
+    def __init__(self, path: str, scopes: List[str]):
+        self.path = path
+        self.scopes = scopes
+        self._lock = threading.Lock()
+        self._credentials: Optional[Credentials] = None
+        self._mtime: Optional[float] = None
+        # Reused for token requests, so refreshes don't pay a TLS handshake each time
+        self._token_session = requests.Session()
+
+    def credentials(self) -> Credentials:
+        """The current credentials; raises ValueError if the key file is unreadable or not a service account key."""
+        mtime = os.path.getmtime(self.path)
+        with self._lock:
+            if self._credentials is None or mtime != self._mtime:
+                self._credentials = self._load()
+                self._mtime = mtime
+            return self._credentials
+
+    def _load(self) -> Credentials:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                info = json.load(f)
+        except Exception as e:
+            raise ValueError(f"Failed to read credentials file {self.path}: {e}") from e
+
+        # Basic validation of expected fields in a service account key
+        if not info.get('client_email') or not info.get('private_key'):
+            raise ValueError(f"Credentials file {self.path} does not appear to be a service account key. Set "
+                             f"GOOGLE_SERVICE_ACCOUNT_FILE to a valid service account JSON or enable MOCK_SHEETS=1.")
+        logger.info(f"Loaded service account credentials for {info['client_email']}")
+        return Credentials.from_service_account_info(info, scopes=self.scopes)
+
+    def refresh_if_expiring(self, margin: float = TOKEN_REFRESH_MARGIN) -> bool:
+        """Fetch a new access token if there is none or it expires within ``margin`` seconds.
+
+        Returns:
+            bool: True if the token was refreshed.
+        """
+        credentials = self._credentials
+        if credentials is None:
+            return False
+        now = datetime.now(timezone.utc).replace(tzinfo=None)  # google-auth expiries are naive UTC
+        if credentials.token and credentials.expiry is not None and (credentials.expiry - now).total_seconds() > margin:
+            return False
+        with self._lock:
+            credentials.refresh(Request(self._token_session))
+        logger.info(f"Refreshed Google access token, valid until {credentials.expiry:%H:%M:%S} UTC")
+        return True
+
+
+def connect(credentials: Credentials, http_client: Type[HTTPClient], pool_size: int) -> gspread.Client:
+    """A gspread client on a new authorized session keeping up to ``pool_size`` keep-alive connections to Google."""
+    client = gspread.Client(credentials, http_client=http_client)
+    client.http_client.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=pool_size))
+    return client
@@ -0,0 +1,238 @@
+import logging
+import threading
+import time
+from typing import Callable, Generic, List, Optional, TypeVar
+
+import metrics
+from sheets_scheduler import background_lane
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class Snapshot(Generic[T]):
+    """An immutable, versioned copy of data loaded from Google Sheets.
+
+    The data held by a snapshot is shared between requests and must be
+    treated as read-only; writers publish a new snapshot instead.
+    """
+
+    __slots__ = ('version', 'data', 'loaded_at', 'created_at')
+
+    def __init__(self, version: int, data: T, loaded_at: float):
+        self.version = version
+        self.data = data
+        self.loaded_at = loaded_at
+        # Wall-clock time this version was published, e.g. for Last-Modified headers
+        self.created_at = time.time()
+
+    def age(self) -> float:
+        """Seconds since the data was loaded or confirmed current (patches keep the original load time)."""
+        return time.monotonic() - self.loaded_at
+
+
+class _Flight:
+    """A load in progress that concurrent callers can wait on."""
+
+    __slots__ = ('done', 'snapshot', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.snapshot: Optional[Snapshot] = None
+        self.error: Optional[BaseException] = None
+
+
+class SnapshotCache(Generic[T]):
+    """Read-through cache holding the latest snapshot of a sheet.
+
+    - Snapshots younger than ``ttl`` seconds are served as-is.
+    - Snapshots older than ``ttl`` but younger than ``ttl + stale_ttl`` are
+      served immediately while a background thread reloads them.
+    - Anything older (or no snapshot at all) is reloaded synchronously.
+
+    Loads are single-flight: concurrent callers share one call to ``loader``
+    instead of each hitting Google Sheets. If ``same`` says a load returned
+    the data already cached, the current snapshot (and its version) is kept
+    and only its age is reset.
+    """
+
+    def __init__(self, name: str, loader: Callable[[], T], ttl: float, stale_ttl: float,
+                 same: Optional[Callable[[T, T], bool]] = None):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._loader = loader
+        self._same = same
+        self._lock = threading.Lock()
+        self._snapshot: Optional[Snapshot[T]] = None
+        self._invalidated: bool = False
+        self._flight: Optional[_Flight] = None
+        self._version: int = 0
+        # Bumped on every patch/invalidate so loads that raced a write don't clobber it
+        self._generation: int = 0
+        self._listeners: List[Callable[[Optional[Snapshot[T]], Snapshot[T]], None]] = []
+        # Held from installing a snapshot until its listeners ran, so they see versions in order
+        self._notify_lock = threading.Lock()
+
+    def subscribe(self, listener: Callable[[Optional[Snapshot[T]], Snapshot[T]], None]) -> None:
+        """Call ``listener(previous, current)`` whenever a new snapshot version is installed.
+
+        Listeners run on the thread that installed the snapshot, after the cache's
+        lock is released; exceptions they raise are logged and ignored.
+        """
+        self._listeners.append(listener)
+
+    def peek(self) -> Optional[Snapshot[T]]:
+        """Return the current snapshot without loading anything."""
+        return self._snapshot
+
+    def get(self) -> Snapshot[T]:
+        """Return a snapshot, loading or refreshing it as the TTLs require.
+
+        Raises whatever the loader raised if there is no snapshot to fall back on.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            metrics.count_cache_read(self.name, 'miss')
+            return self.refresh()
+
+        age = float('inf') if self._invalidated else snapshot.age()
+        if age < self.ttl:
+            metrics.count_cache_read(self.name, 'hit')
+            return snapshot
+
+        if age < self.ttl + self.stale_ttl:
+            metrics.count_cache_read(self.name, 'stale')
+            self._refresh_in_background()
+            return snapshot
+
+        metrics.count_cache_read(self.name, 'miss')
+        try:
+            return self.refresh()
+        except Exception as e:
+            logger.error(f"Failed to refresh {self.name} snapshot, serving version {snapshot.version} "
+                         f"({snapshot.age():.0f}s old): {e}")
+            return snapshot
+
+    def refresh(self) -> Snapshot[T]:
+        """Load fresh data, joining a load that is already in flight."""
+        with self._lock:
+            flight = self._flight
+            leader = flight is None
+            if leader:
+                flight = self._flight = _Flight()
+                generation = self._generation
+
+        if not leader:
+            logger.debug(f"Waiting for in-flight {self.name} load")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            assert flight.snapshot is not None
+            return flight.snapshot
+
+        try:
+            data = self._loader()
+            with self._notify_lock:
+                previous = installed = None
+                with self._lock:
+                    if self._generation != generation and self._snapshot is not None:
+                        # A write landed while we were loading; its patched snapshot is newer than our data
+                        logger.info(f"Discarding {self.name} load that raced a write")
+                        snapshot = self._snapshot
+                    elif self._snapshot is not None and self._same is not None and self._same(self._snapshot.data, data):
+                        logger.debug(f"{self.name} unchanged, keeping snapshot v{self._snapshot.version}")
+                        snapshot = self._snapshot
+                        snapshot.loaded_at = time.monotonic()
+                        self._invalidated = False
+                        self._mark_loaded(snapshot)
+                    else:
+                        previous = self._snapshot
+                        snapshot = installed = self._install(data)
+                if installed is not None:
+                    self._notify(previous, installed)
+            flight.snapshot = snapshot
+            return snapshot
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flight = None
+            flight.done.set()
+
+    def publish(self, data: T) -> Snapshot[T]:
+        """Replace the current snapshot with ``data`` as a new version."""
+        with self._notify_lock:
+            with self._lock:
+                self._generation += 1
+                previous = self._snapshot
+                snapshot = self._install(data)
+            self._notify(previous, snapshot)
+        return snapshot
+
+    def patch(self, update: Callable[[T], T]) -> Optional[Snapshot[T]]:
+        """Publish ``update(current data)`` as a new version, keeping the snapshot consistent with a write.
+
+        ``update`` must return new data rather than mutating its argument.
+        Does nothing if no snapshot has been loaded yet.
+        """
+        with self._notify_lock:
+            with self._lock:
+                self._generation += 1
+                previous = self._snapshot
+                if previous is None:
+                    return None
+                invalidated = self._invalidated
+                snapshot = self._install(update(previous.data), previous.loaded_at)
+                self._invalidated = invalidated
+            self._notify(previous, snapshot)
+        return snapshot
+
+    def touch(self) -> None:
+        """Reset the current snapshot's age after confirming elsewhere that its data is current.
+
+        Does nothing if there is no snapshot or it was invalidated.
+        """
+        with self._lock:
+            if self._snapshot is not None and not self._invalidated:
+                self._snapshot.loaded_at = time.monotonic()
+                self._mark_loaded(self._snapshot)
+
+    def invalidate(self) -> None:
+        """Force the next read to reload; the old snapshot is kept as a fallback."""
+        with self._lock:
+            self._generation += 1
+            self._invalidated = True
+
+    def _install(self, data: T, loaded_at: Optional[float] = None) -> Snapshot[T]:
+        self._version += 1
+        snapshot = Snapshot(self._version, data, time.monotonic() if loaded_at is None else loaded_at)
+        self._snapshot = snapshot
+        self._invalidated = False
+        self._mark_loaded(snapshot)
+        return snapshot
+
+    def _mark_loaded(self, snapshot: Snapshot[T]) -> None:
+        metrics.mark_snapshot_loaded(self.name, time.time() - snapshot.age())
+
+    def _notify(self, previous: Optional[Snapshot[T]], current: Snapshot[T]) -> None:
+        for listener in self._listeners:
+            try:
+                listener(previous, current)
+            except Exception as e:
+                logger.error(f"{self.name} snapshot listener failed: {e}", exc_info=True)
+
+    def _refresh_in_background(self) -> None:
+        if self._flight is not None:
+            return
+
+        def run():
+            try:
+                with background_lane():
+                    self.refresh()
+            except Exception as e:
+                logger.error(f"Background refresh of {self.name} snapshot failed: {e}")
+
+        threading.Thread(target=run, name=f'refresh-{self.name}', daemon=True).start()
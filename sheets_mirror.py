@@ -0,0 +1,297 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Header names whose cells are copied into indexed columns: column -> headers it may appear under
+INDEXED_HEADERS: Dict[str, Tuple[str, ...]] = {
+    'order_id': ('Order ID',),
+    'status': ('Delivery Status', 'Status'),
+    'order_date': ('Order Date',),
+    'delivery_date': ('Delivery Date',),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sheet_rows (
+    sheet TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    hash BLOB NOT NULL,
+    cells TEXT NOT NULL,
+    order_id TEXT,
+    status TEXT,
+    order_date TEXT,
+    delivery_date TEXT,
+    PRIMARY KEY (sheet, row)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS sheet_rows_order_id ON sheet_rows (sheet, order_id);
+CREATE INDEX IF NOT EXISTS sheet_rows_status ON sheet_rows (sheet, status);
+CREATE INDEX IF NOT EXISTS sheet_rows_order_date ON sheet_rows (sheet, order_date);
+CREATE INDEX IF NOT EXISTS sheet_rows_delivery_date ON sheet_rows (sheet, delivery_date);
+CREATE TABLE IF NOT EXISTS sheet_sync (
+    sheet TEXT PRIMARY KEY,
+    synced_at REAL NOT NULL,
+    row_count INTEGER NOT NULL,
+    generation INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS sync_lease (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    claimed_at REAL NOT NULL
+);
+"""
+
+# Reads a list of A1 ranges and returns each range's values (rows of cells), like values_batch_get
+Fetch = Callable[[List[str]], List[List[List[Any]]]]
+
+
+class SyncResult(NamedTuple):
+    """Rows written and removed for one sheet by a sync; unchanged rows are not touched."""
+    changed: int
+    removed: int
+
+
+def _row_hash(encoded: str) -> bytes:
+    return hashlib.blake2b(encoded.encode('utf-8'), digest_size=8).digest()
+
+
+def _is_blank(cells: List[Any]) -> bool:
+    return not any(cell != '' for cell in cells)
+
+
+def _indexed_cells(cells: List[Any], positions: List[Optional[int]]) -> List[Optional[str]]:
+    return [
+        str(cells[pos]) if pos is not None and pos < len(cells) and cells[pos] != '' else None
+        for pos in positions
+    ]
+
+
+class SheetsMirror:
+    """Local SQLite copy of the raw values of whole worksheets.
+
+    Rows are stored as JSON arrays keyed by (sheet, row number), exactly as
+    returned by the Sheets API, so callers decode them the same way as a
+    live read. Order ID, status and date cells are also copied into indexed
+    columns for lookups that shouldn't scan a sheet.
+
+    :meth:`sync` pulls every mirrored sheet in one batch request and only
+    rewrites rows whose values changed since the previous pull; each sheet's
+    generation is bumped whenever its rows change, so readers can tell when
+    to reload. The database is shared by every worker process pointing at the
+    same file, and :meth:`claim_sync` lets them take turns pulling.
+    """
+
+    def __init__(self, path: str, sheet_names: List[str]):
+        self.path = path
+        self.sheet_names = list(sheet_names)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._connection = self._connect()
+        self._connection.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        if self._pid != os.getpid():
+            # Forked (e.g. a gunicorn worker of a preloaded app): SQLite connections can't be shared across processes
+            self._connection = self._connect()
+            self._pid = os.getpid()
+        return self._connection
+
+    def synced_at(self) -> Optional[float]:
+        """Wall-clock time of the oldest sheet's last sync, or None if any sheet was never synced."""
+        with self._lock:
+            synced = dict(self._conn.execute('SELECT sheet, synced_at FROM sheet_sync'))
+        if any(name not in synced for name in self.sheet_names):
+            return None
+        return min(synced[name] for name in self.sheet_names)
+
+    def age(self) -> Optional[float]:
+        """Seconds since the oldest sheet was last synced, or None if any sheet was never synced."""
+        synced_at = self.synced_at()
+        return None if synced_at is None else max(0.0, time.time() - synced_at)
+
+    def generations(self) -> Dict[str, int]:
+        """Per-sheet counters bumped whenever a sync or write changes the sheet's rows."""
+        with self._lock:
+            return dict(self._conn.execute('SELECT sheet, generation FROM sheet_sync'))
+
+    def claim_sync(self, interval: float) -> bool:
+        """Claim the next sync if nobody (in any process) has claimed one in the last ``interval`` seconds."""
+        now = time.time()
+        with self._lock:
+            found = self._conn.execute('SELECT claimed_at FROM sync_lease WHERE id = 1').fetchone()
+            if found is not None and now - found[0] < interval:
+                return False
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                # Re-check under the write lock: another process may have claimed it since
+                found = self._conn.execute('SELECT claimed_at FROM sync_lease WHERE id = 1').fetchone()
+                claimed = found is None or now - found[0] >= interval
+                if claimed:
+                    self._conn.execute('INSERT OR REPLACE INTO sync_lease (id, claimed_at) VALUES (1, ?)', (now,))
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+        return claimed
+
+    def sync(self, fetch: Fetch) -> Dict[str, SyncResult]:
+        """Pull every mirrored sheet with one ``fetch`` call and apply the row-level differences.
+
+        Raises whatever ``fetch`` raised; the mirror is left unchanged in that case.
+        """
+        ranges = [f"'{name}'" for name in self.sheet_names]
+        value_ranges = fetch(ranges)
+        if len(value_ranges) != len(ranges):
+            raise RuntimeError(f"Expected {len(ranges)} value ranges from Google Sheets, got {len(value_ranges)}")
+
+        results: Dict[str, SyncResult] = {}
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                now = time.time()
+                for sheet_name, values in zip(self.sheet_names, value_ranges):
+                    result = results[sheet_name] = self._apply(sheet_name, values)
+                    self._conn.execute(
+                        'INSERT INTO sheet_sync (sheet, synced_at, row_count, generation) VALUES (?, ?, ?, 1) '
+                        'ON CONFLICT (sheet) DO UPDATE SET synced_at = excluded.synced_at, '
+                        'row_count = excluded.row_count, generation = generation + ?',
+                        (sheet_name, now, len(values), 1 if result.changed or result.removed else 0)
+                    )
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+
+        logger.info("Synced sheet mirror: " + ', '.join(
+            f"{name} {result.changed} changed/{result.removed} removed" for name, result in results.items()
+        ))
+        return results
+
+    def _apply(self, sheet_name: str, values: List[List[Any]]) -> SyncResult:
+        stored: Dict[int, bytes] = dict(self._conn.execute(
+            'SELECT row, hash FROM sheet_rows WHERE sheet = ?', (sheet_name,)
+        ))
+        header = values[0] if values else []
+        header_encoded = json.dumps(header, ensure_ascii=False, separators=(',', ':'))
+        # A changed header moves the indexed cells of every row, so rewrite them all
+        header_changed = stored.get(1) != _row_hash(header_encoded)
+        positions = self._indexed_positions(header)
+
+        upserts: List[Tuple[Any, ...]] = []
+        for row, cells in enumerate(values, start=1):
+            if _is_blank(cells):
+                continue  # Left to the delete below if it used to hold data
+            encoded = header_encoded if row == 1 else json.dumps(cells, ensure_ascii=False, separators=(',', ':'))
+            digest = _row_hash(encoded)
+            if stored.pop(row, None) == digest and not header_changed:
+                continue
+            indexed = [None] * len(positions) if row == 1 else _indexed_cells(cells, positions)
+            upserts.append((sheet_name, row, digest, encoded, *indexed))
+
+        removed = list(stored)
+        if upserts:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO sheet_rows (sheet, row, hash, cells, order_id, status, order_date, delivery_date) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', upserts
+            )
+        if removed:
+            self._conn.executemany(
+                'DELETE FROM sheet_rows WHERE sheet = ? AND row = ?', [(sheet_name, row) for row in removed]
+            )
+        return SyncResult(len(upserts), len(removed))
+
+    @staticmethod
+    def _indexed_positions(header: List[Any]) -> List[Optional[int]]:
+        header_index = {str(name).strip(): i for i, name in enumerate(header)}
+        positions: List[Optional[int]] = []
+        for names in INDEXED_HEADERS.values():
+            positions.append(next((header_index[name] for name in names if name in header_index), None))
+        return positions
+
+    def values(self, sheet_name: str) -> List[List[Any]]:
+        """The mirrored values of ``sheet_name`` (header row first), as a whole-sheet values_get returns them.
+
+        Blank rows are left out.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT cells FROM sheet_rows WHERE sheet = ? ORDER BY row', (sheet_name,)
+            ).fetchall()
+        return [json.loads(cells) for cells, in rows]
+
+    def row_count(self, sheet_name: str) -> int:
+        """Rows (including the header) the sheet had when last synced; 0 if never synced."""
+        with self._lock:
+            found = self._conn.execute('SELECT row_count FROM sheet_sync WHERE sheet = ?', (sheet_name,)).fetchone()
+        return found[0] if found else 0
+
+    def order_rows(self, sheet_name: str) -> Dict[str, int]:
+        """Order ID -> first row holding it in ``sheet_name``, as of the last sync."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT order_id, MIN(row) FROM sheet_rows WHERE sheet = ? AND order_id IS NOT NULL GROUP BY order_id',
+                (sheet_name,)
+            ).fetchall()
+        return dict(rows)
+
+    def update_cells(self, sheet_name: str, cells: Iterable[Tuple[int, int, Any]]) -> int:
+        """Apply cells written to Google Sheets by this app, so the mirror doesn't serve old values until the next sync.
+
+        Args:
+            sheet_name (str): The worksheet written to.
+            cells (Iterable[Tuple[int, int, Any]]): (row, column, value), both 1-based.
+
+        Returns:
+            int: How many of the cells were in mirrored rows; rows not mirrored yet
+            are picked up by the next sync.
+        """
+        updated = 0
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                header_row = self._conn.execute(
+                    'SELECT cells FROM sheet_rows WHERE sheet = ? AND row = 1', (sheet_name,)
+                ).fetchone()
+                positions = self._indexed_positions(json.loads(header_row[0]) if header_row else [])
+                for row, column, value in cells:
+                    found = self._conn.execute(
+                        'SELECT cells FROM sheet_rows WHERE sheet = ? AND row = ?', (sheet_name, row)
+                    ).fetchone()
+                    if found is None or row == 1:
+                        continue
+                    values = json.loads(found[0])
+                    values.extend([''] * (column - len(values)))
+                    values[column - 1] = value
+                    encoded = json.dumps(values, ensure_ascii=False, separators=(',', ':'))
+                    indexed = _indexed_cells(values, positions)
+                    self._conn.execute(
+                        'UPDATE sheet_rows SET hash = ?, cells = ?, order_id = ?, status = ?, order_date = ?, '
+                        'delivery_date = ? WHERE sheet = ? AND row = ?',
+                        (_row_hash(encoded), encoded, *indexed, sheet_name, row)
+                    )
+                    updated += 1
+                if updated:
+                    self._conn.execute('UPDATE sheet_sync SET generation = generation + 1 WHERE sheet = ?', (sheet_name,))
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+        return updated
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
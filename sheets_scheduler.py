@@ -0,0 +1,224 @@
+import contextlib
+import heapq
+import itertools
+import logging
+import random
+import re
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple, Type, TypeVar
+from urllib.parse import unquote
+
+import requests
+from gspread.exceptions import APIError
+from gspread.http_client import HTTPClient
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Priority lanes; lower values are served first when calls have to queue for quota
+INTERACTIVE = 0
+BACKGROUND = 1
+LANE_NAMES = {INTERACTIVE: 'interactive', BACKGROUND: 'background'}
+
+# HTTP statuses worth retrying: quota exceeded and transient server errors
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+_lane: ContextVar[int] = ContextVar('sheets_lane', default=INTERACTIVE)
+
+
+@contextlib.contextmanager
+def background_lane() -> Iterator[None]:
+    """Run Sheets calls made inside the block in the background lane (e.g. snapshot refreshes)."""
+    token = _lane.set(BACKGROUND)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+def error_status(error: BaseException) -> Optional[int]:
+    """The HTTP status of a failed Sheets API call, or None if it isn't an API error."""
+    if isinstance(error, APIError):
+        return getattr(error.response, 'status_code', None)
+    return None
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    return error_status(error) == 429
+
+
+class TokenBucket:
+    """Allows ``rate`` calls per second on average, with bursts of up to ``capacity`` calls."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def take(self) -> float:
+        """Take a token if one is available; otherwise return the seconds until one will be."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def drain(self) -> None:
+        """Drop any saved-up burst, e.g. after the API said we are over quota."""
+        self._tokens = min(self._tokens, 0.0)
+        self._updated = time.monotonic()
+
+
+class SheetsScheduler:
+    """Paces Google Sheets API calls to stay within the per-minute quotas.
+
+    Reads and writes draw from separate token buckets, matching Google's
+    separate read and write quotas. When a bucket is empty, callers queue by
+    lane (interactive requests ahead of background refreshes) and then in
+    arrival order. Calls rejected with 429 or failing with a transient 5xx
+    are retried with exponential backoff and full jitter, honouring
+    Retry-After; writes are only retried on 429, since a write that failed
+    with a 5xx may still have been applied.
+    """
+
+    def __init__(self, reads_per_minute: float, writes_per_minute: float, burst_seconds: float = 30.0,
+                 max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 32.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._buckets = {
+            kind: TokenBucket(per_minute / 60.0, max(1.0, per_minute * burst_seconds / 60.0))
+            for kind, per_minute in (('read', reads_per_minute), ('write', writes_per_minute))
+        }
+        self._waiting: Dict[str, List[Tuple[int, int]]] = {kind: [] for kind in self._buckets}
+        self._tickets = itertools.count()
+        self._cond = threading.Condition()
+        self._stats: Dict[str, float] = {
+            'calls': 0, 'retries': 0, 'failures': 0, 'rate_limited': 0,
+            'throttled_seconds': 0.0, 'backoff_seconds': 0.0,
+        }
+
+    def run(self, kind: str, call: Callable[[], T], sheet: Optional[str] = None) -> T:
+        """Run ``call`` (a 'read' or 'write' API request) once quota allows, retrying transient failures.
+
+        With ``sheet`` (see sheet_label), every attempt is recorded in the Sheets API metrics.
+        """
+        caller = metrics.current_route(LANE_NAMES[_lane.get()]) if sheet is not None else ''
+        for attempt in itertools.count():
+            self._acquire(kind)
+            started = time.perf_counter()
+            try:
+                result = call()
+                self._count('calls')
+                if sheet is not None:
+                    metrics.observe_sheets_call(kind, sheet, caller, time.perf_counter() - started)
+                return result
+            except (APIError, requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self._count('calls')
+                if sheet is not None:
+                    metrics.observe_sheets_call(kind, sheet, caller, time.perf_counter() - started,
+                                                str(error_status(e) or type(e).__name__))
+                status = error_status(e)
+                if status == 429:
+                    self._count('rate_limited')
+                    with self._cond:
+                        self._buckets[kind].drain()
+                retryable = status == 429 or (kind == 'read' and (status is None or status in RETRYABLE_STATUSES))
+                if not retryable or attempt >= self.max_retries:
+                    self._count('failures')
+                    raise
+                delay = self._backoff(attempt, e)
+                logger.warning(f"Sheets {kind} failed ({status or type(e).__name__}), "
+                               f"retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+                self._count('retries')
+                metrics.count_sheets_retry(kind)
+                self._count('backoff_seconds', delay)
+                time.sleep(delay)
+        raise AssertionError('unreachable')
+
+    def _acquire(self, kind: str) -> None:
+        bucket = self._buckets[kind]
+        waiting = self._waiting[kind]
+        ticket = (_lane.get(), next(self._tickets))
+        started = time.monotonic()
+        with self._cond:
+            heapq.heappush(waiting, ticket)
+            while True:
+                timeout = None
+                if waiting[0] == ticket:
+                    timeout = bucket.take()
+                    if timeout == 0:
+                        heapq.heappop(waiting)
+                        self._cond.notify_all()  # Let the next caller in line check the bucket
+                        break
+                self._cond.wait(timeout)
+        throttled = time.monotonic() - started
+        if throttled >= 0.01:
+            self._count('throttled_seconds', throttled)
+            metrics.add_sheets_throttled(kind, LANE_NAMES[ticket[0]], throttled)
+            logger.debug(f"Sheets {kind} waited {throttled:.2f}s for quota ({LANE_NAMES[ticket[0]]} lane)")
+
+    def _backoff(self, attempt: int, error: BaseException) -> float:
+        if isinstance(error, APIError):
+            retry_after = error.response.headers.get('Retry-After') if error.response is not None else None
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _count(self, name: str, amount: float = 1) -> None:
+        with self._cond:
+            self._stats[name] += amount
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters since startup: calls, retries, failures, 429s and seconds spent throttled or backing off."""
+        with self._cond:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats['queued'] = {kind: len(waiting) for kind, waiting in self._waiting.items()}
+        stats['throttled_seconds'] = round(stats['throttled_seconds'], 3)
+        stats['backoff_seconds'] = round(stats['backoff_seconds'], 3)
+        return stats
+
+
+def sheet_label(endpoint: str, params: Optional[Mapping[str, Any]] = None, body: Optional[Mapping[str, Any]] = None) -> str:
+    """The worksheets a Sheets API request touches, comma-separated, for metrics.
+
+    Ranges come from batch ``ranges`` parameters, batch update ``data`` or the
+    values URL itself; requests without ranges (e.g. spreadsheet metadata) are
+    labelled ``-``.
+    """
+    ranges: List[str] = []
+    if params and params.get('ranges'):
+        found = params['ranges']
+        ranges = [found] if isinstance(found, str) else list(found)
+    elif body and isinstance(body.get('data'), list):
+        ranges = [item.get('range', '') for item in body['data'] if isinstance(item, dict)]
+    elif '/values/' in endpoint:
+        ranges = [re.sub(r':(append|clear)$', '', unquote(endpoint.split('/values/', 1)[1]))]
+    names = {name.split('!', 1)[0].strip("'") for name in ranges}
+    return ','.join(sorted(name for name in names if name)) or '-'
+
+
+def scheduled_http_client(scheduler: SheetsScheduler) -> Type[HTTPClient]:
+    """A gspread HTTP client class whose requests all go through ``scheduler``.
+
+    Pass it to ``gspread.authorize(credentials, http_client=...)``. GET requests
+    count against the read quota and everything else against the write quota.
+    """
+
+    class ScheduledHTTPClient(HTTPClient):
+        def request(self, method: str, endpoint: str, *args: Any, **kwargs: Any) -> requests.Response:
+            kind = 'read' if method.upper() == 'GET' else 'write'
+            sheet = sheet_label(endpoint, kwargs.get('params'), kwargs.get('json'))
+            return scheduler.run(
+                kind, lambda: super(ScheduledHTTPClient, self).request(method, endpoint, *args, **kwargs), sheet
+            )
+
+    return ScheduledHTTPClient
@@ -0,0 +1,74 @@
+import logging
+import threading
+from typing import Callable, Optional
+
+from sheets_scheduler import background_lane
+
+logger = logging.getLogger(__name__)
+
+# Longest wait between attempts after repeated sync failures
+_MAX_BACKOFF = 300.0
+
+
+class BackgroundSync:
+    """Calls ``sync`` every ``interval`` seconds on a daemon thread until stopped.
+
+    The first call happens as soon as the thread starts, and Sheets requests
+    it makes wait behind interactive ones for quota. A failing ``sync`` is
+    logged and retried with exponential backoff (capped at five minutes), so
+    an outage doesn't turn into a tight loop of doomed requests. :meth:`wake`
+    runs the next call right away instead of after the interval.
+    """
+
+    def __init__(self, name: str, sync: Callable[[], object], interval: float):
+        self.name = name
+        self.interval = interval
+        self._sync = sync
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._wake.clear()
+        self._thread = threading.Thread(target=self._run, name=f'sync-{self.name}', daemon=True)
+        self._thread.start()
+        logger.info(f"Started background {self.name} sync every {self.interval:g}s")
+
+    def wake(self) -> None:
+        """Run the next sync now rather than after the interval (ignored while backing off after failures)."""
+        self._wake.set()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        failures = 0
+        delay = 0.0
+        while True:
+            if failures:
+                self._stop.wait(delay)
+            else:
+                self._wake.wait(delay)
+            if self._stop.is_set():
+                break
+            self._wake.clear()
+            try:
+                with background_lane():
+                    self._sync()
+                failures = 0
+                delay = self.interval
+            except Exception as e:
+                failures += 1
+                delay = min(self.interval * 2 ** failures, _MAX_BACKOFF)
+                logger.error(f"Background {self.name} sync failed ({failures} in a row), retrying in {delay:.0f}s: {e}")
@@ -1,7 +1,10 @@
 import os
 import logging
-from datetime import datetime
-from flask import Flask, render_template, request, jsonify, send_from_directory
+import hashlib
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, Optional
+from flask import Flask, Response, g, render_template, request, jsonify, send_from_directory
 from dotenv import load_dotenv
 from pydantic import BaseSettings, Field
 
@@ -15,6 +18,15 @@ class AppSettings(BaseSettings):
     SECRET_KEY: str = Field('dev-secret-key-change-in-production', env='SECRET_KEY')
     LOG_LEVEL: str = Field('INFO', env='LOG_LEVEL')
     LOG_FILE: str = Field('logs/app.log', env='LOG_FILE')
+    # Hand log records to a background thread instead of writing them on the request thread
+    LOG_QUEUE: bool = Field(True, env='LOG_QUEUE')
+    # Fraction of requests whose DEBUG logs are kept (0 disables debug sampling)
+    LOG_DEBUG_SAMPLE_RATE: float = Field(0.0, env='LOG_DEBUG_SAMPLE_RATE')
+    # Requests sending this token (X-Profile header or _profile parameter) are profiled; empty disables profiling
+    PROFILE_TOKEN: str = Field('', env='PROFILE_TOKEN')
+    PROFILE_DIR: str = Field('logs/profiles', env='PROFILE_DIR')
+    # Megabytes of encoded (and compressed) API response bodies kept for repeated requests
+    RESPONSE_CACHE_MB: float = Field(64.0, env='RESPONSE_CACHE_MB')
     WTF_CSRF_ENABLED: bool = Field(True, env='WTF_CSRF_ENABLED')
     SESSION_COOKIE_SECURE: bool = Field(True, env='SESSION_COOKIE_SECURE')
     SESSION_COOKIE_HTTPONLY: bool = Field(True, env='SESSION_COOKIE_HTTPONLY')
@@ -30,6 +42,11 @@ app_settings = AppSettings(
     SECRET_KEY=os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production'),
     LOG_LEVEL=os.getenv('LOG_LEVEL', 'INFO'),
     LOG_FILE=os.getenv('LOG_FILE', 'logs/app.log'),
+    LOG_QUEUE=os.getenv('LOG_QUEUE', 'True').lower() in ('1', 'true', 'yes'),
+    LOG_DEBUG_SAMPLE_RATE=float(os.getenv('LOG_DEBUG_SAMPLE_RATE', '0')),
+    PROFILE_TOKEN=os.getenv('PROFILE_TOKEN', ''),
+    PROFILE_DIR=os.getenv('PROFILE_DIR', 'logs/profiles'),
+    RESPONSE_CACHE_MB=float(os.getenv('RESPONSE_CACHE_MB', '64')),
     WTF_CSRF_ENABLED=os.getenv('WTF_CSRF_ENABLED', 'True').lower() in ('1', 'true', 'yes'),
     SESSION_COOKIE_SECURE=os.getenv('SESSION_COOKIE_SECURE', 'True').lower() in ('1', 'true', 'yes'),
     SESSION_COOKIE_HTTPONLY=os.getenv('SESSION_COOKIE_HTTPONLY', 'True').lower() in ('1', 'true', 'yes'),
@@ -44,7 +61,13 @@ else:
     load_dotenv('.env.example')  # Rename to .env in production
 
 # Import sheets_service after environment is loaded so it picks up GOOGLE_SERVICE_ACCOUNT_FILE / MOCK_SHEETS
+import metrics
 from google_sheets_service import sheets_service
+from json_responses import ResponseCache, encoded_response, init_app as init_json_responses
+from order_events import format_sse
+from order_query import parse_order_query, page_orders, stream_orders
+from request_logging import configure_logging, current_log, init_app as init_request_logging, log_fields, phase
+import request_profiling
 
 app = Flask(__name__)
 
@@ -53,6 +76,9 @@ app.config['SECRET_KEY'] = app_settings.SECRET_KEY
 app.config['DEBUG'] = bool(app_settings.DEBUG)
 app.config['WTF_CSRF_ENABLED'] = bool(app_settings.WTF_CSRF_ENABLED)
 
+# jsonify encodes with orjson when it is installed
+init_json_responses(app)
+
 # Security settings for production
 if not app.config['DEBUG']:
     app.config['SESSION_COOKIE_SECURE'] = bool(app_settings.SESSION_COOKIE_SECURE)
@@ -63,17 +89,9 @@ if not app.config['DEBUG']:
 log_level = getattr(logging, app_settings.LOG_LEVEL.upper())
 
 # Production-safe logging - prefer console logging for cloud deployments
-if app_settings.FLASK_ENV == 'production' and not app_settings.LOG_FILE:
-    # Console-only logging for production cloud environments
-    logging.basicConfig(
-        level=log_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[logging.StreamHandler()]
-    )
-else:
+handlers: list[logging.Handler] = [logging.StreamHandler()]
+if not (app_settings.FLASK_ENV == 'production' and not app_settings.LOG_FILE):
     # File + console logging for development or when explicitly configured
-    handlers: list[logging.Handler] = [logging.StreamHandler()]
-    
     log_file = app_settings.LOG_FILE
     try:
         # Create logs directory if it doesn't exist
@@ -87,14 +105,112 @@ else:
         # Fall back to console logging only
         print(f"Warning: Could not create log file {log_file}: {e}")
 
-    logging.basicConfig(
-        level=log_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=handlers
-    )
+configure_logging(log_level, handlers, use_queue=app_settings.LOG_QUEUE,
+                  debug_sample_rate=app_settings.LOG_DEBUG_SAMPLE_RATE)
 
 logger = logging.getLogger(__name__)
 
+# Request IDs in g.request_id and one summary log line per request
+init_request_logging(app, app_settings.LOG_DEBUG_SAMPLE_RATE)
+
+# Per-route request counts and latencies for /metrics (no-op without prometheus_client)
+metrics.init_app(app)
+
+# On-demand CPU profiles of single requests (no-op unless PROFILE_TOKEN is set)
+request_profiling.init_app(app, app_settings.PROFILE_TOKEN, app_settings.PROFILE_DIR)
+
+
+
+def start_worker() -> None:
+    """Connect to Google Sheets and load the first snapshots in the background, then keep them fresh.
+
+    Runs in each serving process: at import, or from gunicorn's post_fork hook
+    when the app is preloaded in the master (SHOP_PRELOAD), since threads and
+    connections don't survive a fork.
+    """
+    sheets_service.start()
+
+
+if os.getenv('SHOP_PRELOAD'):
+    # Compile templates once in the master so forked workers share them
+    for template_name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(template_name)
+else:
+    start_worker()
+
+# Order statuses accepted by the status update endpoints
+VALID_STATUSES = ['Pending', 'In Process', 'Ready', 'Delivered']
+
+# Largest number of orders accepted by one bulk status update request
+MAX_BULK_STATUS_UPDATES = 500
+
+# Seconds a new combined order request waits for its row to be written before answering 202 (still queued)
+ORDER_COMMIT_TIMEOUT = 10
+
+# Seconds an /api/orders/events stream stays open before the client reconnects (it holds a worker thread meanwhile)
+ORDER_EVENTS_STREAM_SECONDS = 25
+
+# Seconds between keep-alive comments on an idle event stream
+ORDER_EVENTS_HEARTBEAT_SECONDS = 10
+
+# Milliseconds EventSource clients wait before reconnecting
+ORDER_EVENTS_RETRY_MS = 1000
+
+def make_etag(*parts: Any) -> str:
+    """Build an ETag value from the data version and normalized request parameters."""
+    return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def not_modified_response(etag: str, last_modified: Optional[float]) -> Optional[Response]:
+    """Return a 304 response if the client's cached copy is still current, otherwise None.
+
+    If-None-Match takes precedence over If-Modified-Since, as required by RFC 9110.
+    """
+    if request.if_none_match:
+        if not request.if_none_match.contains_weak(etag):
+            return None
+    elif (last_modified is None or request.if_modified_since is None
+          or int(last_modified) > request.if_modified_since.timestamp()):
+        return None
+
+    response = app.response_class(status=304)
+    set_cache_validators(response, etag, last_modified)
+    return response
+
+
+def set_cache_validators(response: Response, etag: str, last_modified: Optional[float], weak: bool = False) -> Response:
+    """Attach ETag/Last-Modified and ask clients to revalidate before reusing the response."""
+    response.set_etag(etag, weak=weak)
+    if last_modified is not None:
+        response.last_modified = datetime.fromtimestamp(int(last_modified), tz=timezone.utc)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+# Encoded API response bodies keyed by ETag, shared by every request asking for the same data
+response_cache = ResponseCache(int(app_settings.RESPONSE_CACHE_MB * 1024 * 1024))
+
+
+def cached_json_response(etag: str, last_modified: Optional[float], build: Callable[[], Dict[str, Any]]) -> Response:
+    """Serve the JSON document ``build()`` returns, encoded and compressed once per ETag.
+
+    ``etag`` must cover everything the document depends on. The body is shared
+    by every request with the same ETag, so the request ID is sent in the
+    X-Request-ID header rather than in the body.
+    """
+    log_fields(response_cache='hit')
+
+    def build_logged() -> Dict[str, Any]:
+        log_fields(response_cache='miss')
+        return build()
+
+    with phase('serialize'):
+        body = response_cache.get_or_build(etag, build_logged)
+        response = encoded_response(body)
+    response.headers['X-Request-ID'] = g.request_id
+    # Compressed variants aren't byte-identical to the uncompressed body, so their validator is weak
+    return set_cache_validators(response, etag, last_modified, weak=response.content_encoding is not None)
+
 
 # ----- Home -----
 @app.route("/")
@@ -123,12 +239,72 @@ def tailor_orders():
 
 @app.route("/orders/fabric-tailor", methods=['GET', 'POST'])
 def fabric_tailor_orders():
-    if request.method == 'POST':
-        # Handle form submission here
-        # You can process the combined order data
-        # For now, we'll just return a success response
-        return jsonify({"success": True, "combinedId": "CT001"})
-    return render_template("orders/fabric_tailor.html")
+    """The combined fabric+tailoring order form; POST creates the order.
+
+    Request Body (JSON, also accepted as text/plain):
+        The order form fields: customer_name, contact, address, customer_type,
+        order_date, sessions, notes, fabric_order_id, fabric_price,
+        tailoring_order_id, tailoring_price, total_amount, paid_status and
+        master_order_id (assigned here when missing).
+
+    Returns:
+        201 with the order's IDs and sheet row once it is written to the
+        Combine Orders sheet, or 202 if it is still queued after
+        ORDER_COMMIT_TIMEOUT seconds (it will be written; resubmitting the
+        same master_order_id does not create a duplicate); 503 if
+        COMBINED_ORDERS_SHEETS_ID is not set
+    """
+    if request.method == 'GET':
+        return render_template("orders/fabric_tailor.html")
+
+    request_id = g.request_id
+    if not sheets_service.is_initialized():
+        logger.error(f"Google Sheets service is not initialized. Request {request_id}")
+        return jsonify({
+            'success': False,
+            'message': 'Google Sheets service is not initialized. Please try again in a few moments.',
+            'request_id': request_id
+        }), 503
+    if not sheets_service.combined_orders_configured():
+        logger.error(f"COMBINED_ORDERS_SHEETS_ID is not set; combined orders can't be saved. Request {request_id}")
+        return jsonify({
+            'success': False,
+            'message': 'Combined orders are not configured on the server. Please contact the administrator.',
+            'request_id': request_id
+        }), 503
+
+    data = request.get_json(force=True, silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'success': False, 'message': 'No JSON data received', 'request_id': request_id}), 400
+    if not str(data.get('customer_name') or '').strip():
+        return jsonify({'success': False, 'message': 'Customer name is required', 'request_id': request_id}), 400
+
+    try:
+        pending = sheets_service.create_combined_order(data)
+    except Exception as e:
+        logger.error(f"Request {request_id} - Error queueing combined order: {e}", exc_info=True)
+        return jsonify({
+            'success': False,
+            'message': 'Unable to save the order at this time. Please try again.',
+            'request_id': request_id
+        }), 500
+
+    order = pending.item
+    with phase('commit_wait'):
+        committed = pending.wait(ORDER_COMMIT_TIMEOUT)
+    log_fields(combined_order_id=order['combined_order_id'], committed=committed)
+    return jsonify({
+        'success': True,
+        'combinedId': order['combined_order_id'],
+        'masterOrderId': order['master_order_id'],
+        'fabricOrderId': order['fabric_order_id'],
+        'tailoringOrderId': order['tailoring_order_id'],
+        'row': pending.row,
+        'timestamp': order['timestamp'],
+        'queued': not committed,
+        'message': 'Order saved' if committed else 'Order queued; it will be saved shortly',
+        'request_id': request_id
+    }), 201 if committed else 202
 
 
 
@@ -192,8 +368,40 @@ def health_check():
     return jsonify({
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "ready": sheets_service.ready(),
+        "sheets_api": sheets_service.scheduler.stats()
     })
+
+
+# Readiness for load balancers: 503 until Sheets is connected and the orders snapshot is loaded
+@app.route("/health/ready")
+def readiness_check():
+    readiness = sheets_service.readiness()
+    return jsonify(readiness), 200 if readiness['ready'] else 503
+
+
+# Prometheus metrics, merged across gunicorn workers
+@app.route("/metrics")
+def prometheus_metrics():
+    rendered = metrics.render()
+    if rendered is None:
+        return jsonify({"error": "Metrics unavailable: prometheus_client is not installed"}), 503
+    body, content_type = rendered
+    return Response(body, content_type=content_type)
+
+
+# Profiles saved by request_profiling: the raw file, or a text report with ?format=text
+@app.route("/debug/profiles/<profile_id>")
+def get_request_profile(profile_id):
+    if not request_profiling.is_authorized(app_settings.PROFILE_TOKEN):
+        return jsonify({"error": "Not found"}), 404
+    path = request_profiling.profile_path(app_settings.PROFILE_DIR, profile_id)
+    if path is None:
+        return jsonify({"error": f"No profile {profile_id}"}), 404
+    if request.args.get('format') == 'text':
+        return Response(request_profiling.profile_summary(path), content_type='text/plain; charset=utf-8')
+    return send_from_directory(os.path.abspath(app_settings.PROFILE_DIR), os.path.basename(path), as_attachment=True)
     
     
 # ----- mesurments Interface -----
@@ -211,12 +419,21 @@ def api_get_orders():
         status (str): Filter by order status ('all', 'pending', 'in process', etc.)
         garment_type (str): Filter by garment type ('all', 'shirt', 'pants', etc.)
         search (str): Search term for customer name, address, or order ID
+        sort (str): Field to sort by, prefixed with '-' for descending order
+        limit (int): Page size; enables keyset pagination (sorted by order_id unless sort is given)
+        cursor (str): The next_cursor value from the previous page
+        fields (str): Comma-separated list of order fields to include
+        format (str): 'json' (default), 'stream' to send the same JSON document
+            with chunked encoding as orders are encoded, or 'ndjson' to stream
+            one order per line (metadata is sent in X-* headers)
         
     Returns:
-        JSON with orders data or error message
+        JSON with orders data or error message. 'total' counts every order
+        matching the filters, not just the returned page. The request ID is
+        sent in the X-Request-ID header.
     """
-    request_id = datetime.now().strftime("%Y%m%d%H%M%S%f")
-    logger.info(f"=== Starting /api/orders request {request_id} ===")
+    request_id = g.request_id
+    logger.debug("=== Starting /api/orders request %s ===", request_id)
     start_time = datetime.now()
     
     try:
@@ -235,44 +452,102 @@ def api_get_orders():
         garment_filter = request.args.get('garment_type', 'all')
         search_query = request.args.get('search', '')
         
-        logger.info(f"Request {request_id} - Processing filters: status={status_filter}, garment={garment_filter}, search='{search_query}'")
+        logger.debug("Request %s - Processing filters: status=%s, garment=%s, search='%s'",
+                     request_id, status_filter, garment_filter, search_query)
+
+        try:
+            query = parse_order_query(request.args)
+        except ValueError as query_error:
+            error_msg = str(query_error)
+            logger.warning("Request %s - %s", request_id, error_msg)
+            return jsonify({
+                'success': False,
+                'message': error_msg,
+                'request_id': request_id
+            }), 400
         
-        # Fetch all orders from Google Sheets with timeout handling
+        # Fetch all orders from the cached Google Sheets snapshot
         try:
-            orders = sheets_service.get_all_orders()
-            if not orders and isinstance(orders, list):
+            with phase('snapshot'):
+                snapshot = sheets_service.get_orders_snapshot()
+            if snapshot is None:
+                # Not "no orders": the sheet couldn't be read (e.g. over quota) and nothing is cached yet
+                logger.error(f"Request {request_id} - Orders could not be loaded from Google Sheets")
+                response = jsonify({
+                    'success': False,
+                    'message': 'Orders are temporarily unavailable. Please try again in a few moments.',
+                    'request_id': request_id
+                })
+                response.headers['Retry-After'] = '5'
+                return response, 503
+
+            if not len(snapshot.data):
                 logger.warning(f"Request {request_id} - No orders returned from Google Sheets")
                 return jsonify({
                     'success': True,
                     'orders': [],
                     'total': 0,
+                    'next_cursor': None,
                     'message': 'No orders found',
                     'request_id': request_id
                 })
             
-            logger.info(f"Request {request_id} - Retrieved {len(orders)} orders from Google Sheets")
-            
-            # Apply filters
-            filters = {
-                'status': status_filter,
-                'garment_type': garment_filter,
-                'search': search_query
-            }
+            index = snapshot.data
+            log_fields(snapshot_version=snapshot.version, orders=len(index))
+            logger.debug("Request %s - Retrieved %d orders from snapshot v%d", request_id, len(index), snapshot.version)
             
-            filtered_orders = sheets_service.apply_order_filters(orders, filters)
-            logger.info(f"Request {request_id} - Filtered to {len(filtered_orders)} orders")
+            # The ETag covers the orders returned, not per-request fields like request_id
+            etag = make_etag('orders', index.digest, status_filter.lower(),
+                             garment_filter.lower(), search_query.lower(), query)
+            not_modified = not_modified_response(etag, snapshot.created_at)
+            if not_modified is not None:
+                logger.debug("Request %s - Orders unchanged, returning 304", request_id)
+                return not_modified
             
-            # Calculate response time
-            response_time = (datetime.now() - start_time).total_seconds()
-            logger.info(f"Request {request_id} - Completed successfully in {response_time:.2f} seconds")
+            def select_page():
+                with phase('filter'):
+                    filtered = index.filter_positions(status_filter, garment_filter, search_query)
+                with phase('page'):
+                    page = page_orders(index.table, filtered, query)
+                log_fields(matched=len(filtered), returned=len(page.positions), output=query.output)
+                return filtered, page
+
+            if query.streaming:
+                filtered, page = select_page()
+                # Dicts are only built for the orders on this page
+                rows = index.table.iter_rows(page.positions, query.fields)
+                logger.debug("Request %s - Streaming %d orders as %s", request_id, len(page.positions), query.output)
+                trailer = {
+                    'total': len(filtered),
+                    'next_cursor': page.next_cursor,
+                    'request_id': request_id,
+                    'response_time': lambda: (datetime.now() - start_time).total_seconds()
+                }
+                response = app.response_class(
+                    stream_orders(rows, trailer, query.output == 'ndjson'),
+                    mimetype='application/x-ndjson' if query.output == 'ndjson' else 'application/json'
+                )
+                response.headers['X-Total-Count'] = str(len(filtered))
+                response.headers['X-Request-ID'] = request_id
+                if page.next_cursor:
+                    response.headers['X-Next-Cursor'] = page.next_cursor
+                response.headers['X-Accel-Buffering'] = 'no'  # Let nginx pass chunks straight through
+                return set_cache_validators(response, etag, snapshot.created_at)
             
-            return jsonify({
-                'success': True,
-                'orders': filtered_orders,
-                'total': len(filtered_orders),
-                'request_id': request_id,
-                'response_time': response_time
-            })
+            def build_page() -> Dict[str, Any]:
+                filtered, page = select_page()
+                return {
+                    'success': True,
+                    'orders': list(index.table.iter_rows(page.positions, query.fields)),
+                    'total': len(filtered),
+                    'next_cursor': page.next_cursor
+                }
+
+            # Identical requests against the same snapshot reuse the encoded (and compressed) body
+            response = cached_json_response(etag, snapshot.created_at, build_page)
+            logger.debug("Request %s - Completed successfully in %.2f seconds",
+                         request_id, (datetime.now() - start_time).total_seconds())
+            return response
             
         except Exception as sheet_error:
             error_msg = f"Error retrieving orders from Google Sheets: {str(sheet_error)}"
@@ -294,7 +569,134 @@ def api_get_orders():
             'error': error_msg
         }), 500
     finally:
-        logger.info(f"=== Completed /api/orders request {request_id} ===")
+        logger.debug("=== Completed /api/orders request %s ===", request_id)
+
+@app.route("/api/orders/events")
+def api_order_events():
+    """Server-Sent Events stream of changes to the orders.
+
+    Events:
+        ready: Sent first on a fresh connection; carries the current orders digest.
+        order_created: A new order (every order field).
+        order_status: An order's delivery status changed (order_id, delivery_status, previous_status).
+        order_deleted: An order was removed (order_id).
+        reset: The client missed changes that can't be replayed and should refetch /api/orders.
+
+    Each event's id is the orders digest after the change, so EventSource
+    clients resume where they left off via Last-Event-ID (also accepted as the
+    ``last_event_id`` query parameter). Streams end after
+    ORDER_EVENTS_STREAM_SECONDS and the browser reconnects on its own.
+    """
+    request_id = g.request_id
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id') or None
+    logger.debug("=== Starting /api/orders/events stream %s (Last-Event-ID: %s) ===", request_id, last_event_id)
+
+    if not sheets_service.is_initialized():
+        error_msg = "Google Sheets service is not initialized"
+        logger.error(f"{error_msg}. Request {request_id}")
+        return jsonify({
+            'success': False,
+            'message': f'{error_msg}. Please try again in a few moments or contact support if the issue persists.',
+            'request_id': request_id
+        }), 503
+
+    # Make sure the current snapshot is loaded (and recorded in the event log) before resuming
+    sheets_service.orders_digest()
+    events = sheets_service.order_events
+    # Generators run after the request context is gone; keep the log to record the event count
+    request_log = current_log()
+
+    def generate() -> Iterator[str]:
+        deadline = time.monotonic() + ORDER_EVENTS_STREAM_SECONDS
+        yield f"retry: {ORDER_EVENTS_RETRY_MS}\n\n"
+
+        after_seq, missed = events.resume(last_event_id)
+        current = events.current()
+        current_digest = current.digest if current is not None else None
+        if missed:
+            logger.debug("Request %s - Unknown Last-Event-ID, sending reset", request_id)
+            yield format_sse('reset', {'reason': 'unknown_last_event_id'}, current_digest)
+        elif last_event_id is None:
+            yield format_sse('ready', {'digest': current_digest}, current_digest)
+
+        sent = 0
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                batches, evicted = events.wait(after_seq, min(ORDER_EVENTS_HEARTBEAT_SECONDS, remaining))
+                if evicted:
+                    after_seq = batches[-1].seq
+                    yield format_sse('reset', {'reason': 'missed_changes'}, batches[-1].digest)
+                    continue
+                for batch in batches:
+                    for name, data in batch.events:
+                        yield format_sse(name, data, batch.digest)
+                        sent += 1
+                    if not batch.events:
+                        yield f"id: {batch.digest}\n\n"  # Keeps the client's Last-Event-ID current
+                    after_seq = batch.seq
+                if not batches:
+                    yield ": keep-alive\n\n"
+                    # Lets the snapshot refresh even when nothing else is requesting orders
+                    sheets_service.orders_digest()
+        finally:
+            if request_log is not None:
+                request_log.fields['events'] = sent
+            logger.debug("=== Completed /api/orders/events stream %s (%d events) ===", request_id, sent)
+
+    response = app.response_class(generate(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Let nginx pass events straight through
+    return response
+
+@app.route("/api/orders/<order_id>")
+def api_get_order(order_id: str):
+    """API endpoint to get one order by its exact Order ID.
+
+    The order is looked up in the ID index of the cached orders snapshot, so
+    the cost doesn't grow with the size of the Orders sheet.
+
+    Args:
+        order_id (str): The ID of the order
+
+    Returns:
+        JSON with the order, or 404 if no order has this ID
+    """
+    request_id = g.request_id
+    if not sheets_service.is_initialized():
+        logger.error(f"Google Sheets service is not initialized. Request {request_id}")
+        return jsonify({
+            'success': False,
+            'message': 'Google Sheets service is not initialized. Please try again in a few moments.',
+            'request_id': request_id
+        }), 503
+
+    with phase('snapshot'):
+        snapshot = sheets_service.get_orders_snapshot()
+    if snapshot is None:
+        logger.error(f"Request {request_id} - Orders could not be loaded from Google Sheets")
+        response = jsonify({
+            'success': False,
+            'message': 'Orders are temporarily unavailable. Please try again in a few moments.',
+            'request_id': request_id
+        })
+        response.headers['Retry-After'] = '5'
+        return response, 503
+
+    log_fields(snapshot_version=snapshot.version)
+    order = snapshot.data.get(order_id)
+    if order is None:
+        return jsonify({'success': False, 'message': f'Order {order_id} not found', 'request_id': request_id}), 404
+
+    etag = make_etag('order', order_id, order)
+    not_modified = not_modified_response(etag, snapshot.created_at)
+    if not_modified is not None:
+        return not_modified
+    response = jsonify({'success': True, 'order': order})
+    response.headers['X-Request-ID'] = request_id
+    return set_cache_validators(response, etag, snapshot.created_at)
 
 @app.route("/api/orders/<order_id>/measurements")
 def api_get_order_measurements(order_id: str):
@@ -306,8 +708,8 @@ def api_get_order_measurements(order_id: str):
     Returns:
         JSON with measurements data or error message
     """
-    request_id = datetime.now().strftime("%Y%m%d%H%M%S%f")
-    logger.info(f"=== Starting measurements request {request_id} for order {order_id} ===")
+    request_id = g.request_id
+    logger.debug("=== Starting measurements request %s for order %s ===", request_id, order_id)
     start_time = datetime.now()
     
     try:
@@ -323,28 +725,26 @@ def api_get_order_measurements(order_id: str):
         
         # Fetch measurements
         try:
-            logger.info(f"Request {request_id} - Fetching measurements for order {order_id}")
-            measurements = sheets_service.get_order_measurements(order_id)
+            logger.debug("Request %s - Fetching measurements for order %s", request_id, order_id)
+            with phase('measurements'):
+                measurements = sheets_service.get_order_measurements(order_id)
+
+            etag = make_etag('measurements', order_id, measurements)
+            last_modified = sheets_service.measurements_updated_at()
+            not_modified = not_modified_response(etag, last_modified)
+            if not_modified is not None:
+                logger.debug("Request %s - Measurements unchanged, returning 304", request_id)
+                return not_modified
             
+            document: Dict[str, Any] = {'success': True, 'measurements': measurements}
             if not any(measurements.values()):
-                logger.warning(f"Request {request_id} - No measurements found for order {order_id}")
-                return jsonify({
-                    'success': True,
-                    'measurements': measurements,
-                    'message': 'No measurements found for this order',
-                    'request_id': request_id
-                })
+                logger.info("Request %s - No measurements found for order %s", request_id, order_id)
+                document['message'] = 'No measurements found for this order'
             
-            # Calculate response time
-            response_time = (datetime.now() - start_time).total_seconds()
-            logger.info(f"Request {request_id} - Completed successfully in {response_time:.2f} seconds")
-            
-            return jsonify({
-                'success': True,
-                'measurements': measurements,
-                'request_id': request_id,
-                'response_time': response_time
-            })
+            response = cached_json_response(etag, last_modified, lambda: document)
+            logger.debug("Request %s - Completed successfully in %.2f seconds",
+                         request_id, (datetime.now() - start_time).total_seconds())
+            return response
             
         except Exception as sheet_error:
             error_msg = f"Error retrieving measurements: {str(sheet_error)}"
@@ -366,7 +766,42 @@ def api_get_order_measurements(order_id: str):
             'error': error_msg
         }), 500
     finally:
-        logger.info(f"=== Completed measurements request {request_id} ===")
+        logger.debug("=== Completed measurements request %s ===", request_id)
+
+@app.route("/api/dashboard/summary")
+def api_dashboard_summary():
+    """API endpoint for the dashboard's aggregates, kept up to date as orders change.
+
+    Returns:
+        JSON with revenue by month/season/festival, status and payment totals,
+        recent orders and worker payment totals
+    """
+    request_id = g.request_id
+    if not sheets_service.is_initialized():
+        logger.error(f"Google Sheets service is not initialized. Request {request_id}")
+        return jsonify({
+            'success': False,
+            'message': 'Google Sheets service is not initialized. Please try again in a few moments.',
+            'request_id': request_id
+        }), 503
+
+    with phase('summary'):
+        summary = sheets_service.get_dashboard_summary()
+    if summary is None:
+        return jsonify({
+            'success': False,
+            'message': 'Unable to load orders at this time. Please try again in a few moments.',
+            'request_id': request_id
+        }), 503
+
+    etag = make_etag('dashboard', summary)
+    last_modified = sheets_service.order_summary.updated_at
+    not_modified = not_modified_response(etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+    log_fields(snapshot_version=summary['version'])
+    return cached_json_response(etag, last_modified, lambda: {'success': True, 'summary': summary})
+
 
 @app.route("/api/orders/<order_id>/status", methods=['PUT'])
 def api_update_order_status(order_id: str):
@@ -381,7 +816,7 @@ def api_update_order_status(order_id: str):
     Returns:
         JSON with success/failure message
     """
-    request_id = datetime.now().strftime("%Y%m%d%H%M%S%f")
+    request_id = g.request_id
     logger.info(f"=== Starting status update request {request_id} for order {order_id} ===")
     start_time = datetime.now()
     
@@ -419,9 +854,8 @@ def api_update_order_status(order_id: str):
                 }), 400
             
             # Validate status value
-            valid_statuses = ['Pending', 'In Process', 'Ready', 'Delivered']
-            if new_status not in valid_statuses:
-                error_msg = f"Invalid status. Must be one of: {', '.join(valid_statuses)}"
+            if new_status not in VALID_STATUSES:
+                error_msg = f"Invalid status. Must be one of: {', '.join(VALID_STATUSES)}"
                 logger.error(f"Request {request_id} - {error_msg}")
                 return jsonify({
                     'success': False,
@@ -473,6 +907,133 @@ def api_update_order_status(order_id: str):
     finally:
         logger.info(f"=== Completed status update request {request_id} ===")
 
+@app.route("/api/orders/status", methods=['PUT'])
+def api_bulk_update_order_status():
+    """API endpoint to update the status of many orders at once.
+    
+    Request Body:
+        updates (list): Items of the form {"order_id": str, "status": str}.
+            A bare list of such items is accepted as well.
+        
+    Returns:
+        JSON with one result per item, in request order; all valid updates
+        are written to Google Sheets in a single batched request. When an
+        order appears more than once only its last item is applied, and the
+        earlier ones are marked superseded with that item's outcome
+    """
+    request_id = g.request_id
+    logger.info(f"=== Starting bulk status update request {request_id} ===")
+    start_time = datetime.now()
+    
+    try:
+        # Check sheets service initialization
+        if not sheets_service.is_initialized():
+            error_msg = "Google Sheets service is not initialized"
+            logger.error(f"{error_msg}. Request {request_id}")
+            return jsonify({
+                'success': False,
+                'message': f'{error_msg}. Please try again in a few moments.',
+                'request_id': request_id
+            }), 503
+        
+        data = request.get_json(silent=True)
+        items = data.get('updates') if isinstance(data, dict) else data
+        if not isinstance(items, list) or not items:
+            error_msg = "A non-empty list of updates is required"
+            logger.error(f"Request {request_id} - {error_msg}")
+            return jsonify({
+                'success': False,
+                'message': error_msg,
+                'request_id': request_id
+            }), 400
+        
+        if len(items) > MAX_BULK_STATUS_UPDATES:
+            error_msg = f"Too many updates. At most {MAX_BULK_STATUS_UPDATES} orders can be updated at once"
+            logger.error(f"Request {request_id} - {error_msg}")
+            return jsonify({
+                'success': False,
+                'message': error_msg,
+                'request_id': request_id
+            }), 400
+        
+        # Validate each item; the last item given for an order wins
+        parsed = []
+        last_index = {}
+        for index, item in enumerate(items):
+            order_id = str(item.get('order_id') or '') if isinstance(item, dict) else ''
+            new_status = item.get('status') if isinstance(item, dict) else None
+            parsed.append((order_id, new_status))
+            if order_id:
+                last_index[order_id] = index
+        
+        results = [None] * len(items)
+        updates = {}
+        for index, (order_id, new_status) in enumerate(parsed):
+            if not order_id:
+                results[index] = {'order_id': order_id, 'success': False, 'message': 'Order ID is required'}
+            elif last_index[order_id] != index:
+                continue  # Superseded; filled in from the winning item below
+            elif new_status not in VALID_STATUSES:
+                results[index] = {
+                    'order_id': order_id,
+                    'success': False,
+                    'message': f"Invalid status. Must be one of: {', '.join(VALID_STATUSES)}"
+                }
+            else:
+                updates[order_id] = new_status
+        
+        if updates:
+            logger.info(f"Request {request_id} - Updating status of {len(updates)} orders")
+            updated = sheets_service.update_order_statuses(updates)
+            for order_id, new_status in updates.items():
+                if updated.get(order_id):
+                    result = {'order_id': order_id, 'success': True, 'status': new_status}
+                else:
+                    result = {
+                        'order_id': order_id,
+                        'success': False,
+                        'message': 'Order not found or could not be updated'
+                    }
+                results[last_index[order_id]] = result
+        
+        superseded_count = 0
+        for index, (order_id, _) in enumerate(parsed):
+            if results[index] is None:
+                winner = results[last_index[order_id]]
+                results[index] = {
+                    'order_id': order_id,
+                    'success': winner['success'],
+                    'superseded': True,
+                    'message': f"Superseded by item {last_index[order_id]} for the same order"
+                }
+                superseded_count += 1
+        
+        applied = [result for result in results if not result.get('superseded')]
+        updated_count = sum(1 for result in applied if result['success'])
+        response_time = (datetime.now() - start_time).total_seconds()
+        logger.info(f"Request {request_id} - Updated {updated_count}/{len(applied)} orders in {response_time:.2f} seconds")
+        return jsonify({
+            'success': updated_count == len(applied),
+            'results': results,
+            'updated': updated_count,
+            'failed': len(applied) - updated_count,
+            'superseded': superseded_count,
+            'request_id': request_id,
+            'response_time': response_time
+        })
+            
+    except Exception as e:
+        error_msg = f"Unexpected error processing request: {str(e)}"
+        logger.error(f"Request {request_id} - {error_msg}", exc_info=True)
+        return jsonify({
+            'success': False,
+            'message': 'An unexpected error occurred. Please try again.',
+            'request_id': request_id,
+            'error': error_msg
+        }), 500
+    finally:
+        logger.info(f"=== Completed bulk status update request {request_id} ===")
+
 @app.route("/tailor-interface/<order_id>")
 def tailor_order_details(order_id: str):
     """Detailed view for a specific order.
@@ -499,12 +1060,7 @@ if __name__ == "__main__":
     logger.info(f"Debug mode: {debug}")
     logger.info(f"Environment: {os.getenv('FLASK_ENV', 'development')}")
     
-    try:
-        # Verify sheets service initialization
-        if not sheets_service.is_initialized():
-            logger.warning("Google Sheets service failed to initialize. Some features may be unavailable.")
-            logger.info("Check GOOGLE_SERVICE_ACCOUNT_FILE environment variable or set MOCK_SHEETS=1 for development")
-    except Exception as e:
-        logger.error(f"Error checking sheets service: {e}", exc_info=True)
+    # Sheets connects in the background; /health/ready reports when it is done
+    logger.info("Google Sheets warm-up running in the background; see /health/ready")
     
-    app.run(host=host, port=port, debug=debug)
+    app.run(host=host, port=port, debug=debug, threaded=True)
@@ -9,6 +9,20 @@ mkdir -p static/icons
 # Set default environment if not specified
 export FLASK_ENV=${FLASK_ENV:-production}
 
+# Worker processes; the Google Sheets API quota is split between them
+export WORKERS=${WORKERS:-4}
+
+# Request threads per worker, so requests waiting on Google Sheets don't queue behind each other
+export WORKER_THREADS=${WORKER_THREADS:-16}
+
+# Refresh sheet data in the background so requests never wait on Google Sheets
+export SHEETS_SYNC_INTERVAL=${SHEETS_SYNC_INTERVAL:-15}
+
+# Workers write metrics to files here for /metrics to merge; clear out files left by a previous run
+export PROMETHEUS_MULTIPROC_DIR=${PROMETHEUS_MULTIPROC_DIR:-/tmp/shop-metrics}
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
 # If no LOG_FILE is set and we're in production, use console logging
 if [ "$FLASK_ENV" = "production" ] && [ -z "$LOG_FILE" ]; then
     echo "Using console logging for production environment"
@@ -16,4 +30,4 @@ fi
 
 # Start the application
 echo "Starting Shop Manager..."
-exec gunicorn --bind 0.0.0.0:${PORT:-5000} --workers ${WORKERS:-4} --timeout 120 shop:app
+exec gunicorn --config gunicorn.conf.py shop:app
@@ -8,28 +8,30 @@
                 id: '1tFb4EBzzvdmDNY0bOtyTXAhX1aRqzfq7NzXLhDqYj0o',
                 sheetName: 'Fabric Orders'
             },
-            tailoringOrders: {
-                id: '128vwp1tjsej9itNAkQY1Y-5sJsMv3N1TZi5Pl9Wgn6Y',
-                sheets: ['Orders', 'Shirts', 'Pants', 'Others']
-            },
             expenses: {
                 id: '1QD0FHcJl7og1Fc1_BdQG2BCQq-N7KIr49jw3whzarXc',
                 sheets: ['Fabric_Expense', 'Other_Expense']
             },
+            // Read here only when the server doesn't summarize them (WORKERS_SHEETS_ID unset)
             workers: {
                 id: '1msVf01VuWsk1mhSMVrvypq_7ubSVjDKlr8aG-6bqE7Q',
                 sheets: ['Worker_List', 'Payment_Daily_Entry']
             }
         };
 
+        // Tailoring orders and worker payments are aggregated by the server
+        const SUMMARY_URL = '/api/dashboard/summary';
+
+        // Worker payment entries listed under recent activities (as RECENT_PAYMENTS in dashboard_summary.py)
+        const RECENT_PAYMENTS = 5;
+
         let API_KEY = '';
         let dashboardData = {
             combinedOrders: [],
             fabricOrders: [],
-            tailoringOrders: [],
             expenses: { fabric: [], other: [] },
-            workers: [],
-            payments: []
+            summary: null,
+            workerPayments: null
         };
 
         // Chart instances
@@ -41,11 +43,11 @@
             const storedKey = localStorage.getItem('googleSheetsApiKey');
             if (storedKey) {
                 API_KEY = storedKey;
-                loadDashboardData();
             } else {
                 // No automatic setup popup - user can manually open via Setup API button
-                console.log('No API key found. Use Setup API button to configure.');
+                console.log('No API key found. Use Setup API button to add fabric, combined order, expense and worker data.');
             }
+            loadDashboardData();
         });
 
         // Setup Functions
@@ -85,30 +87,25 @@
 
         // Data Loading Functions
         async function loadDashboardData() {
-            if (!API_KEY) {
-                openSetup();
-                return;
-            }
-
             try {
                 showLoadingStates();
                 
-                // Load all data in parallel
-                await Promise.all([
-                    loadCombinedOrders(),
-                    loadFabricOrders(),
-                    loadTailoringOrders(),
-                    loadExpenses(),
-                    loadWorkers(),
-                    loadPayments()
-                ]);
+                // Load all data in parallel; the sheets read with the API key are optional
+                const loads = [loadSummary()];
+                if (API_KEY) {
+                    loads.push(loadCombinedOrders(), loadFabricOrders(), loadExpenses());
+                }
+                await Promise.all(loads);
+                if (API_KEY && !(dashboardData.summary && dashboardData.summary.worker_payments)) {
+                    await loadWorkerPayments();
+                }
                 
                 updateDashboard();
                 hideLoadingStates();
             } catch (error) {
                 console.error('Error loading dashboard data:', error);
                 hideLoadingStates();
-                alert('Error loading data. Please check your API key and sheet permissions.');
+                alert('Error loading data. Please check your connection, API key and sheet permissions.');
             }
         }
 
@@ -141,17 +138,52 @@
             }
         }
 
-        async function loadTailoringOrders() {
+        async function loadSummary() {
+            try {
+                // Revalidated with the ETag, so an unchanged summary costs a 304
+                const response = await fetch(SUMMARY_URL, { cache: 'no-cache' });
+                if (!response.ok) {
+                    throw new Error(`Failed to fetch dashboard summary: ${response.statusText}`);
+                }
+                const result = await response.json();
+                dashboardData.summary = result.summary;
+            } catch (error) {
+                console.error('Error loading dashboard summary:', error);
+                dashboardData.summary = null;
+            }
+        }
+
+        async function loadWorkerPayments() {
             try {
-                const data = await fetchSheetData(SHEET_CONFIG.tailoringOrders.id, 'Orders');
-                dashboardData.tailoringOrders = parseSheetData(data, [
-                    'Order ID', 'Customer Name', 'Contact Info', 'Address', 'Customer Type',
-                    'Garment Types', 'Order Date', 'Delivery Date', 'Delivery Status',
-                    'Price', 'Payment Status', 'Season', 'Festival', 'Notes', 'Created At'
+                const [workerData, paymentData] = await Promise.all([
+                    fetchSheetData(SHEET_CONFIG.workers.id, 'Worker_List'),
+                    fetchSheetData(SHEET_CONFIG.workers.id, 'Payment_Daily_Entry')
                 ]);
+                const workers = parseSheetData(workerData, ['Name', 'Phone', 'Address', 'Date Added']);
+                const payments = parseSheetData(paymentData, [
+                    'Date', 'Worker Name', 'Paint Count', 'Shirt Count', 'Total Work Amount',
+                    'Advance Taken', 'Remaining Payment', 'Notes'
+                ]).filter(payment => payment['Worker Name']);
+
+                // Same shape as the server's worker_payments summary
+                const total = field => payments.reduce((sum, payment) => sum + (parseFloat(payment[field]) || 0), 0);
+                dashboardData.workerPayments = {
+                    workers: workers.length,
+                    totals: {
+                        count: payments.length,
+                        work_amount: total('Total Work Amount'),
+                        advance_taken: total('Advance Taken'),
+                        remaining_payment: total('Remaining Payment')
+                    },
+                    recent_payments: payments.slice(-RECENT_PAYMENTS).reverse().map(payment => ({
+                        date: payment['Date'],
+                        worker_name: payment['Worker Name'],
+                        work_amount: parseFloat(payment['Total Work Amount']) || 0
+                    }))
+                };
             } catch (error) {
-                console.error('Error loading tailoring orders:', error);
-                dashboardData.tailoringOrders = [];
+                console.error('Error loading worker payments:', error);
+                dashboardData.workerPayments = null;
             }
         }
 
@@ -176,31 +208,6 @@
             }
         }
 
-        async function loadWorkers() {
-            try {
-                const data = await fetchSheetData(SHEET_CONFIG.workers.id, 'Worker_List');
-                dashboardData.workers = parseSheetData(data, [
-                    'Name', 'Phone', 'Address', 'Date Added'
-                ]);
-            } catch (error) {
-                console.error('Error loading workers:', error);
-                dashboardData.workers = [];
-            }
-        }
-
-        async function loadPayments() {
-            try {
-                const data = await fetchSheetData(SHEET_CONFIG.workers.id, 'Payment_Daily_Entry');
-                dashboardData.payments = parseSheetData(data, [
-                    'Date', 'Worker Name', 'Paint Count', 'Shirt Count', 'Total Work Amount',
-                    'Advance Taken', 'Remaining Payment', 'Notes'
-                ]);
-            } catch (error) {
-                console.error('Error loading payments:', error);
-                dashboardData.payments = [];
-            }
-        }
-
         // Helper Functions
         async function fetchSheetData(sheetId, sheetName) {
             const url = `https://sheets.googleapis.com/v4/spreadsheets/${sheetId}/values/${encodeURIComponent(sheetName)}?key=${API_KEY}`;
@@ -227,6 +234,14 @@
             });
         }
 
+        function summaryOrders() {
+            return (dashboardData.summary && dashboardData.summary.orders) || { count: 0, revenue: 0 };
+        }
+
+        function summaryWorkerPayments() {
+            return (dashboardData.summary && dashboardData.summary.worker_payments) || dashboardData.workerPayments;
+        }
+
         function updateDashboard() {
             updateKPIs();
             updateCharts();
@@ -246,8 +261,7 @@
                 sum + (parseFloat(order['Fabric Total']) || 0), 0);
             
             // Tailoring orders
-            totalRevenue += dashboardData.tailoringOrders.reduce((sum, order) => 
-                sum + (parseFloat(order['Price']) || 0), 0);
+            totalRevenue += summaryOrders().revenue;
             
             // Calculate total expenses
             let totalExpenses = 0;
@@ -261,18 +275,18 @@
                 sum + (parseFloat(expense['Amount']) || 0), 0);
             
             // Worker payments
-            totalExpenses += dashboardData.payments.reduce((sum, payment) => 
-                sum + (parseFloat(payment['Total Work Amount']) || 0), 0);
+            const workerPayments = summaryWorkerPayments();
+            totalExpenses += workerPayments ? workerPayments.totals.work_amount : 0;
             
             // Update DOM elements
             document.getElementById('totalRevenue').textContent = `₹${totalRevenue.toLocaleString()}`;
             
             const totalOrders = dashboardData.combinedOrders.length + 
                                dashboardData.fabricOrders.length + 
-                               dashboardData.tailoringOrders.length;
+                               summaryOrders().count;
             document.getElementById('totalOrders').textContent = totalOrders;
             
-            document.getElementById('totalWorkers').textContent = dashboardData.workers.length;
+            document.getElementById('totalWorkers').textContent = workerPayments ? workerPayments.workers : '—';
             
             const monthlyProfit = totalRevenue - totalExpenses;
             document.getElementById('monthlyProfit').textContent = `₹${monthlyProfit.toLocaleString()}`;
@@ -302,8 +316,7 @@
                 sum + (parseFloat(order['Total Amount']) || 0), 0);
             const fabricRevenue = dashboardData.fabricOrders.reduce((sum, order) => 
                 sum + (parseFloat(order['Fabric Total']) || 0), 0);
-            const tailoringRevenue = dashboardData.tailoringOrders.reduce((sum, order) => 
-                sum + (parseFloat(order['Price']) || 0), 0);
+            const tailoringRevenue = summaryOrders().revenue;
             
             if (charts.revenue) charts.revenue.destroy();
             charts.revenue = new Chart(ctx, {
@@ -364,13 +377,14 @@
                 }
             });
             
-            // Add tailoring orders
-            dashboardData.tailoringOrders.forEach(order => {
-                const orderDate = new Date(order['Order Date'] || order['Created At']);
-                if (!isNaN(orderDate)) {
-                    const monthKey = orderDate.toLocaleDateString('en-US', { month: 'short', year: '2-digit' });
+            // Add tailoring orders, summed per 'YYYY-MM' month by the server
+            const tailoringByMonth = (dashboardData.summary && dashboardData.summary.revenue_by_month) || {};
+            Object.entries(tailoringByMonth).forEach(([month, totals]) => {
+                const [year, monthNumber] = month.split('-').map(Number);
+                if (year && monthNumber) {
+                    const monthKey = new Date(year, monthNumber - 1, 1).toLocaleDateString('en-US', { month: 'short', year: '2-digit' });
                     if (monthlyData.hasOwnProperty(monthKey)) {
-                        monthlyData[monthKey] += parseFloat(order['Price']) || 0;
+                        monthlyData[monthKey] += totals.revenue;
                     }
                 }
             });
@@ -423,8 +437,7 @@
             
             const allOrders = [
                 ...dashboardData.combinedOrders,
-                ...dashboardData.fabricOrders,
-                ...dashboardData.tailoringOrders
+                ...dashboardData.fabricOrders
             ];
             
             allOrders.forEach(order => {
@@ -438,6 +451,12 @@
                 }
             });
             
+            // Tailoring orders, counted by the server with the same rules
+            const tailoringPayments = (dashboardData.summary && dashboardData.summary.payment_status) || {};
+            paid += tailoringPayments.paid ? tailoringPayments.paid.count : 0;
+            partial += tailoringPayments.partial ? tailoringPayments.partial.count : 0;
+            unpaid += tailoringPayments.unpaid ? tailoringPayments.unpaid.count : 0;
+            
             if (charts.payment) charts.payment.destroy();
             charts.payment = new Chart(ctx, {
                 type: 'pie',
@@ -468,8 +487,8 @@
                 sum + (parseFloat(expense['Total Price']) || 0), 0);
             const otherExpenses = dashboardData.expenses.other.reduce((sum, expense) => 
                 sum + (parseFloat(expense['Amount']) || 0), 0);
-            const workerPayments = dashboardData.payments.reduce((sum, payment) => 
-                sum + (parseFloat(payment['Total Work Amount']) || 0), 0);
+            const workerPaymentSummary = summaryWorkerPayments();
+            const workerPayments = workerPaymentSummary ? workerPaymentSummary.totals.work_amount : 0;
             
             if (charts.expense) charts.expense.destroy();
             charts.expense = new Chart(ctx, {
@@ -533,14 +552,14 @@
                 });
             });
             
-            // Add tailoring orders
-            dashboardData.tailoringOrders.forEach(order => {
+            // Add the most recent tailoring orders
+            ((dashboardData.summary && dashboardData.summary.recent_orders) || []).forEach(order => {
                 allOrders.push({
                     type: 'Tailoring Order',
-                    customer: order['Customer Name'],
-                    amount: parseFloat(order['Price']) || 0,
-                    status: order['Payment Status'],
-                    date: new Date(order['Created At'] || order['Order Date'])
+                    customer: order.customer_name,
+                    amount: order.price || 0,
+                    status: order.payment_status,
+                    date: new Date(order.created_at || order.order_date)
                 });
             });
             
@@ -562,16 +581,17 @@
             });
             
             // Add recent worker payments
-            dashboardData.payments.slice(0, 5).forEach(payment => {
-                const amount = parseFloat(payment['Total Work Amount']) || 0;
-                if (payment['Worker Name'] && amount > 0) {
+            const workerPaymentSummary = summaryWorkerPayments();
+            (workerPaymentSummary ? workerPaymentSummary.recent_payments : []).forEach(payment => {
+                const amount = payment.work_amount || 0;
+                if (payment.worker_name && amount > 0) {
                     activities.push({
                         type: 'Worker Payment',
-                        customer: payment['Worker Name'],
+                        customer: payment.worker_name,
                         amount: amount,
                         status: 'Paid',
                         statusClass: 'paid',
-                        date: payment['Date'] || 'N/A'
+                        date: payment.date || 'N/A'
                     });
                 }
             });
@@ -665,9 +685,7 @@
 
         // Auto-refresh every 5 minutes
         setInterval(() => {
-            if (API_KEY) {
-                loadDashboardData();
-            }
+            loadDashboardData();
         }, 5 * 60 * 1000);
 
         // Handle window resize for charts
@@ -1,10 +1,10 @@
 // ============= CONFIGURATION =============
-        // Google Apps Script URL for saving combined orders
-        const GOOGLE_SCRIPT_URL = 'https://script.google.com/macros/s/AKfycbwFsxqgYxfi5nXNMo9hiRVhzyYtFuQaexV_mVwt8Mdk9Veb1_mUkJR3fg7CNvZk_L7x/exec';
-        
         // Base URL for navigation
         const BASE_URL = window.location.origin;
         
+        // Combined orders are saved by the app, which appends them to Google Sheets in batches
+        const SAVE_URL = `${BASE_URL}/orders/fabric-tailor`;
+        
         // Get URL parameters for returned order data
         const urlParams = new URLSearchParams(window.location.search);
         
@@ -523,16 +523,16 @@ if (typeof saveCombinedOrder === 'function') {
                 timestamp: new Date().toISOString()
             };
             
-            // Submit to Google Sheets
-            fetch(GOOGLE_SCRIPT_URL, {
+            // Submit to the app; resubmitting the same master_order_id never creates a duplicate
+            fetch(SAVE_URL, {
                 method: 'POST',
                 headers: {
-                    'Content-Type': 'text/plain', // Use text/plain to avoid CORS preflight
+                    'Content-Type': 'application/json',
                 },
                 body: JSON.stringify(combinedOrderData)
             })
             .then(response => {
-                // Read body as text first so we can handle malformed JSON from Apps Script
+                // Read body as text first so we can handle non-JSON error pages
                 return response.text().then(text => ({ ok: response.ok, status: response.status, text }));
             })
             .then(resp => {
@@ -541,9 +541,9 @@ if (typeof saveCombinedOrder === 'function') {
                 try {
                     data = JSON.parse(resp.text);
                 } catch (parseErr) {
-                    // If parsing fails but HTTP was OK, assume Apps Script received data and wrote to sheet
+                    // If parsing fails but HTTP was OK, assume the order was received
                     if (resp.ok) {
-                        console.warn('Apps Script returned non-JSON response — treating as success:', parseErr, resp.text);
+                        console.warn('Server returned non-JSON response — treating as success:', parseErr, resp.text);
                         data = { success: true, _note: 'non-json-response', raw: resp.text };
                     } else {
                         throw new Error(`HTTP ${resp.status} and non-JSON response`);
@@ -551,10 +551,13 @@ if (typeof saveCombinedOrder === 'function') {
                 }
 
                 if (data && data.success) {
-                    const masterOrderId = linkedIds.master;
+                    const masterOrderId = data.masterOrderId || linkedIds.master;
                     const combinedOrderId = data.combinedId || linkedIds.combined;
+                    const savedMessage = data.queued
+                        ? '🎉 Combined order received! It will appear in Google Sheets shortly.'
+                        : '🎉 Combined order saved successfully to Google Sheets!';
 
-                    showMessage(`🎉 Combined order saved successfully to Google Sheets!\n\n` +
+                    showMessage(`${savedMessage}\n\n` +
                                `📋 Master Order ID: ${masterOrderId}\n` +
                                `🧵 Combined Order ID: ${combinedOrderId}\n` +
                                `👕 Fabric Order ID: ${linkedIds.fabric}\n` +
@@ -575,15 +578,8 @@ if (typeof saveCombinedOrder === 'function') {
                             document.getElementById('combinedForm').style.pointerEvents = 'none';
                         }
                     }, 2000);
-                } else if (data && data.success === false && typeof data.error === 'string' && data.error.includes('Unexpected token')) {
-                    // Known Apps Script JSON parse error: sheet was likely updated but script couldn't return JSON.
-                    console.warn('Apps Script returned parse error but data may have been saved:', data.error);
-                    showMessage('Combined order likely saved to Google Sheets, but the server returned a parse error. Please verify your sheet.\nProceeding as saved.', 'warning');
-                    sessionStorage.removeItem('combinedOrderData');
-                    sessionStorage.removeItem('combinedOrderAddress');
-                    setTimeout(() => { clearForm(); }, 1500);
                 } else {
-                    throw new Error((data && (data.error || data.message)) || 'Unknown error from Google Sheets');
+                    throw new Error((data && (data.message || data.error)) || 'Unknown error from Google Sheets');
                 }
             })
             .catch(error => {
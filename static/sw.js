@@ -84,6 +84,11 @@ self.addEventListener('fetch', (event) => {
     return;
   }
 
+  // Skip Server-Sent Events streams - they must reach the network and never be cached
+  if (request.headers.get('Accept') === 'text/event-stream') {
+    return;
+  }
+
   // Google Sheets API requests - Network First with offline fallback
   if (url.hostname.includes('sheets.googleapis.com')) {
     event.respondWith(networkFirstWithOfflineNotification(request));
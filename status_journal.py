@@ -0,0 +1,155 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS status_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    order_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    journaled_at REAL NOT NULL,
+    flushed_at REAL
+);
+CREATE INDEX IF NOT EXISTS status_changes_pending ON status_changes (flushed_at, seq);
+CREATE TABLE IF NOT EXISTS flush_lease (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    owner INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+class StatusJournal:
+    """Durable local log of order status changes waiting to be written to Google Sheets.
+
+    :meth:`append` commits changes to a SQLite database in WAL mode with
+    ``synchronous=FULL``, so they are fsync'd to disk before it returns and
+    survive a crash or restart. A flusher reads :meth:`pending` (only the
+    latest status of each order, however many changes were journaled), writes
+    it to the sheets and calls :meth:`mark_flushed`; writing a status is
+    idempotent, so a flush interrupted before being marked is simply repeated.
+
+    The file is shared by every worker process pointing at it. Only the holder
+    of the flush lease (see :meth:`claim_flush`) flushes, so changes to an
+    order are never written out of order by two processes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._connection = self._connect()
+        self._connection.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=FULL')
+        return conn
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        if self._pid != os.getpid():
+            # Forked (e.g. a gunicorn worker of a preloaded app): SQLite connections can't be shared across processes
+            self._connection = self._connect()
+            self._pid = os.getpid()
+        return self._connection
+
+    def append(self, updates: Dict[str, str]) -> int:
+        """Durably record new statuses keyed by order ID; returns the sequence number of the last one."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.executemany(
+                    'INSERT INTO status_changes (order_id, status, journaled_at) VALUES (?, ?, ?)',
+                    [(order_id, status, now) for order_id, status in updates.items()]
+                )
+                seq = self._conn.execute('SELECT MAX(seq) FROM status_changes').fetchone()[0]
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+        return seq
+
+    def pending(self) -> Tuple[int, Dict[str, str]]:
+        """The latest unflushed status of each order, and the sequence number they run up to (0 if none)."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT order_id, status, seq FROM status_changes WHERE flushed_at IS NULL ORDER BY seq'
+            ).fetchall()
+        # Later changes to an order overwrite earlier ones
+        statuses = {order_id: status for order_id, status, _ in rows}
+        return (rows[-1][2] if rows else 0), statuses
+
+    def checkpoint(self) -> int:
+        """Sequence number from which changes may not be in a sheet read starting now (see :meth:`latest_since`)."""
+        with self._lock:
+            oldest_pending = self._conn.execute('SELECT MIN(seq) FROM status_changes WHERE flushed_at IS NULL').fetchone()[0]
+            if oldest_pending is not None:
+                return oldest_pending
+            last = self._conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'status_changes'").fetchone()
+            return (last[0] if last is not None else 0) + 1
+
+    def latest_since(self, seq: int) -> Dict[str, str]:
+        """The latest status of each order changed at or after ``seq``, whether flushed since or not.
+
+        A loader takes a :meth:`checkpoint` before reading the sheets and
+        applies these afterwards: a change flushed while it was reading may or
+        may not be in the values read, but is the order's current status either way.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT order_id, status FROM status_changes WHERE seq >= ? ORDER BY seq', (seq,)
+            ).fetchall()
+        return dict(rows)
+
+    def pending_count(self) -> int:
+        """Journaled changes not yet flushed."""
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM status_changes WHERE flushed_at IS NULL').fetchone()[0]
+
+    def mark_flushed(self, through_seq: int) -> int:
+        """Mark every change up to ``through_seq`` as written to the sheets; returns how many were pending."""
+        with self._lock:
+            cursor = self._conn.execute(
+                'UPDATE status_changes SET flushed_at = ? WHERE flushed_at IS NULL AND seq <= ?',
+                (time.time(), through_seq)
+            )
+            return cursor.rowcount
+
+    def purge(self, flushed_before: float) -> int:
+        """Delete changes flushed before ``flushed_before`` (wall-clock time); returns how many."""
+        with self._lock:
+            cursor = self._conn.execute('DELETE FROM status_changes WHERE flushed_at < ?', (flushed_before,))
+            return cursor.rowcount
+
+    def claim_flush(self, lease: float) -> bool:
+        """Take or renew the flush lease for ``lease`` seconds, unless another live process holds it."""
+        now = time.time()
+        owner = os.getpid()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                found = self._conn.execute('SELECT owner, expires_at FROM flush_lease WHERE id = 1').fetchone()
+                claimed = found is None or found[0] == owner or found[1] <= now
+                if claimed:
+                    self._conn.execute('INSERT OR REPLACE INTO flush_lease (id, owner, expires_at) VALUES (1, ?, ?)',
+                                       (owner, now + lease))
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+        return claimed
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
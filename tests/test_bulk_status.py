@@ -0,0 +1,34 @@
+import pytest
+
+import shop
+from fake_sheets import FakeSpreadsheet
+
+
+@pytest.fixture
+def order_ids():
+    shop.sheets_service.use_spreadsheet(FakeSpreadsheet.generate(20))
+    return shop.sheets_service.get_orders_snapshot().data.table.order_ids
+
+
+def test_results_follow_request_order(order_ids):
+    items = [
+        {'order_id': order_ids[0], 'status': 'Nope'},
+        {'order_id': order_ids[1], 'status': 'Ready'},
+        {},
+        {'order_id': order_ids[0], 'status': 'Delivered'},
+        {'order_id': 'MISSING', 'status': 'Ready'},
+        {'order_id': order_ids[1], 'status': 'Bogus'},
+    ]
+    response = shop.app.test_client().put('/api/orders/status', json={'updates': items})
+    body = response.get_json()
+    results = body['results']
+
+    assert [result['order_id'] for result in results] == [item.get('order_id', '') for item in items]
+    assert results[0] == {'order_id': order_ids[0], 'success': True, 'superseded': True,
+                          'message': 'Superseded by item 3 for the same order'}
+    assert results[1]['superseded'] and not results[1]['success']
+    assert not results[2]['success']
+    assert results[3] == {'order_id': order_ids[0], 'success': True, 'status': 'Delivered'}
+    assert not results[4]['success']
+    assert not results[5]['success'] and 'superseded' not in results[5]
+    assert (body['updated'], body['failed'], body['superseded']) == (1, 3, 2)
@@ -0,0 +1,23 @@
+from order_table import FIELDS, OrderTable
+
+
+def make_orders(count):
+    return [
+        {field: float(i) if field == 'price' else f"{field}{i % 3 if field == 'delivery_status' else i}" for field in FIELDS}
+        for i in range(count)
+    ]
+
+
+def test_patched_digest_matches_table_built_from_same_values():
+    orders = make_orders(20)
+    table = OrderTable.from_orders(orders)
+    first = {'order_id1': 'Ready', 'order_id4': 'delivery_status0'}
+    second = {'order_id1': 'delivery_status2', 'order_id7': 'Delivered'}
+
+    patched = table.with_statuses(first).with_statuses(second)
+    for order in orders:
+        order['delivery_status'] = second.get(order['order_id'], first.get(order['order_id'], order['delivery_status']))
+
+    assert patched.digest == OrderTable.from_orders(orders).digest
+    assert patched.digest == table.with_statuses({**first, **second}).digest
+    assert patched.digest != table.digest
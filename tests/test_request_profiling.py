@@ -0,0 +1,17 @@
+import request_profiling
+
+
+def test_profile_ids_are_unique_for_the_same_request_id():
+    request_id = '20261017070645147936'
+    first = request_profiling.new_profile_id(request_id)
+    second = request_profiling.new_profile_id(request_id)
+    assert first != second
+    assert first.startswith(request_id + '-')
+
+
+def test_profile_path_accepts_only_profile_ids(tmp_path):
+    profile_id = request_profiling.new_profile_id('20261017070645147936')
+    (tmp_path / (profile_id + '.pstats')).write_bytes(b'')
+    assert request_profiling.profile_path(str(tmp_path), profile_id) == str(tmp_path / (profile_id + '.pstats'))
+    assert request_profiling.profile_path(str(tmp_path), '20261017070645147936') is None
+    assert request_profiling.profile_path(str(tmp_path), '../' + profile_id) is None
@@ -0,0 +1,76 @@
+import pytest
+
+from fake_sheets import FakeSpreadsheet
+from google_sheets_service import GoogleSheetsService
+from status_journal import StatusJournal
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = GoogleSheetsService()
+    service.use_spreadsheet(FakeSpreadsheet.generate(50))
+    service.status_journal = StatusJournal(str(tmp_path / 'status_journal.db'))
+    yield service
+    service.status_journal.close()
+
+
+def flush_during_next_read(service):
+    """Make the next sheet read return values from before a journal flush that completes while it is in flight."""
+    read_sheets = service._read_sheets
+
+    def read_then_flush(sheet_names):
+        values = read_sheets(sheet_names)
+        assert service.flush_status_journal() == 1
+        service._read_sheets = read_sheets
+        return values
+
+    service._read_sheets = read_then_flush
+
+
+def other_status(status):
+    return 'Ready' if status != 'Ready' else 'Pending'
+
+
+def test_orders_reload_keeps_change_flushed_during_read(service):
+    order = service.get_orders_snapshot().data.table.row(0)
+    new_status = other_status(order['delivery_status'])
+    assert service.update_order_statuses({order['order_id']: new_status}) == {order['order_id']: True}
+    assert service.status_journal.pending_count() == 1
+
+    flush_during_next_read(service)
+    service.invalidate_orders_cache()
+    snapshot = service.get_orders_snapshot()
+
+    assert service.status_journal.pending_count() == 0
+    assert snapshot.data.get(order['order_id'])['delivery_status'] == new_status
+    assert service.spreadsheet.sheets['Orders'][1][8] == new_status
+
+
+def test_measurements_reload_keeps_change_flushed_during_read(service):
+    service.get_orders_snapshot()
+    order_id, measurements = next(iter(service._measurements_cache.get().data.items()))
+    item = next(item for item in measurements.values() if item is not None)
+    new_status = other_status(item['status'])
+    assert service.update_order_statuses({order_id: new_status}) == {order_id: True}
+
+    flush_during_next_read(service)
+    service._measurements_cache.invalidate()
+    reloaded = service.get_order_measurements(order_id)
+
+    assert service.status_journal.pending_count() == 0
+    assert all(item['status'] == new_status for item in reloaded.values() if item is not None)
+
+
+def test_checkpoint_starts_at_oldest_pending_change(tmp_path):
+    journal = StatusJournal(str(tmp_path / 'status_journal.db'))
+    assert journal.checkpoint() == 1
+    first = journal.append({'ORD1': 'Ready'})
+    journal.append({'ORD2': 'Ready', 'ORD1': 'Delivered'})
+    assert journal.checkpoint() == first
+    journal.mark_flushed(journal.pending()[0])
+    checkpoint = journal.checkpoint()
+    assert journal.latest_since(checkpoint) == {}
+    journal.append({'ORD2': 'Pending'})
+    assert journal.latest_since(checkpoint) == {'ORD2': 'Pending'}
+    assert journal.latest_since(first) == {'ORD1': 'Delivered', 'ORD2': 'Pending'}
+    journal.close()
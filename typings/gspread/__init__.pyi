@@ -1,22 +1,42 @@
-from typing import Any, Dict, List, Optional, Protocol
+from typing import Any, Dict, List, Optional, Protocol, Type, runtime_checkable
 
+from . import exceptions as exceptions
+from . import utils as utils
+from .http_client import HTTPClient
 
-class Client(Protocol):
+
+class Client:
+    http_client: HTTPClient
+    def __init__(self, auth: Any, http_client: Type[HTTPClient] = ...) -> None: ...
     def open_by_key(self, key: str) -> 'Spreadsheet': ...
     def open(self, title: str) -> 'Spreadsheet': ...
 
 
+@runtime_checkable
 class Spreadsheet(Protocol):
+    id: str
+    title: str
+    client: HTTPClient
     def worksheet(self, name: str) -> 'Worksheet': ...
     def worksheets(self) -> List['Worksheet']: ...
+    def add_worksheet(self, title: str, rows: int, cols: int, index: Optional[int] = ...) -> 'Worksheet': ...
+    def values_get(self, range: str, params: Optional[Dict[str, Any]] = ...) -> Dict[str, Any]: ...
+    def values_batch_get(self, ranges: List[str], params: Optional[Dict[str, Any]] = ...) -> Dict[str, Any]: ...
+    def values_batch_update(self, body: Optional[Dict[str, Any]] = ...) -> Dict[str, Any]: ...
 
 
 class Worksheet(Protocol):
+    id: int
+    title: str
+    client: HTTPClient
     def get_all_records(self) -> List[Dict[str, Any]]: ...
     def update_cell(self, row: int, col: int, value: Any) -> None: ...
     def get(self, range_name: str) -> List[List[Any]]: ...
+    def append_row(self, values: List[Any], value_input_option: str = ..., table_range: Optional[str] = ...) -> Dict[str, Any]: ...
+    def append_rows(self, values: List[List[Any]], value_input_option: str = ...,
+                    table_range: Optional[str] = ...) -> Dict[str, Any]: ...
 
 
-def authorize(credentials: Any) -> Client: ...
+def authorize(credentials: Any, http_client: Type[HTTPClient] = ...) -> Client: ...
 
 def service_account(filename: Optional[str] = ...) -> Client: ...
@@ -0,0 +1,19 @@
+from typing import Any, Dict, Optional
+
+from requests import Response
+
+
+class GSpreadException(Exception): ...
+
+
+class WorksheetNotFound(GSpreadException): ...
+
+
+class SpreadsheetNotFound(GSpreadException): ...
+
+
+class APIError(GSpreadException):
+    response: Optional[Response]
+    error: Dict[str, Any]
+    code: int
+    def __init__(self, response: Response) -> None: ...
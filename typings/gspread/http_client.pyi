@@ -0,0 +1,14 @@
+from typing import Any, Dict, List, Mapping, Optional
+
+from requests import Response, Session
+
+
+class HTTPClient:
+    session: Session
+    def __init__(self, auth: Any, session: Optional[Session] = ...) -> None: ...
+    def request(self, method: str, endpoint: str, params: Optional[Mapping[str, Any]] = ...,
+                data: Any = ..., json: Optional[Mapping[str, Any]] = ..., files: Any = ...,
+                headers: Optional[Mapping[str, str]] = ...) -> Response: ...
+    def values_get(self, id: str, range: str, params: Optional[Mapping[str, Any]] = ...) -> Dict[str, Any]: ...
+    def values_batch_get(self, id: str, ranges: List[str], params: Optional[Mapping[str, Any]] = ...) -> Dict[str, Any]: ...
+    def values_batch_update(self, id: str, body: Optional[Mapping[str, Any]] = ...) -> Dict[str, Any]: ...
@@ -0,0 +1,6 @@
+from typing import Tuple
+
+
+def a1_to_rowcol(label: str) -> Tuple[int, int]: ...
+
+def rowcol_to_a1(row: int, col: int) -> str: ...